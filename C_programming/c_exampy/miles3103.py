@@ -12,10 +12,28 @@ import os
 import sys
 import subprocess
 import shutil
+import signal
+import argparse
+import bisect
 import datetime
+import glob
+import gzip
+import hashlib
+import json
 import math
+import mmap
+import random
 import re
+import tempfile
+import threading
 import time
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import resource                 # POSIX only — rusage and rlimits
+except ImportError:
+    resource = None
 
 # ══════════════════════════════════════════════════════════════════
 #  WINDOWS / ANSI COLOR SETUP
@@ -127,9 +145,24 @@ def inc_streak():
 
 def reset_streak(): set_streak(0)
 
-def add_attempt(lvl, result):
-    ts = datetime.datetime.now().strftime("%H:%M")
-    _append(".attempts", f"{lvl}:{result}:{ts}")
+def add_attempt(lvl, result, metrics=None):
+    """Log an attempt as 'lvl:RESULT:HH:MM|key=val,...' (extras are optional)."""
+    now = datetime.datetime.now()
+    extras = {"t": int(now.timestamp())}
+    if metrics: extras.update(metrics)
+    extra = ",".join(f"{k}={v}" for k, v in extras.items())
+    _append(".attempts", f"{lvl}:{result}:{now.strftime('%H:%M')}|{extra}")
+
+def parse_attempt(line):
+    """Split an .attempts line into (lvl, result, ts, extras). Old lines have no extras."""
+    head, _, tail = line.partition("|")
+    parts = head.split(":", 2)
+    if len(parts) < 3: return None
+    extras = {}
+    for kv in tail.split(","):
+        k, sep, v = kv.partition("=")
+        if sep: extras[k] = v
+    return parts[0], parts[1], parts[2], extras
 
 def get_attempts(lvl):
     return sum(1 for l in _lines(".attempts") if l.startswith(f"{lvl}:"))
@@ -149,8 +182,55 @@ def get_total_fail():
 # ══════════════════════════════════════════════════════════════════
 #  DISPLAY HELPERS
 # ══════════════════════════════════════════════════════════════════
+DELAYS = True        # cosmetic pauses after messages; off with --no-delay
+
+def _sleep(seconds):
+    if DELAYS: time.sleep(seconds)
+
 def clear():
-    os.system("cls" if sys.platform == "win32" else "clear")
+    sys.stdout.write("\033[H\033[2J")
+    sys.stdout.flush()
+
+_ANSI = re.compile(r"\033\[[0-9;]*[A-Za-z]")
+
+class Screen:
+    """Back-buffered renderer: repaints only the rows that changed.
+
+    The previous frame is kept as a list of lines. If nothing has been
+    printed over it since (see invalidate()) and it fits the terminal,
+    changed rows are rewritten in place with cursor moves; otherwise the
+    frame is repainted in one write. No shell is spawned either way.
+    """
+    def __init__(self, out=None):
+        self.out = out or sys.stdout
+        self.prev = None
+
+    def invalidate(self):
+        """Forget the back-buffer — something else has drawn on the terminal."""
+        self.prev = None
+
+    def _fits(self, lines):
+        size = shutil.get_terminal_size((80, 24))
+        if len(lines) + 4 >= size.lines: return False   # prompt + a short message
+        return all(len(_ANSI.sub("", l)) < size.columns for l in lines)
+
+    def draw(self, lines):
+        if not self.out.isatty():
+            self.out.write("\n".join(lines) + "\n")
+            self.out.flush()
+            return
+        buf = []
+        if self.prev is None or not self._fits(lines) or not self._fits(self.prev):
+            buf.append("\033[H\033[2J")
+            buf.append("\n".join(lines) + "\n")
+        else:
+            for i, line in enumerate(lines):
+                if i >= len(self.prev) or self.prev[i] != line:
+                    buf.append(f"\033[{i + 1};1H{line}\033[K")
+            buf.append(f"\033[{len(lines) + 1};1H\033[J")
+        self.out.write("".join(buf))
+        self.out.flush()
+        self.prev = list(lines)
 
 def pause(msg="  Press Enter to continue..."):
     input(msg)
@@ -224,7 +304,7 @@ def show_scoreboard():
 # ══════════════════════════════════════════════════════════════════
 #  PROGRESS DISPLAY
 # ══════════════════════════════════════════════════════════════════
-def show_progress():
+def progress_lines():
     level   = get_level()
     score   = get_score()
     fname   = get_filename(level)
@@ -244,1082 +324,368 @@ def show_progress():
         elif i == level: pbar += f"{YELLOW}>{RESET}"
         else:            pbar += f"{DIM}.{RESET}"
 
-    print(f"  {BOLD}Topic   :{RESET} {CYAN}{topic}{RESET}  (task {subtask}/3)")
-    print(f"  {BOLD}Level   :{RESET} {YELLOW}{level}{RESET} / {MAX_LEVEL}   {BOLD}This level:{RESET} {GREEN}{passes}✓{RESET} {RED}{fails}✗{RESET}  {GRAY}({attempts} total){RESET}")
-    print(f"  {BOLD}File    :{RESET} {WHITE}{fname}{RESET}")
-    print(f"  {BOLD}Progress:{RESET} [{pbar}]")
-    print(f"  {BOLD}Score   :{RESET} {GREEN}{score}{RESET}/60  [{GREEN}{score_bar(score)}{RESET}]  {BOLD}All-time fails:{RESET} {RED}{tf}{RESET}  {BOLD}Streak:{RESET} {YELLOW}{streak}{RESET}")
-    print(f"  {BOLD}Rank    :{RESET} {MAGENTA}{rank}{RESET}")
+    return [
+        f"  {BOLD}Topic   :{RESET} {CYAN}{topic}{RESET}  (task {subtask}/3)",
+        f"  {BOLD}Level   :{RESET} {YELLOW}{level}{RESET} / {MAX_LEVEL}   {BOLD}This level:{RESET} {GREEN}{passes}✓{RESET} {RED}{fails}✗{RESET}  {GRAY}({attempts} total){RESET}",
+        f"  {BOLD}File    :{RESET} {WHITE}{fname}{RESET}",
+        f"  {BOLD}Progress:{RESET} [{pbar}]",
+        f"  {BOLD}Score   :{RESET} {GREEN}{score}{RESET}/60  [{GREEN}{score_bar(score)}{RESET}]  {BOLD}All-time fails:{RESET} {RED}{tf}{RESET}  {BOLD}Streak:{RESET} {YELLOW}{streak}{RESET}",
+        f"  {BOLD}Rank    :{RESET} {MAGENTA}{rank}{RESET}",
+    ]
+
+def show_progress():
+    for line in progress_lines(): print(line)
 
 # ══════════════════════════════════════════════════════════════════
-#  SUBJECT TEXTS  (all 60 levels)
+#  SUBJECT / EXPECTED CATALOG  (miles3103.dat, next to this script)
+#  The 60 subject texts and expected outputs live in a data file: an
+#  ASCII header with a fixed-width offset index, then the UTF-8 texts.
+#  It is memory-mapped on first use and each text is decoded only when
+#  asked for, so headless runs that never show a subject never read
+#  one. Edit with: catalog export <dir> → edit → catalog build <dir>.
 # ══════════════════════════════════════════════════════════════════
-SUBJECTS = {
-0: """=== LEVEL 0 ─ C INTRO [1/3] : Your First Program ===
-FILE: rendu/ft_hello/ft_hello.c
-
-Write a complete C program that prints:
-  Hello, C World!
-using write() ONLY. No printf allowed.
-
-Rules:
-  - Include <unistd.h>
-  - Use write(1, ..., len)
-  - End with newline
-
-Expected output:
-  Hello, C World!
-
-Tip: write(1, "Hello, C World!\\n", 16);""",
-
-1: """=== LEVEL 1 ─ C INTRO [2/3] : Return Values ===
-FILE: rendu/ft_return/ft_return.c
-
-Write a C program that:
-  1. Prints "Program starting" using write()
-  2. Prints "Program done" using write()
-  3. Returns 0 from main
-
-Add a comment at the top:
-  /* Q: What does returning 0 mean? What does returning 1 mean? */
-
-Expected output:
-  Program starting
-  Program done
-
-Tip: Non-zero return = error code (Unix convention).""",
-
-2: """=== LEVEL 2 ─ C INTRO [3/3] : GCC Compilation Pipeline ===
-FILE: rendu/ft_pipeline/ft_pipeline.c
-
-Print the 4 stages of GCC compilation using write():
-  1. Preprocessing
-  2. Compilation
-  3. Assembly
-  4. Linking
-
-Expected output:
-  1. Preprocessing
-  2. Compilation
-  3. Assembly
-  4. Linking
-
-Tip: These map to: cpp -> cc1 -> as -> ld""",
-
-3: """=== LEVEL 3 ─ SYNTAX [1/3] : Program Structure ===
-FILE: rendu/ft_structure/ft_structure.c
-
-Write a well-structured C program that:
-  1. Has a file header comment (author, date, description)
-  2. Has a helper function ft_print(char *s) using write()
-     that prints the string + newline
-  3. Calls ft_print("Syntax is power") from main
-
-Expected output:
-  Syntax is power
-
-Tip: Function must be declared BEFORE main or use a prototype.""",
-
-4: """=== LEVEL 4 ─ SYNTAX [2/3] : Multiple Functions ===
-FILE: rendu/ft_functions/ft_functions.c
-
-Write THREE separate functions (max 5 lines each):
-  greet()    -> prints "Hello"
-  farewell() -> prints "Goodbye"
-  main()     -> calls greet(), then farewell()
-
-Expected output:
-  Hello
-  Goodbye
-
-Tip: Small focused functions = good C style.""",
-
-5: """=== LEVEL 5 ─ SYNTAX [3/3] : Prototypes ===
-FILE: rendu/ft_prototype/ft_prototype.c
-
-Demonstrate function prototypes:
-  1. Write prototype at top: int add(int a, int b);
-  2. Define add() AFTER main
-  3. In main: compute add(7, 8), print: Result: 15
-
-Expected output:
-  Result: 15
-
-Tip: Prototype tells the compiler the signature before definition.""",
-
-6: """=== LEVEL 6 ─ OUTPUT [1/3] : write() Mastery ===
-FILE: rendu/ft_write/ft_write.c
-
-Using ONLY write(), print:
-  *** HEADER ***
-  (blank line)
-  Content here
-  (blank line)
-  *** FOOTER ***
-
-Expected output:
-  *** HEADER ***
-
-  Content here
-
-  *** FOOTER ***
-
-Tip: A blank line = just "\\n" written to stdout.""",
-
-7: """=== LEVEL 7 ─ OUTPUT [2/3] : ft_putnbr ===
-FILE: rendu/ft_putnbr/ft_putnbr.c
-
-WITHOUT printf, write a function:
-  void ft_putnbr(int n)
-that uses write() to print an integer.
-
-In main call it for: 0, 42, -7, 100 (each on own line)
-
-Expected output:
-  0
-  42
-  -7
-  100
-
-Tip: n % 10 gives last digit. Add '0' to convert to char.
-     Handle negative: print '-' then negate n.
-     Edge case: INT_MIN needs special handling.""",
-
-8: """=== LEVEL 8 ─ OUTPUT [3/3] : ft_print_combo ===
-FILE: rendu/ft_print_combo/ft_print_combo.c
-
-Write ft_print_combo() that prints via write():
-  - All lowercase letters a to z (space-separated)
-  - Newline
-  - All digits 0 to 9 (space-separated)
-  - Newline
-
-Expected output:
-  a b c d e f g h i j k l m n o p q r s t u v w x y z
-  0 1 2 3 4 5 6 7 8 9
-
-Tip: Use char variable in a loop. 'a' + i gives letter.""",
-
-9: """=== LEVEL 9 ─ COMMENTS [1/3] : Comment Styles ===
-FILE: rendu/ft_comments/ft_comments.c
-
-Write a C program demonstrating ALL comment types:
-  1. File header block comment (/* ... */)
-  2. Function-level comment above a function
-  3. Inline comment on a variable declaration
-  4. TODO comment inside main
-  5. Program prints: "Comments guide future you"
-
-Expected output:
-  Comments guide future you
-
-Tip: Good comments explain WHY, not WHAT.""",
-
-10: """=== LEVEL 10 ─ COMMENTS [2/3] : Documenting Functions ===
-FILE: rendu/ft_doccomment/ft_doccomment.c
-
-Write TWO functions, each with a full doc-comment:
-  @param  - what the parameter is
-  @return - what the function returns
-  @desc   - what it does
-
-Function 1: int ft_strlen(char *s)   -- returns length
-Function 2: int ft_isalpha(char c)   -- 1 if letter, 0 if not
-
-Test in main:
-  ft_strlen("hello")  -> Length: 5
-  ft_isalpha('3')     -> IsAlpha: 0
-  ft_isalpha('z')     -> IsAlpha: 1
-
-Expected output:
-  Length: 5
-  IsAlpha: 0
-  IsAlpha: 1""",
-
-11: """=== LEVEL 11 ─ COMMENTS [3/3] : Commented Debugging ===
-FILE: rendu/ft_bugfix/ft_bugfix.c
-
-Write a program with a BUGGY version commented out
-and a FIXED version active. Comment explaining the bug.
-
-The bug: multiplying instead of adding
-  // int result = a * b;  /* BUG: should be addition */
-  int result = a + b;     /* FIX: correct operation */
-
-With a = 6, b = 4, print: Sum: 10
-
-Expected output:
-  Sum: 10""",
-
-12: """=== LEVEL 12 ─ VARIABLES [1/3] : Declaration & Init ===
-FILE: rendu/ft_variables/ft_variables.c
-
-Declare ONE variable of each type:
-  char   letter    = 'X'
-  int    count     = 2025
-  float  pi_approx = 3.14f
-  double precise   = 2.718281828
-
-Print each with printf:
-  letter: X
-  count: 2025
-  pi_approx: 3.14
-  precise: 2.718282
-
-Expected output:
-  letter: X
-  count: 2025
-  pi_approx: 3.14
-  precise: 2.718282
-
-Tip: printf("pi_approx: %.2f\\n", pi_approx);
-     printf("precise: %f\\n", precise);""",
-
-13: """=== LEVEL 13 ─ VARIABLES [2/3] : Scope & Lifetime ===
-FILE: rendu/ft_scope/ft_scope.c
-
-Demonstrate variable scope:
-  - Global int g = 100
-  - Function scope_demo() with local int g = 999
-    prints: local g = 999
-  - main() calls scope_demo(), then prints: global g = 100
-
-Expected output:
-  local g = 999
-  global g = 100
-
-Tip: Local variables shadow globals within their scope.""",
-
-14: """=== LEVEL 14 ─ VARIABLES [3/3] : Swap Without Temp ===
-FILE: rendu/ft_swap/ft_swap.c
-
-Swap two integers WITHOUT a temporary variable.
-Use XOR swap or arithmetic swap.
-
-Start: a = 5, b = 9
-
-Expected output:
-  Before: a=5, b=9
-  After:  a=9, b=5
-
-Tip XOR swap: a ^= b; b ^= a; a ^= b;
-Tip arith:    a = a+b; b = a-b; a = a-b;""",
-
-15: """=== LEVEL 15 ─ DATA TYPES [1/3] : sizeof Explorer ===
-FILE: rendu/ft_sizeof/ft_sizeof.c
-
-Print the size of every fundamental C type using sizeof.
-Use printf with %zu format specifier.
-
-Expected output (these exact lines, in this order):
-  char:      1 bytes
-  int:       4 bytes
-  float:     4 bytes
-  double:    8 bytes
-
-Tip: printf("char:      %zu bytes\\n", sizeof(char));""",
-
-16: """=== LEVEL 16 ─ DATA TYPES [2/3] : Limits & Overflow ===
-FILE: rendu/ft_limits/ft_limits.c
-
-Include <limits.h> and print:
-  INT_MAX:  2147483647
-  INT_MIN:  -2147483648
-  CHAR_MAX: 127
-  CHAR_MIN: -128
-
-Then demonstrate overflow:
-  int overflow = INT_MAX + 1;
-  Print: Overflow result: -2147483648
-
-Expected output:
-  INT_MAX:  2147483647
-  INT_MIN:  -2147483648
-  CHAR_MAX: 127
-  CHAR_MIN: -128
-  Overflow result: -2147483648
-
-Tip: Cast to avoid UB: (int)((unsigned int)INT_MAX + 1)""",
-
-17: """=== LEVEL 17 ─ DATA TYPES [3/3] : Unsigned vs Signed ===
-FILE: rendu/ft_unsigned/ft_unsigned.c
-
-  1. signed char sc = -1; unsigned char uc = (unsigned char)sc;
-     Print:
-       signed char:   -1
-       unsigned char: 255
-
-  2. unsigned int ui = 0; ui = ui - 1;
-     Print: unsigned underflow: 4294967295
-
-Expected output:
-  signed char:   -1
-  unsigned char: 255
-  unsigned underflow: 4294967295""",
-
-18: """=== LEVEL 18 ─ TYPE CONVERSION [1/3] : Implicit Conversion ===
-FILE: rendu/ft_implicit/ft_implicit.c
-
-  1. int i = 65; char c = i; print c as char -> 'A'
-  2. char ch = 'z'; int n = ch; print n -> 122
-  3. int a=5, b=2; double d = a / b; print -> 2.000000
-  4. double e = (double)a / b; print -> 2.500000
-
-Expected output:
-  char from int: A
-  int from char: 122
-  int division stored as double: 2.000000
-  cast before division: 2.500000""",
-
-19: """=== LEVEL 19 ─ TYPE CONVERSION [2/3] : Explicit Casting ===
-FILE: rendu/ft_percent/ft_percent.c
-
-Write: int ft_percent(int part, int total)
-Returns the integer percentage (truncated).
-Example: ft_percent(1, 3) = 33
-
-Test in main:
-  1 of 3   = 33%
-  2 of 3   = 66%
-  1 of 4   = 25%
-  3 of 4   = 75%
-  1 of 7   = 14%
-
-Expected output:
-  1 of 3   = 33%
-  2 of 3   = 66%
-  1 of 4   = 25%
-  3 of 4   = 75%
-  1 of 7   = 14%
-
-Tip: return (int)((double)part / total * 100);""",
-
-20: """=== LEVEL 20 ─ TYPE CONVERSION [3/3] : ASCII & Char Math ===
-FILE: rendu/ft_ascii/ft_ascii.c
-
-  1. Convert uppercase A, M, Z to lowercase by adding 32:
-       A -> a
-       M -> m
-       Z -> z
-  2. Convert char digits to int values:
-       '5' -> 5
-       '9' -> 9
-
-Expected output:
-  A -> a
-  M -> m
-  Z -> z
-  '5' -> 5
-  '9' -> 9""",
-
-21: """=== LEVEL 21 ─ CONSTANTS [1/3] : #define vs const ===
-FILE: rendu/ft_define/ft_define.c
-
-  - #define BUFFER_SIZE 1024
-  - #define PI 3.14159265
-  - const int MAX_USERS = 100;
-  - const char SEPARATOR = '-';
-
-Print all four:
-  BUFFER_SIZE: 1024
-  PI: 3.14159265
-  MAX_USERS: 100
-  SEPARATOR: -
-
-Expected output:
-  BUFFER_SIZE: 1024
-  PI: 3.14159265
-  MAX_USERS: 100
-  SEPARATOR: -""",
-
-22: """=== LEVEL 22 ─ CONSTANTS [2/3] : Enum Constants ===
-FILE: rendu/ft_enum/ft_enum.c
-
-typedef enum e_day { MON=1, TUE, WED, THU, FRI, SAT, SUN } t_day;
-
-Write const char *day_name(t_day d) returning the day name string.
-Loop MON to SUN and print:
-  1: Monday
-  2: Tuesday
-  ...
-  7: Sunday
-
-Expected output (all 7 lines):
-  1: Monday
-  2: Tuesday
-  3: Wednesday
-  4: Thursday
-  5: Friday
-  6: Saturday
-  7: Sunday""",
-
-23: """=== LEVEL 23 ─ CONSTANTS [3/3] : Macro Functions ===
-FILE: rendu/ft_macros/ft_macros.c
-
-Write macros (not functions):
-  #define MAX(a, b)   largest of a, b
-  #define MIN(a, b)   smallest of a, b
-  #define ABS(x)      absolute value
-  #define SQUARE(x)   x squared
-
-Test in main:
-  MAX(3, 7)   = 7
-  MIN(3, 7)   = 3
-  ABS(-5)     = 5
-  SQUARE(4)   = 16
-
-Expected output:
-  MAX(3, 7)   = 7
-  MIN(3, 7)   = 3
-  ABS(-5)     = 5
-  SQUARE(4)   = 16
-
-Tip: Wrap args in () e.g. #define SQUARE(x) ((x)*(x))""",
-
-24: """=== LEVEL 24 ─ OPERATORS [1/3] : Bitwise Operations ===
-FILE: rendu/ft_bitwise/ft_bitwise.c
-
-With a = 10 (0b1010) and b = 12 (0b1100):
-  a & b  = 8
-  a | b  = 14
-  a ^ b  = 6
-  ~a     = -11
-  a << 1 = 20
-  a >> 1 = 5
-
-Expected output:
-  a & b  = 8
-  a | b  = 14
-  a ^ b  = 6
-  ~a     = -11
-  a << 1 = 20
-  a >> 1 = 5""",
-
-25: """=== LEVEL 25 ─ OPERATORS [2/3] : Assignment & Compound ===
-FILE: rendu/ft_compound/ft_compound.c
-
-Start with int x = 16. Apply and print after EACH:
-  x += 4   -> x += 4  : 20
-  x -= 5   -> x -= 5  : 15
-  x *= 3   -> x *= 3  : 45
-  x /= 9   -> x /= 9  : 5
-  x %= 3   -> x %= 3  : 2
-  x <<= 2  -> x <<= 2 : 8
-
-Expected output:
-  x += 4  : 20
-  x -= 5  : 15
-  x *= 3  : 45
-  x /= 9  : 5
-  x %= 3  : 2
-  x <<= 2 : 8""",
-
-26: """=== LEVEL 26 ─ OPERATORS [3/3] : Ternary & Precedence ===
-FILE: rendu/ft_ternary/ft_ternary.c
-
-Write using ONLY ternary operators:
-  const char *ft_classify(int n) -> "negative"/"zero"/"positive"
-  int ft_abs(int n)               -> n < 0 ? -n : n
-
-Test:
-  ft_classify(-5) -> -5: negative
-  ft_classify(0)  -> 0: zero
-  ft_classify(3)  -> 3: positive
-  ft_abs(-42)     -> abs(-42): 42
-
-Expected output:
-  -5: negative
-  0: zero
-  3: positive
-  abs(-42): 42""",
-
-27: """=== LEVEL 27 ─ BOOLEANS [1/3] : Truth Tables ===
-FILE: rendu/ft_truth_table/ft_truth_table.c
-
-Include <stdbool.h>. Print the full truth table for &&, ||, !:
-
-Expected output (exact spacing):
-  A=0 B=0: AND=0 OR=0  NOT_A=1
-  A=0 B=1: AND=0 OR=1  NOT_A=1
-  A=1 B=0: AND=0 OR=1  NOT_A=0
-  A=1 B=1: AND=1 OR=1  NOT_A=0""",
-
-28: """=== LEVEL 28 ─ BOOLEANS [2/3] : Short-Circuit Evaluation ===
-FILE: rendu/ft_shortcircuit/ft_shortcircuit.c
-
-Write two functions with side effects:
-  int check_a() { printf("check_a called\\n"); return 0; }
-  int check_b() { printf("check_b called\\n"); return 1; }
-
-Test:
-  Print "Test 1:" then evaluate: check_a() && check_b()
-  Print "Test 2:" then evaluate: check_b() || check_a()
-
-Expected output:
-  Test 1:
-  check_a called
-  Test 2:
-  check_b called
-
-Note: check_b() is NOT called in Test 1 (short-circuit),
-      check_a() is NOT called in Test 2 (short-circuit).""",
-
-29: """=== LEVEL 29 ─ BOOLEANS [3/3] : Boolean in Practice ===
-FILE: rendu/ft_password/ft_password.c
-
-Write: int ft_is_valid_password(char *password)
-Returns 1 if ALL conditions true:
-  - Length >= 8
-  - Has at least one uppercase letter
-  - Has at least one digit
-Returns 0 otherwise.
-
-Test:
-  "hello"          -> invalid
-  "Hello1!!"       -> valid
-  "SHORT1A"        -> invalid
-  "longbutnodigit" -> invalid
-
-Expected output:
-  hello: invalid
-  Hello1!!: valid
-  SHORT1A: invalid
-  longbutnodigit: invalid""",
-
-30: """=== LEVEL 30 ─ IF...ELSE [1/3] : Grade Calculator ===
-FILE: rendu/ft_grade/ft_grade.c
-
-Write: char ft_grade(int score)
-  score >= 90 -> 'A'
-  score >= 80 -> 'B'
-  score >= 70 -> 'C'
-  score >= 60 -> 'D'
-  else        -> 'F'
-
-Expected output:
-  95: A
-  83: B
-  71: C
-  65: D
-  40: F""",
-
-31: """=== LEVEL 31 ─ IF...ELSE [2/3] : FizzBuzz ===
-FILE: rendu/ft_fizzbuzz/ft_fizzbuzz.c
-
-FizzBuzz from 1 to 20.
-
-Expected output (first 8 lines shown, all 20 required):
-  1
-  2
-  Fizz
-  4
-  Buzz
-  Fizz
-  7
-  8
-
-Tip: Check divisible by 15 (FizzBuzz) BEFORE 3 or 5 alone!""",
-
-32: """=== LEVEL 32 ─ IF...ELSE [3/3] : Leap Year ===
-FILE: rendu/ft_leap/ft_leap.c
-
-Write: int ft_is_leap(int year)
-Rules:
-  - Divisible by 4   -> leap
-  - EXCEPT divisible by 100 -> NOT leap
-  - EXCEPT divisible by 400 -> IS leap
-
-Expected output:
-  2000: leap
-  1900: not leap
-  2024: leap
-  2023: not leap""",
-
-33: """=== LEVEL 33 ─ SWITCH [1/3] : Calculator ===
-FILE: rendu/ft_calc/ft_calc.c
-
-Write: int ft_calc(int a, char op, int b)
-Switch on op: '+' '-' '*' '/'
-Return 0 for division by zero.
-
-Expected output:
-  10 + 3 = 13
-  10 - 3 = 7
-  10 * 3 = 30
-  10 / 3 = 3
-  10 / 0 = 0""",
-
-34: """=== LEVEL 34 ─ SWITCH [2/3] : Fall-Through ===
-FILE: rendu/ft_chartype/ft_chartype.c
-
-Write ft_char_type(char c) using intentional fall-through for vowels.
-  'a','e','i','o','u' -> vowel
-  other a-z           -> consonant
-  0-9                 -> digit
-  else                -> other
-
-Expected output:
-  a: vowel
-  b: consonant
-  5: digit
-  !: other""",
-
-35: """=== LEVEL 35 ─ SWITCH [3/3] : State Machine ===
-FILE: rendu/ft_statemachine/ft_statemachine.c
-
-typedef enum { RED, YELLOW, GREEN } t_light;
-
-Write: t_light next_light(t_light current)
-Cycle: RED -> GREEN -> YELLOW -> RED
-
-Simulate 6 transitions starting from RED.
-Print the current light BEFORE each transition.
-
-Expected output (exactly):
-  RED
-  GREEN
-  YELLOW
-  RED
-  GREEN
-  YELLOW""",
-
-36: """=== LEVEL 36 ─ WHILE LOOP [1/3] : Collatz Conjecture ===
-FILE: rendu/ft_collatz/ft_collatz.c
-
-Collatz from n = 6:
-  If even: n = n / 2
-  If odd:  n = n * 3 + 1
-Print each value until you reach 1.
-Then print: Steps: X (count transitions, not the starting number)
-
-Expected output:
-  6
-  3
-  10
-  5
-  16
-  8
-  4
-  2
-  1
-  Steps: 8""",
-
-37: """=== LEVEL 37 ─ WHILE LOOP [2/3] : do...while Validation ===
-FILE: rendu/ft_dowhile/ft_dowhile.c
-
-Using do...while, process values: {-1, 0, 200, 50, -5, 42}
-Print "Valid: X" if 1-100 inclusive, else "Invalid: X"
-
-Expected output:
-  Invalid: -1
-  Invalid: 0
-  Invalid: 200
-  Valid: 50
-  Invalid: -5
-  Valid: 42""",
-
-38: """=== LEVEL 38 ─ WHILE LOOP [3/3] : Digit Sum & Reverse ===
-FILE: rendu/ft_digitsum/ft_digitsum.c
-
-Write:
-  int ft_digit_sum(int n)  -- sum of all digits
-  int ft_reverse(int n)    -- reverse the digits
-
-Expected output:
-  digit_sum(12345)  = 15
-  digit_sum(9999)   = 36
-  ft_reverse(12345) = 54321
-  ft_reverse(100)   = 1""",
-
-39: """=== LEVEL 39 ─ FOR LOOP [1/3] : Fibonacci Sequence ===
-FILE: rendu/ft_fibonacci/ft_fibonacci.c
-
-Print first 10 Fibonacci numbers, space-separated, newline at end.
-
-Expected output (exact):
-  0 1 1 2 3 5 8 13 21 34""",
-
-40: """=== LEVEL 40 ─ FOR LOOP [2/3] : Nested Loops & Patterns ===
-FILE: rendu/ft_patterns/ft_patterns.c
-
-Print a right-triangle (growing) then inverted triangle (shrinking):
-
-Expected output (exactly):
-  *
-  **
-  ***
-  ****
-  *****
-  *****
-  ****
-  ***
-  **
-  *""",
-
-41: """=== LEVEL 41 ─ FOR LOOP [3/3] : Prime Number Sieve ===
-FILE: rendu/ft_prime/ft_prime.c
-
-Write: int ft_is_prime(int n)
-Print all primes from 2 to 50 (space-separated), then the count.
-
-Expected output:
-  2 3 5 7 11 13 17 19 23 29 31 37 41 43 47
-  Count: 15""",
-
-42: """=== LEVEL 42 ─ BREAK/CONTINUE [1/3] : Search & Stop ===
-FILE: rendu/ft_find/ft_find.c
-
-Write: int ft_find(int *arr, int size, int target)
-Returns the index, or -1 if not found. Use break to stop early.
-
-arr = {5, 12, 3, 8, 42, 7, 19}
-
-Expected output:
-  Find 8:  Found at index 3
-  Find 42: Found at index 4
-  Find 99: Not found""",
-
-43: """=== LEVEL 43 ─ BREAK/CONTINUE [2/3] : Filter with Continue ===
-FILE: rendu/ft_filter/ft_filter.c
-
-Process {-3, 7, -1, 0, 5, -8, 2, 9, -4, 6}:
-  Skip negatives and zero with continue.
-  Print index (0-based) and value for positives.
-  Print sum of positives at end.
-
-Expected output:
-  [1]: 7
-  [4]: 5
-  [6]: 2
-  [7]: 9
-  [9]: 6
-  Sum of positives: 29""",
-
-44: """=== LEVEL 44 ─ BREAK/CONTINUE [3/3] : Nested Loop Control ===
-FILE: rendu/ft_nested/ft_nested.c
-
-Print pairs (i,j) where i and j are 1-5 and i*j is a perfect square.
-Include <math.h>, compile with -lm.
-
-Hint: sqrt(n) is an integer if (int)sqrt(n)*(int)sqrt(n) == n
-
-Expected output:
-  (1,1)=1
-  (1,4)=4
-  (2,2)=4
-  (3,3)=9
-  (4,4)=16
-  (5,5)=25""",
-
-45: """=== LEVEL 45 ─ ARRAYS [1/3] : Array Statistics ===
-FILE: rendu/ft_stats/ft_stats.c
-
-arr[] = {4, 7, 2, 9, 1, 5, 8, 3, 6, 10}
-Write:
-  int   ft_min(int *arr, int n)
-  int   ft_max(int *arr, int n)
-  int   ft_sum(int *arr, int n)
-  float ft_avg(int *arr, int n)
-
-Expected output:
-  Min: 1
-  Max: 10
-  Sum: 55
-  Avg: 5.50""",
-
-46: """=== LEVEL 46 ─ ARRAYS [2/3] : Bubble Sort ===
-FILE: rendu/ft_bubblesort/ft_bubblesort.c
-
-Implement: void ft_bubble_sort(int *arr, int n)
-Sort {64, 34, 25, 12, 22, 11, 90} in ascending order.
-
-Expected output:
-  Before: 64 34 25 12 22 11 90
-  After:  11 12 22 25 34 64 90""",
-
-47: """=== LEVEL 47 ─ ARRAYS [3/3] : 2D Arrays & Matrix ===
-FILE: rendu/ft_matrix/ft_matrix.c
-
-int m[3][3] = {{1,2,3},{4,5,6},{7,8,9}};
-
-Write:
-  void print_matrix(int m[3][3])
-  int  matrix_sum(int m[3][3])       -- sum of all elements
-  int  matrix_trace(int m[3][3])     -- sum of diagonal (1+5+9)
-
-Expected output:
-  1 2 3
-  4 5 6
-  7 8 9
-  Sum: 45
-  Trace: 15""",
-
-48: """=== LEVEL 48 ─ STRINGS [1/3] : String Functions from Scratch ===
-FILE: rendu/ft_strfuncs/ft_strfuncs.c
-
-WITHOUT <string.h>, implement:
-  int   ft_strlen(char *s)
-  char *ft_strcpy(char *dst, char *src)
-  int   ft_strcmp(char *s1, char *s2)
-  char *ft_strchr(char *s, char c)
-
-Expected output:
-  strlen: 5
-  strcpy: world
-  strcmp equal: 0
-  strcmp diff: nonzero
-  strchr: llo""",
-
-49: """=== LEVEL 49 ─ STRINGS [2/3] : String Manipulation ===
-FILE: rendu/ft_strmanip/ft_strmanip.c
-
-Implement:
-  void ft_toupper_str(char *s)    -- in-place uppercase
-  void ft_tolower_str(char *s)    -- in-place lowercase
-  void ft_reverse_str(char *s)    -- in-place reverse
-  int  ft_count_words(char *s)    -- count space-separated words
-
-Expected output:
-  upper: HELLO WORLD
-  lower: hello world
-  reverse: edcba
-  words: 4""",
-
-50: """=== LEVEL 50 ─ STRINGS [3/3] : Number <-> String Conversion ===
-FILE: rendu/ft_numconv/ft_numconv.c
-
-Implement:
-  int   ft_atoi(char *s)   -- string to int
-  char *ft_itoa(int n)     -- int to string (malloc allowed)
-
-Expected output:
-  atoi("42"):    42
-  atoi("-100"):  -100
-  atoi("0"):     0
-  itoa(12345):   12345
-  itoa(-7):      -7""",
-
-51: """=== LEVEL 51 ─ USER INPUT [1/3] : read() Buffer ===
-FILE: rendu/ft_readbuf/ft_readbuf.c
-
-Using ONLY read() and write():
-  Read up to 32 chars from stdin.
-  Null-terminate the buffer.
-  Strip trailing newline if present.
-  Print: "You entered: " followed by the string.
-
-Test with piped input: echo "Hello42" | ./ft_readbuf
-
-Expected output:
-  You entered: Hello42""",
-
-52: """=== LEVEL 52 ─ USER INPUT [2/3] : Parsing Input ===
-FILE: rendu/ft_parseinput/ft_parseinput.c
-
-Read a line from stdin, count uppercase, lowercase, digits, spaces.
-Test input: "Hello World 42"
-
-Expected output:
-  Uppercase: 2
-  Lowercase: 8
-  Digits: 2
-  Spaces: 2""",
-
-53: """=== LEVEL 53 ─ USER INPUT [3/3] : Multi-line Reader ===
-FILE: rendu/ft_multiline/ft_multiline.c
-
-Read exactly 3 lines from stdin using a loop with read().
-For each line print: "Line N (len=X): content"
-(length excludes the newline)
-
-Test with: printf "hello\\nworld\\n42\\n"
-
-Expected output:
-  Line 1 (len=5): hello
-  Line 2 (len=5): world
-  Line 3 (len=2): 42""",
-
-54: """=== LEVEL 54 ─ MEMORY ADDRESS [1/3] : Address Explorer ===
-FILE: rendu/ft_memaddr/ft_memaddr.c
-
-Print addresses of:
-  - A global variable   (label: global)
-  - A stack variable    (label: stack)
-  - A heap variable     (label: heap, use malloc)
-Free the heap allocation.
-
-Expected output format (addresses will vary):
-  global: 0x[hex address]
-  stack:  0x[hex address]
-  heap:   0x[hex address]
-
-Tip: printf("global: %p\\n", (void*)&g);""",
-
-55: """=== LEVEL 55 ─ MEMORY ADDRESS [2/3] : Pass by Reference ===
-FILE: rendu/ft_passref/ft_passref.c
-
-Demonstrate pass-by-value vs pass-by-reference:
-  void double_val(int n)   -- modifies local copy only
-  void double_ref(int *n)  -- modifies caller's variable
-
-Start with x = 5.
-
-Expected output:
-  After double_val: 5
-  After double_ref: 10""",
-
-56: """=== LEVEL 56 ─ MEMORY ADDRESS [3/3] : ft_swap via Pointers ===
-FILE: rendu/ft_swapptr/ft_swapptr.c
-
-Write:
-  void ft_swap(int *a, int *b)
-  void ft_swap_str(char **a, char **b)
-
-Expected output:
-  Before swap: a=10, b=20
-  After swap:  a=20, b=10
-  Before swap: s1=hello, s2=world
-  After swap:  s1=world, s2=hello""",
-
-57: """=== LEVEL 57 ─ POINTERS [1/3] : Pointer Arithmetic ===
-FILE: rendu/ft_ptrarith/ft_ptrarith.c
-
-Navigate int arr[] = {10,20,30,40,50} using ONLY pointer arithmetic.
-(No arr[i] subscript allowed)
-
-Expected output:
-  *p     = 10
-  *(p+1) = 20
-  *(p+2) = 30
-  *(p+3) = 40
-  *(p+4) = 50
-  int units apart:  1
-  bytes apart:      4""",
-
-58: """=== LEVEL 58 ─ POINTERS [2/3] : Pointer to Pointer ===
-FILE: rendu/ft_ptrtoptr/ft_ptrtoptr.c
-
-  int x = 42;
-  int *p = &x;
-  int **pp = &p;
-
-Print all three ways to access x, then modify x through **pp.
-
-Expected output:
-  x    = 42
-  *p   = 42
-  **pp = 42
-  After **pp = 99: x = 99""",
-
-59: """=== LEVEL 59 ─ POINTERS [3/3] ★ FINAL BOSS ★ ===
-FILE: rendu/ft_funcptr/ft_funcptr.c
-
-Part 1 — Function pointer dispatch table:
-  int ft_add(int a, int b)  { return a + b; }
-  int ft_sub(int a, int b)  { return a - b; }
-  int ft_mul(int a, int b)  { return a * b; }
-
-  Store them in an array of function pointers and call each.
-
-Part 2 — ft_map:
-  void ft_map(int *arr, int n, int (*f)(int))
-  Apply a doubling function to {1,2,3,4,5}.
-
-Expected output:
-  ft_add(10, 3) = 13
-  ft_sub(10, 3) = 7
-  ft_mul(10, 3) = 30
-  2 4 6 8 10
-
-  You have completed the C Mastery Exam. You are ready.""",
-}
-
-def show_subject(lvl=None):
-    if lvl is None: lvl = get_level()
+CATALOG_FILE   = os.path.join(os.path.dirname(os.path.abspath(__file__)), "miles3103.dat")
+CATALOG_MAGIC  = b"MILES3103-CATALOG 1\n"
+CATALOG_RECORD = 26             # b"S 051 0000012345 00000678\n"
+CATALOG_KINDS  = {"S": "subjects", "E": "expected"}
+
+_catalog = {}
+
+def _catalog_index():
+    """mmap the catalog once and parse its index into {(kind, lvl): (offset, length)}."""
+    if not _catalog:
+        with open(CATALOG_FILE, "rb") as fh:
+            mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        if mm[:len(CATALOG_MAGIC)] != CATALOG_MAGIC:
+            raise ValueError(f"{CATALOG_FILE}: not a miles3103 catalog")
+        pos = len(CATALOG_MAGIC)
+        count = int(mm[pos:pos + 7])
+        pos += 7
+        base = pos + count * CATALOG_RECORD
+        index = {}
+        for i in range(count):
+            kind, lvl, off, length = mm[pos + i * CATALOG_RECORD:pos + (i + 1) * CATALOG_RECORD].split()
+            index[(kind.decode(), int(lvl))] = (base + int(off), int(length))
+        _catalog.update(map=mm, index=index)
+    return _catalog
+
+class Catalog(Mapping):
+    """Read-only {level: text} view of one kind of catalog record ("S" or "E")."""
+    def __init__(self, kind): self.kind = kind
+
+    def __getitem__(self, lvl):
+        cat = _catalog_index()
+        off, length = cat["index"][(self.kind, lvl)]
+        return cat["map"][off:off + length].decode("utf-8")
+
+    def __iter__(self):
+        return iter(sorted(l for k, l in _catalog_index()["index"] if k == self.kind))
+
+    def __len__(self):
+        return sum(1 for k, _ in _catalog_index()["index"] if k == self.kind)
+
+def build_catalog(texts, path=CATALOG_FILE):
+    """Write {"S": {lvl: text}, "E": {lvl: text}} as a catalog file."""
+    records, blob = [], bytearray()
+    for kind in sorted(texts):
+        for lvl in sorted(texts[kind]):
+            data = texts[kind][lvl].encode("utf-8")
+            records.append(b"%s %03d %010d %08d\n" % (kind.encode(), lvl, len(blob), len(data)))
+            blob += data
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as fh:
+        fh.write(CATALOG_MAGIC + b"%06d\n" % len(records) + b"".join(records) + blob)
+    os.replace(tmp, path)
+    _catalog.clear()
+
+def export_catalog(out_dir):
+    """Write each text to <out_dir>/subjects/NN.txt and <out_dir>/expected/NN.txt."""
+    for kind, sub in CATALOG_KINDS.items():
+        os.makedirs(os.path.join(out_dir, sub), exist_ok=True)
+        for lvl, text in Catalog(kind).items():
+            with open(os.path.join(out_dir, sub, f"{lvl:02d}.txt"), "w", encoding="utf-8", newline="") as fh:
+                fh.write(text)
+
+def read_catalog_dir(src_dir):
+    """Inverse of export_catalog(): {"S": {...}, "E": {...}} from a directory of .txt files."""
+    texts = {}
+    for kind, sub in CATALOG_KINDS.items():
+        texts[kind] = {}
+        for path in glob.glob(os.path.join(src_dir, sub, "*.txt")):
+            with open(path, encoding="utf-8", newline="") as fh:
+                texts[kind][int(os.path.basename(path)[:-4])] = fh.read()
+    return texts
+
+SUBJECTS = Catalog("S")
+EXPECTED = Catalog("E")
+
+_subject_cache = {}
+
+def subject_lines(lvl):
+    """Colorized subject lines for lvl, rendered once per level and cached."""
+    if lvl in _subject_cache: return _subject_cache[lvl]
     text = SUBJECTS.get(lvl, "")
-    if not text: return
-    print()
-    print(c(BOLD+CYAN, f"══ SUBJECT: Level {lvl} ══════════════════════════════════"))
+    if not text: return []
+    lines = ["", c(BOLD+CYAN, f"══ SUBJECT: Level {lvl} ══════════════════════════════════")]
     for line in text.splitlines():
         if "Expected output" in line:
-            print(c(BOLD+YELLOW, line))
+            lines.append(c(BOLD+YELLOW, line))
         elif line.strip().startswith("Tip:") or line.strip().startswith("Tip "):
-            print(c(CYAN, line))
+            lines.append(c(CYAN, line))
         elif line.strip().startswith("FILE:"):
-            print(c(GREEN, line))
+            lines.append(c(GREEN, line))
         else:
-            print(line)
-    print()
+            lines.append(line)
+    lines.append("")
+    _subject_cache[lvl] = lines
+    return lines
 
-# ══════════════════════════════════════════════════════════════════
-#  EXPECTED OUTPUTS
-# ══════════════════════════════════════════════════════════════════
-EXPECTED = {
-    0:  "Hello, C World!",
-    1:  "Program starting\nProgram done",
-    2:  "1. Preprocessing\n2. Compilation\n3. Assembly\n4. Linking",
-    3:  "Syntax is power",
-    4:  "Hello\nGoodbye",
-    5:  "Result: 15",
-    6:  "*** HEADER ***\n\nContent here\n\n*** FOOTER ***",
-    7:  "0\n42\n-7\n100",
-    8:  "a b c d e f g h i j k l m n o p q r s t u v w x y z\n0 1 2 3 4 5 6 7 8 9",
-    9:  "Comments guide future you",
-    10: "Length: 5\nIsAlpha: 0\nIsAlpha: 1",
-    11: "Sum: 10",
-    12: "letter: X\ncount: 2025\npi_approx: 3.14\nprecise: 2.718282",
-    13: "local g = 999\nglobal g = 100",
-    14: "Before: a=5, b=9\nAfter:  a=9, b=5",
-    15: "char:      1 bytes\nint:       4 bytes\nfloat:     4 bytes\ndouble:    8 bytes",
-    16: "INT_MAX:  2147483647\nINT_MIN:  -2147483648\nCHAR_MAX: 127\nCHAR_MIN: -128\nOverflow result: -2147483648",
-    17: "signed char:   -1\nunsigned char: 255\nunsigned underflow: 4294967295",
-    18: "char from int: A\nint from char: 122\nint division stored as double: 2.000000\ncast before division: 2.500000",
-    19: "1 of 3   = 33%\n2 of 3   = 66%\n1 of 4   = 25%\n3 of 4   = 75%\n1 of 7   = 14%",
-    20: "A -> a\nM -> m\nZ -> z\n'5' -> 5\n'9' -> 9",
-    21: "BUFFER_SIZE: 1024\nPI: 3.14159265\nMAX_USERS: 100\nSEPARATOR: -",
-    22: "1: Monday\n2: Tuesday\n3: Wednesday\n4: Thursday\n5: Friday\n6: Saturday\n7: Sunday",
-    23: "MAX(3, 7)   = 7\nMIN(3, 7)   = 3\nABS(-5)     = 5\nSQUARE(4)   = 16",
-    24: "a & b  = 8\na | b  = 14\na ^ b  = 6\n~a     = -11\na << 1 = 20\na >> 1 = 5",
-    25: "x += 4  : 20\nx -= 5  : 15\nx *= 3  : 45\nx /= 9  : 5\nx %= 3  : 2\nx <<= 2 : 8",
-    26: "-5: negative\n0: zero\n3: positive\nabs(-42): 42",
-    27: "A=0 B=0: AND=0 OR=0  NOT_A=1\nA=0 B=1: AND=0 OR=1  NOT_A=1\nA=1 B=0: AND=0 OR=1  NOT_A=0\nA=1 B=1: AND=1 OR=1  NOT_A=0",
-    28: "Test 1:\ncheck_a called\nTest 2:\ncheck_b called",
-    29: "hello: invalid\nHello1!!: valid\nSHORT1A: invalid\nlongbutnodigit: invalid",
-    30: "95: A\n83: B\n71: C\n65: D\n40: F",
-    31: "1\n2\nFizz\n4\nBuzz\nFizz\n7\n8\nFizz\nBuzz\n11\nFizz\n13\n14\nFizzBuzz\n16\n17\nFizz\n19\nBuzz",
-    32: "2000: leap\n1900: not leap\n2024: leap\n2023: not leap",
-    33: "10 + 3 = 13\n10 - 3 = 7\n10 * 3 = 30\n10 / 3 = 3\n10 / 0 = 0",
-    34: "a: vowel\nb: consonant\n5: digit\n!: other",
-    35: "RED\nGREEN\nYELLOW\nRED\nGREEN\nYELLOW",
-    36: "6\n3\n10\n5\n16\n8\n4\n2\n1\nSteps: 8",
-    37: "Invalid: -1\nInvalid: 0\nInvalid: 200\nValid: 50\nInvalid: -5\nValid: 42",
-    38: "digit_sum(12345)  = 15\ndigit_sum(9999)   = 36\nft_reverse(12345) = 54321\nft_reverse(100)   = 1",
-    39: "0 1 1 2 3 5 8 13 21 34",
-    40: "*\n**\n***\n****\n*****\n*****\n****\n***\n**\n*",
-    41: "2 3 5 7 11 13 17 19 23 29 31 37 41 43 47\nCount: 15",
-    42: "Find 8:  Found at index 3\nFind 42: Found at index 4\nFind 99: Not found",
-    43: "[1]: 7\n[4]: 5\n[6]: 2\n[7]: 9\n[9]: 6\nSum of positives: 29",
-    44: "(1,1)=1\n(1,4)=4\n(2,2)=4\n(3,3)=9\n(4,4)=16\n(5,5)=25",
-    45: "Min: 1\nMax: 10\nSum: 55\nAvg: 5.50",
-    46: "Before: 64 34 25 12 22 11 90\nAfter:  11 12 22 25 34 64 90",
-    47: "1 2 3\n4 5 6\n7 8 9\nSum: 45\nTrace: 15",
-    48: "strlen: 5\nstrcpy: world\nstrcmp equal: 0\nstrcmp diff: nonzero\nstrchr: llo",
-    49: "upper: HELLO WORLD\nlower: hello world\nreverse: edcba\nwords: 4",
-    50: 'atoi("42"):    42\natoi("-100"):  -100\natoi("0"):     0\nitoa(12345):   12345\nitoa(-7):      -7',
-    51: "You entered: Hello42",
-    52: "Uppercase: 2\nLowercase: 8\nDigits: 2\nSpaces: 2",
-    53: "Line 1 (len=5): hello\nLine 2 (len=5): world\nLine 3 (len=2): 42",
-    54: "global: 0x[addr]\nstack:  0x[addr]\nheap:   0x[addr]",
-    55: "After double_val: 5\nAfter double_ref: 10",
-    56: "Before swap: a=10, b=20\nAfter swap:  a=20, b=10\nBefore swap: s1=hello, s2=world\nAfter swap:  s1=world, s2=hello",
-    57: "*p     = 10\n*(p+1) = 20\n*(p+2) = 30\n*(p+3) = 40\n*(p+4) = 50\nint units apart:  1\nbytes apart:      4",
-    58: "x    = 42\n*p   = 42\n**pp = 42\nAfter **pp = 99: x = 99",
-    59: "ft_add(10, 3) = 13\nft_sub(10, 3) = 7\nft_mul(10, 3) = 30\n2 4 6 8 10\n\nYou have completed the C Mastery Exam. You are ready.",
-}
+def show_subject(lvl=None):
+    if lvl is None: lvl = get_level()
+    lines = subject_lines(lvl)
+    if lines: sys.stdout.write("\n".join(lines) + "\n")
 
 # ══════════════════════════════════════════════════════════════════
 #  DIFF DISPLAY
 # ══════════════════════════════════════════════════════════════════
+DIFF_MAX_EDITS   = 2000     # line edits before falling back to index pairing
+DIFF_TIME_BUDGET = 0.25     # seconds for the whole line alignment
+DIFF_CHAR_EDITS  = 200      # char edits per line pair before giving up on spans
+DIFF_CONTEXT     = 2        # matching lines kept around each change
+DIFF_MAX_ROWS    = 60       # rows printed before "... more"
+
+def _common_prefix_len(a, b):
+    """Length of the common prefix, by bisection on slice compares (C speed)."""
+    lo, hi = 0, min(len(a), len(b))
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[:mid] == b[:mid]: lo = mid
+        else:                  hi = mid - 1
+    return lo
+
+def _common_suffix_len(a, b, limit):
+    lo, hi = 0, limit
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[len(a) - mid:] == b[len(b) - mid:]: lo = mid
+        else:                                    hi = mid - 1
+    return lo
+
+def myers_diff(a, b, max_edits=None, deadline=None):
+    """Shortest edit script from sequence a to b (Myers, O((N+M)·D)).
+
+    Returns a list of (op, i, j) with op "=" (a[i] == b[j]), "-" (a[i]
+    deleted) or "+" (b[j] inserted), or None when more than max_edits
+    edits are needed or time.perf_counter() passes deadline.
+    """
+    pre = _common_prefix_len(a, b)
+    suf = _common_suffix_len(a, b, min(len(a), len(b)) - pre)
+    A, B = a[pre:len(a) - suf], b[pre:len(b) - suf]
+    N, M = len(A), len(B)
+    limit = N + M if max_edits is None else min(N + M, max_edits)
+
+    off = limit + 1
+    v = [0] * (2 * limit + 3)
+    trace = []
+    final_d = None
+    for d in range(limit + 1):
+        if deadline is not None and time.perf_counter() > deadline:
+            return None
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and v[off + k - 1] < v[off + k + 1]):
+                x = v[off + k + 1]
+            else:
+                x = v[off + k - 1] + 1
+            y = x - k
+            while x < N and y < M and A[x] == B[y]:
+                x += 1; y += 1
+            v[off + k] = x
+            if x >= N and y >= M:
+                final_d = d
+                break
+        if final_d is not None: break
+        trace.append((-d - 1, v[off - d - 1:off + d + 2]))
+    if final_d is None:
+        return None
+
+    ops = []
+    x, y = N, M
+    for d in range(final_d, 0, -1):
+        lo, vd = trace[d - 1]
+        k = x - y
+        if k == -d or (k != d and vd[k - 1 - lo] < vd[k + 1 - lo]): pk = k + 1
+        else:                                                       pk = k - 1
+        px = vd[pk - lo]; py = px - pk
+        while x > px and y > py:
+            x -= 1; y -= 1
+            ops.append(("=", pre + x, pre + y))
+        if x == px: ops.append(("+", None, pre + py))
+        else:       ops.append(("-", pre + px, None))
+        x, y = px, py
+    while x > 0 and y > 0:
+        x -= 1; y -= 1
+        ops.append(("=", pre + x, pre + y))
+    ops.reverse()
+    head = [("=", i, i) for i in range(pre)]
+    tail = [("=", len(a) - suf + i, len(b) - suf + i) for i in range(suf)]
+    return head + ops + tail
+
+def char_spans(exp, got, max_edits=DIFF_CHAR_EDITS):
+    """Intra-line diff: ([(op, text)] for exp, [(op, text)] for got).
+
+    With max_edits=0 (or when the budget runs out) everything after the
+    common prefix is marked as changed.
+    """
+    ops = myers_diff(exp, got, max_edits=max_edits) if max_edits else None
+    if ops is None:
+        p = _common_prefix_len(exp, got)
+        return ([("=", exp[:p]), ("-", exp[p:])], [("=", got[:p]), ("+", got[p:])])
+    es, gs = [], []
+    def push(spans, op, ch):
+        if spans and spans[-1][0] == op: spans[-1] = (op, spans[-1][1] + ch)
+        else:                            spans.append((op, ch))
+    for op, i, j in ops:
+        if op == "=": push(es, "=", exp[i]); push(gs, "=", got[j])
+        elif op == "-": push(es, "-", exp[i])
+        else:           push(gs, "+", got[j])
+    return es, gs
+
+def diff_lines(expected_str, got_str, max_edits=DIFF_MAX_EDITS, time_budget=DIFF_TIME_BUDGET):
+    """Align expected and actual output line by line.
+
+    Returns {"aligned": bool, "rows": [...]}. Each row has op ("equal",
+    "replace", "missing", "unexpected"), exp/got text, 1-based exp_line /
+    got_line (None when absent) and, for the first DIFF_MAX_ROWS replace
+    rows, exp_spans/got_spans from char_spans(). When the edit or time
+    budget runs out, lines are paired by index instead and aligned is False.
+    """
+    exp = expected_str.splitlines()
+    got = got_str.splitlines() if got_str else []
+    ops = myers_diff(exp, got, max_edits, time.perf_counter() + time_budget)
+    aligned = ops is not None
+    if ops is None:
+        n = min(len(exp), len(got))
+        ops = []
+        for i in range(n):
+            ops += [("=", i, i)] if exp[i] == got[i] else [("-", i, None), ("+", None, i)]
+        ops += [("-", i, None) for i in range(n, len(exp))]
+        ops += [("+", None, j) for j in range(n, len(got))]
+
+    rows = []
+    dels, ins = [], []
+    detailed = [DIFF_MAX_ROWS]      # only rows that can be rendered get char spans
+    def flush():
+        for i, j in zip(dels, ins):
+            row = {"op": "replace", "exp": exp[i], "got": got[j],
+                   "exp_line": i + 1, "got_line": j + 1}
+            if detailed[0] > 0:
+                row["exp_spans"], row["got_spans"] = char_spans(exp[i], got[j])
+                detailed[0] -= 1
+            rows.append(row)
+        for i in dels[len(ins):]:
+            rows.append({"op": "missing", "exp": exp[i], "got": None,
+                         "exp_line": i + 1, "got_line": None})
+        for j in ins[len(dels):]:
+            rows.append({"op": "unexpected", "exp": None, "got": got[j],
+                         "exp_line": None, "got_line": j + 1})
+        del dels[:]; del ins[:]
+    for op, i, j in ops:
+        if op == "=":
+            flush()
+            rows.append({"op": "equal", "exp": exp[i], "got": got[j],
+                         "exp_line": i + 1, "got_line": j + 1})
+        elif op == "-": dels.append(i)
+        else:           ins.append(j)
+    flush()
+    return {"aligned": aligned, "rows": rows,
+            "exp_count": len(exp), "got_count": len(got)}
+
+def diff_to_json(diff):
+    return json.dumps(diff, ensure_ascii=False)
+
+def _span_color(op, base):
+    if op == "-": return "\033[30;42m"      # expected chars the output lacks
+    if op == "+": return "\033[30;41m"      # chars that shouldn't be there
+    return base
+
+def _fit(spans, width, focus=0, base=""):
+    """Render (op, text) spans into exactly width columns, scrolled to focus."""
+    text = "".join(t for _, t in spans)
+    start = 0
+    if len(text) > width and focus > width - 4:
+        start = min(focus - width // 3, len(text) - (width - 1))
+    end = start + width - (1 if start else 0)
+    clip = len(text) > end
+    if clip: end -= 1
+    out, pos = [], 0
+    if start: out.append(GRAY + "…" + RESET)
+    for op, t in spans:
+        lo, hi = max(pos, start), min(pos + len(t), end)
+        if hi > lo: out.append(_span_color(op, base) + t[lo - pos:hi - pos] + RESET)
+        pos += len(t)
+    if clip: out.append(GRAY + "…" + RESET)
+    visible = min(end, len(text)) - start + (1 if start else 0) + (1 if clip else 0)
+    return "".join(out) + " " * (width - visible)
+
+def render_diff(diff, width=None):
+    """Print the side-by-side table for a diff_lines() result."""
+    if width is None:
+        width = max(24, min(60, (shutil.get_terminal_size((80, 24)).columns - 12) // 2))
+    bar = "─" * (width + 2)
+    print(f"  {BOLD}{CYAN}┌{bar}┬{bar}┐{RESET}")
+    print(f"  {CYAN}│{RESET} {BOLD}{'EXPECTED':<{width}}{RESET} {CYAN}│{RESET} {BOLD}{'YOUR OUTPUT':<{width}}{RESET} {CYAN}│{RESET}")
+    print(f"  {CYAN}├{bar}┼{bar}┤{RESET}")
+
+    rows = diff["rows"]
+    keep = [False] * len(rows)
+    for idx, r in enumerate(rows):
+        if r["op"] != "equal":
+            for k in range(max(0, idx - DIFF_CONTEXT), min(len(rows), idx + DIFF_CONTEXT + 1)):
+                keep[k] = True
+    if not any(keep): keep = [True] * len(rows)
+
+    printed = 0
+    idx = 0
+    while idx < len(rows):
+        if not keep[idx]:
+            run = idx
+            while run < len(rows) and not keep[run]: run += 1
+            gap = f"··· {run - idx} matching line(s) ···"
+            print(f"  {CYAN}│{RESET} {GRAY}{gap:^{width * 2 + 3}}{RESET} {CYAN}│{RESET}")
+            idx = run
+            continue
+        if printed >= DIFF_MAX_ROWS:
+            more = sum(1 for r in rows[idx:] if r["op"] != "equal")
+            print(f"  {CYAN}│{RESET} {GRAY}{f'··· {more} more difference(s) ···':^{width * 2 + 3}}{RESET} {CYAN}│{RESET}")
+            break
+        r = rows[idx]
+        op = r["op"]
+        if op == "equal":
+            left  = _fit([("=", r["exp"])], width, base=GREEN)
+            right = _fit([("=", r["got"])], width, base=GREEN)
+            mark  = f"{GREEN}✓{RESET}"
+        elif op == "replace":
+            es, gs = r.get("exp_spans"), r.get("got_spans")
+            if es is None: es, gs = char_spans(r["exp"], r["got"], 0)
+            focus = len(es[0][1]) if es and es[0][0] == "=" else 0
+            left  = _fit(es, width, focus, base=GREEN)
+            right = _fit(gs, width, focus, base=RED) if r["got"] else f"{RED}{'(empty)':<{width}}{RESET}"
+            mark  = f"{RED}✗{RESET}"
+        elif op == "missing":
+            left  = _fit([("=", r["exp"])], width, base=GREEN)
+            right = f"{RED}{'(missing)':<{width}}{RESET}"
+            mark  = f"{RED}✗{RESET}"
+        else:
+            left  = f"{GRAY}{'(unexpected)':<{width}}{RESET}"
+            right = _fit([("=", r["got"])], width, base=RED)
+            mark  = f"{RED}✗{RESET}"
+        print(f"  {CYAN}│{RESET} {left} {CYAN}│{RESET} {right} {CYAN}│{RESET} {mark}")
+        printed += 1
+        idx += 1
+    print(f"  {CYAN}└{bar}┴{bar}┘{RESET}")
+    if not diff["aligned"]:
+        print(f"  {GRAY}(output too different to align — lines paired by position){RESET}")
+
 def show_diff(expected_str, got_str, lvl):
     if lvl == 54:
         print(f"  {YELLOW}Note:{RESET} Addresses vary per run — checking label format only.")
@@ -1330,55 +696,21 @@ def show_diff(expected_str, got_str, lvl):
         print()
         return
 
-    exp_lines = expected_str.splitlines()
-    got_lines = got_str.splitlines() if got_str else []
-
-    print(f"  {BOLD}{CYAN}┌─────────────────────────────────────────────────────────┐{RESET}")
-    print(f"  {CYAN}│{RESET}  {BOLD}{'EXPECTED':<24}{RESET}  {BOLD}{'YOUR OUTPUT':<24}{RESET}  {CYAN}│{RESET}")
-    print(f"  {CYAN}├──────────────────────────────┬──────────────────────────┤{RESET}")
-
-    max_rows = max(len(exp_lines), len(got_lines))
-    first_diff_idx = None
-
-    for i in range(max_rows):
-        el = exp_lines[i] if i < len(exp_lines) else None
-        gl = got_lines[i] if i < len(got_lines) else None
-        if el is None:
-            # extra line in output
-            gl_d = (gl or "")[:24]
-            print(f"  {CYAN}│{RESET}  {GRAY}{'(unexpected)':<28}{RESET}{CYAN}│{RESET}  {RED}{gl_d:<24}{RESET}  {CYAN}│{RESET} {RED}✗{RESET}")
-        elif gl is None:
-            # missing line
-            el_d = el[:28]
-            print(f"  {CYAN}│{RESET}  {GREEN}{el_d:<28}{RESET}{CYAN}│{RESET}  {RED}{'(missing)':<24}{RESET}  {CYAN}│{RESET} {RED}✗{RESET}")
-            if first_diff_idx is None: first_diff_idx = i
-        elif el == gl:
-            el_d = el[:28]; gl_d = gl[:24]
-            print(f"  {CYAN}│{RESET}  {GREEN}{el_d:<28}{RESET}{CYAN}│{RESET}  {GREEN}{gl_d:<24}{RESET}  {CYAN}│{RESET} {GREEN}✓{RESET}")
-        else:
-            el_d = el[:28]; gl_d = (gl or "")[:24]
-            print(f"  {CYAN}│{RESET}  {GREEN}{el_d:<28}{RESET}{CYAN}│{RESET}  {RED}{gl_d if gl_d else '(empty)':<24}{RESET}  {CYAN}│{RESET} {RED}✗{RESET}")
-            if first_diff_idx is None: first_diff_idx = i
-
-    print(f"  {CYAN}└──────────────────────────────┴──────────────────────────┘{RESET}")
+    diff = diff_lines(expected_str, got_str)
+    render_diff(diff)
 
-    if len(exp_lines) != len(got_lines):
-        print(f"  {RED}Line count: expected {len(exp_lines)}, got {len(got_lines)}{RESET}")
+    if diff["exp_count"] != diff["got_count"]:
+        print(f"  {RED}Line count: expected {diff['exp_count']}, got {diff['got_count']}{RESET}")
 
     # Char-level hint on first mismatch
-    if first_diff_idx is not None:
-        fe = exp_lines[first_diff_idx] if first_diff_idx < len(exp_lines) else ""
-        fg = got_lines[first_diff_idx] if first_diff_idx < len(got_lines) else ""
+    first = next((r for r in diff["rows"] if r["op"] != "equal"), None)
+    if first is not None:
+        fe = first["exp"] or ""
+        fg = first["got"] or ""
+        line_no = first["exp_line"] or first["got_line"]
         print()
-        print(f"  {BOLD}First difference on line {first_diff_idx + 1}:{RESET}")
-        max_c = max(len(fe), len(fg))
-        pos = max_c
-        for c_i in range(max_c):
-            ec = fe[c_i] if c_i < len(fe) else ""
-            gc = fg[c_i] if c_i < len(fg) else ""
-            if ec != gc:
-                pos = c_i
-                break
+        print(f"  {BOLD}First difference on line {line_no}:{RESET}")
+        pos = _common_prefix_len(fe, fg)
         ec = fe[pos] if pos < len(fe) else "(end)"
         gc = fg[pos] if pos < len(fg) else "(end)"
         print(f"  Expected char at pos {pos}: {GREEN}'{ec}'{RESET}")
@@ -1392,90 +724,497 @@ def show_diff(expected_str, got_str, lvl):
 # ══════════════════════════════════════════════════════════════════
 #  COMPILER / RUNNER
 # ══════════════════════════════════════════════════════════════════
+_gcc_cache = []
+
 def find_gcc():
-    """Find gcc on Windows (MinGW/MSYS2/WSL/Cygwin) or Linux/Mac."""
-    for candidate in ["gcc", "gcc.exe", "cc"]:
-        if shutil.which(candidate):
-            return candidate
-    return None
+    """Find gcc on Windows (MinGW/MSYS2/WSL/Cygwin) or Linux/Mac. Looked up once per session."""
+    if not _gcc_cache:
+        _gcc_cache.append(next((c for c in ["gcc", "gcc.exe", "cc"] if shutil.which(c)), None))
+    return _gcc_cache[0]
+
+_tcc_cache = []
+
+def find_tcc():
+    """tcc on PATH, or None. Looked up once per session."""
+    if not _tcc_cache:
+        _tcc_cache.append(shutil.which("tcc"))
+    return _tcc_cache[0]
+
+_prlimit_cache = []
+
+def find_prlimit():
+    """util-linux prlimit(1), or None. Looked up once per session."""
+    if not _prlimit_cache:
+        _prlimit_cache.append(shutil.which("prlimit"))
+    return _prlimit_cache[0]
+
+RUN_TIMEOUT        = 10
+CHUNK_SIZE         = 64 * 1024     # stdout read size
+OUTPUT_CAP_MIN     = 16 * 1024     # smallest per-level stdout cap (bytes)
+OUTPUT_CAP_DEFAULT = 1024 * 1024   # stdout cap when no level applies
+RLIMIT_AS_BYTES    = 1 << 30       # address-space cap for student binaries (None = off)
+RLIMIT_CPU_SECS    = 10            # CPU-time cap in seconds (None = off)
+
+STDIN_INPUTS = {
+    51: "Hello42\n",
+    52: "Hello World 42\n",
+    53: "hello\nworld\n42\n",
+}
 
-def run_program(binary, stdin_data=None):
-    """Run a compiled binary, optionally with stdin input."""
+def compile_args(gcc, src, binary, extra=()):
+    return [gcc, "-Wall", "-Wextra", "-Werror", *extra, src, "-o", binary, "-lm"]
+
+def compile_source(gcc, src, binary, extra=()):
+    """Compile one .c file with the exam flags. Returns the CompletedProcess."""
+    return subprocess.run(compile_args(gcc, src, binary, extra),
+                          capture_output=True, text=True)
+
+def quick_check_args(gcc, src):
+    """Front-end-only pass with the exam flags; its verdict matches the full build's."""
+    return [gcc, "-fsyntax-only", "-Wall", "-Wextra", "-Werror", src]
+
+def hint_args(tcc, src):
+    """tcc pass used as an early hint only: its front end and warnings differ from gcc's."""
+    return [tcc, "-Wall", "-Werror", "-c", src, "-o", os.devnull]
+
+def _stop(proc):
+    proc.kill(); proc.communicate()
+
+def two_tier_compile(gcc, src, binary):
+    """Run the quick check and the full build side by side.
+
+    The quick check (gcc -fsyntax-only) usually answers first; if it
+    fails the full build is killed and its diagnostics are returned
+    straight away. When tcc is installed it also runs, as a hint: its
+    verdict is recorded but never rejects code, since tcc and gcc warn
+    about different things. Returns (ok, stderr, timings) with
+    timings["check"] and timings["build"] in seconds (build is None when
+    it was cancelled), and timings["hint"] (tcc's verdict, or None).
+    """
+    t0 = time.perf_counter()
+    pipes = dict(stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    full  = subprocess.Popen(compile_args(gcc, src, binary), **pipes)
+    hint  = None
+    if find_tcc():
+        try: hint = subprocess.Popen(hint_args(find_tcc(), src), **pipes)
+        except OSError: pass
     try:
-        result = subprocess.run(
+        quick = subprocess.Popen(quick_check_args(gcc, src), **pipes)
+        _, quick_err = quick.communicate()
+        quick_ok = quick.returncode == 0
+    except OSError:
+        quick_ok, quick_err = True, ""
+    timings = {"check": time.perf_counter() - t0, "build": None, "hint": None}
+    if hint is not None:
+        if hint.poll() is None: _stop(hint)     # slower than gcc's own check: no use any more
+        else:
+            hint.communicate()
+            timings["hint"] = hint.returncode == 0
+
+    if not quick_ok:
+        _stop(full)
+        try: os.remove(binary)
+        except OSError: pass
+        return False, quick_err, timings
+
+    _, full_err = full.communicate()
+    timings["build"] = time.perf_counter() - t0
+    return full.returncode == 0, full_err, timings
+
+def _rlimit_setter(limits):
+    """preexec_fn applying RLIMIT_AS / RLIMIT_CPU in the child (POSIX only)."""
+    if resource is None or not limits: return None
+    def apply():
+        if limits.get("as"):  resource.setrlimit(resource.RLIMIT_AS,  (limits["as"],  limits["as"]))
+        if limits.get("cpu"): resource.setrlimit(resource.RLIMIT_CPU, (limits["cpu"], limits["cpu"]))
+    return apply
+
+def _limit_prefix(limits):
+    """argv prefix that sets RLIMIT_AS / RLIMIT_CPU and then execs the binary.
+
+    [] when there is nothing to set, None when limits are wanted but
+    prlimit(1) is not installed.
+    """
+    opts = []
+    if limits and limits.get("as"):  opts.append(f"--as={limits['as']}")
+    if limits and limits.get("cpu"): opts.append(f"--cpu={limits['cpu']}")
+    if not opts: return []
+    if resource is None or not find_prlimit(): return None
+    return [find_prlimit(), *opts, "--"]
+
+def _exit_code(status):
+    if os.WIFSIGNALED(status): return -os.WTERMSIG(status)
+    return os.WEXITSTATUS(status)
+
+def _feed_stdin(pipe, data):
+    try:
+        if data: pipe.write(data)
+    except (BrokenPipeError, OSError): pass
+    finally:
+        try: pipe.close()
+        except OSError: pass
+
+def output_cap(lvl):
+    """Per-level stdout cap: room for debug prints, tiny next to a runaway loop."""
+    return max(OUTPUT_CAP_MIN, 64 * len(EXPECTED.get(lvl, "")))
+
+def _kill_group(proc):
+    try:
+        if os.name == "posix": os.killpg(proc.pid, signal.SIGKILL)
+        else:                  proc.kill()
+    except OSError: pass
+
+def _drain(fd, max_output, kill):
+    """Read fd to EOF into at most max_output bytes. Returns (buf, overflowed)."""
+    buf = bytearray()
+    while True:
+        chunk = os.read(fd, CHUNK_SIZE)
+        if not chunk: return buf, False
+        room = max_output - len(buf)
+        if len(chunk) > room:
+            buf += chunk[:room]
+            kill()
+            return buf, True
+        buf += chunk
+
+def _own_maxrss():
+    """This process's peak RSS, in the platform's ru_maxrss units."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss if resource else 0
+
+def _run_result(buf, verdict, rc, t0, ru):
+    """Build run_program()'s (out, rc, usage) triple from a finished run."""
+    usage = {"wall": round(time.perf_counter() - t0, 4)}
+    if ru is not None:
+        usage.update({
+            "user":   round(ru.ru_utime, 4),
+            "sys":    round(ru.ru_stime, 4),
+            "minflt": ru.ru_minflt,
+            "majflt": ru.ru_majflt,
+        })
+        # ru_maxrss also counts the interpreter image the child ran in before
+        # exec, so it is the binary's own peak only when it beats ours.
+        if ru.ru_maxrss > _own_maxrss():
+            usage["rss"] = ru.ru_maxrss // 1024 if sys.platform == "darwin" else ru.ru_maxrss
+    out = buf.decode("utf-8", errors="replace").strip()
+    if verdict:
+        usage["verdict"] = verdict[0]
+        if verdict[0] == "TIMEOUT": return "[TIMEOUT]", 1, usage
+        return out, 1, usage
+    return out, rc, usage
+
+def run_program(binary, stdin_data=None, limits=None, env=None, max_output=OUTPUT_CAP_DEFAULT):
+    """Run a compiled binary, optionally with stdin input (str or bytes).
+
+    Returns (stdout stripped, return code, usage). stdout is read in chunks
+    into a buffer of at most max_output bytes; past that the whole process
+    group is killed and usage["verdict"] is "OUTPUT LIMIT" ("TIMEOUT" after
+    RUN_TIMEOUT seconds). Output is decoded as UTF-8 with replacement.
+    usage also holds wall/user/sys seconds and minor/major page faults,
+    taken from wait4() for this child only (wall time only on Windows).
+    usage["rss"] (peak RSS in KiB) is only set when it can be told apart
+    from the grader's own: wait4() reports the larger of the two.
+    """
+    if limits is None:
+        limits = {"as": RLIMIT_AS_BYTES, "cpu": RLIMIT_CPU_SECS}
+    if isinstance(stdin_data, bytes): data = stdin_data
+    else: data = stdin_data.encode() if stdin_data else b""
+    t0 = time.perf_counter()
+    try:
+        proc = subprocess.Popen(
             [binary],
-            input=stdin_data,
-            capture_output=True,
-            text=True,
-            timeout=10
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            preexec_fn=_rlimit_setter(limits),
+            start_new_session=(os.name == "posix"),
+            env=env
         )
-        return result.stdout.strip(), result.returncode
-    except subprocess.TimeoutExpired:
-        return "[TIMEOUT]", 1
     except Exception as e:
-        return f"[RUN ERROR: {e}]", 1
+        return f"[RUN ERROR: {e}]", 1, {}
+
+    verdict = []
+    def on_timeout():
+        verdict.append("TIMEOUT")
+        _kill_group(proc)
+    timer  = threading.Timer(RUN_TIMEOUT, on_timeout)
+    feeder = threading.Thread(target=_feed_stdin, args=(proc.stdin, data), daemon=True)
+    timer.start(); feeder.start()
+
+    buf = bytearray()
+    ru  = None
+    try:
+        buf, over = _drain(proc.stdout.fileno(), max_output, lambda: _kill_group(proc))
+        if over: verdict.append("OUTPUT LIMIT")
+    finally:
+        if hasattr(os, "wait4"):
+            _, status, ru = os.wait4(proc.pid, 0)
+            proc.returncode = _exit_code(status)
+        else:
+            proc.wait()
+        timer.cancel()
+        proc.stdout.close()
+        feeder.join()
+    return _run_result(buf, verdict, proc.returncode, t0, ru)
+
+class BinaryRunner:
+    """Run one compiled binary many times with as little per-run setup as possible.
+
+    The binary is copied once into a tmpfs staging directory (/dev/shm
+    when it exists) and every run is started with os.posix_spawn in its
+    own process group, reusing one environment block and one /dev/null
+    descriptor for stderr. posix_spawn cannot set resource limits, so the
+    binary is started through prlimit(1), which sets them and then execs
+    it in the same process. run() returns the same (out, rc, usage)
+    triple as run_program(), which is also the fallback where
+    posix_spawn is not available (Windows) or limits are wanted and
+    prlimit(1) is not installed.
+    """
+    def __init__(self, binary, limits=None, env=None, max_output=OUTPUT_CAP_DEFAULT):
+        if limits is None:
+            limits = {"as": RLIMIT_AS_BYTES, "cpu": RLIMIT_CPU_SECS}
+        self.limits     = limits
+        self.max_output = max_output
+        self.env        = env
+        self.binary     = os.path.abspath(binary)
+        prefix          = _limit_prefix(limits)
+        self.spawn      = hasattr(os, "posix_spawn") and hasattr(os, "wait4") and prefix is not None
+        self._dir = self._devnull = self._pool = None
+        if self.spawn:
+            shm = "/dev/shm" if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK) else None
+            self._dir = tempfile.mkdtemp(prefix="miles3103_run_", dir=shm)
+            self.binary = shutil.copy2(self.binary, self._dir)
+            self._argv = [*prefix, self.binary]
+            self._env = dict(os.environ if env is None else env)
+            self._devnull = os.open(os.devnull, os.O_WRONLY)
+
+    def __enter__(self): return self
+    def __exit__(self, *exc): self.close()
+
+    def close(self):
+        if self._pool: self._pool.shutdown()
+        if self._devnull is not None: os.close(self._devnull)
+        if self._dir: shutil.rmtree(self._dir, ignore_errors=True)
+        self._pool = self._devnull = self._dir = None
+
+    def run(self, stdin_data=None):
+        if not self.spawn:
+            return run_program(self.binary, stdin_data, self.limits, self.env, self.max_output)
+        if isinstance(stdin_data, bytes): data = stdin_data
+        else: data = stdin_data.encode() if stdin_data else b""
+        in_r, in_w = os.pipe()
+        out_r, out_w = os.pipe()
+        t0 = time.perf_counter()
+        try:
+            pid = os.posix_spawn(self._argv[0], self._argv, self._env, setpgroup=0,
+                                 file_actions=[(os.POSIX_SPAWN_DUP2, in_r, 0),
+                                               (os.POSIX_SPAWN_DUP2, out_w, 1),
+                                               (os.POSIX_SPAWN_DUP2, self._devnull, 2)])
+        except OSError as e:
+            for fd in (in_w, out_r): os.close(fd)
+            return f"[RUN ERROR: {e}]", 1, {}
+        finally:
+            os.close(in_r); os.close(out_w)
+
+        def kill():
+            try: os.killpg(pid, signal.SIGKILL)
+            except OSError: pass
+        verdict = []
+        def on_timeout():
+            verdict.append("TIMEOUT")
+            kill()
+        timer = threading.Timer(RUN_TIMEOUT, on_timeout)
+        timer.start()
+        feeder = None
+        if len(data) <= 4096:               # fits the pipe buffer: write inline
+            _feed_stdin(open(in_w, "wb", buffering=0), data)
+        else:
+            feeder = threading.Thread(target=_feed_stdin, args=(open(in_w, "wb"), data), daemon=True)
+            feeder.start()
+        try:
+            buf, over = _drain(out_r, self.max_output, kill)
+            if over: verdict.append("OUTPUT LIMIT")
+        finally:
+            _, status, ru = os.wait4(pid, 0)
+            timer.cancel()
+            os.close(out_r)
+            if feeder: feeder.join()
+        return _run_result(buf, verdict, _exit_code(status), t0, ru)
+
+    def run_many(self, inputs, workers=None):
+        """Run every input on a small thread pool; results come back in input order."""
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=workers or min(32, (os.cpu_count() or 1) * 4))
+        return list(self._pool.map(self.run, inputs))
+
+def fmt_ms(seconds):
+    return f"{float(seconds) * 1000:.1f}ms"
+
+def fmt_usage(usage):
+    """One-line summary of a run_program() usage dict."""
+    if not usage: return ""
+    parts = [f"wall {fmt_ms(usage['wall'])}"]
+    if "user" in usage:
+        parts.append(f"user {fmt_ms(usage['user'])}")
+        parts.append(f"sys {fmt_ms(usage['sys'])}")
+        if "rss" in usage: parts.append(f"rss {int(usage['rss']) / 1024:.1f}MB")
+        parts.append(f"faults {usage['minflt']}+{usage['majflt']}")
+    return " · ".join(parts)
 
 # ══════════════════════════════════════════════════════════════════
-#  GRADER
+#  TRACE LOGS  (rotating, gzip-compressed, indexed)
+#  traces/trace_<dir>.txt        active segment, plain text
+#  traces/trace_<dir>.idx        its index: offset, length, level, time, verdict
+#  traces/trace_<dir>.<n>.txt.gz rotated segment, one gzip member per record
+#  traces/trace_<dir>.<n>.idx    index of that segment (compressed offsets)
 # ══════════════════════════════════════════════════════════════════
-def grade_me():
-    level = get_level()
-    fname = get_filename(level)
-    dname = get_dirname(level)
-    task_dir = os.path.join("rendu", dname)
-    os.makedirs(task_dir, exist_ok=True)
-    trace_dir = "traces"
-    os.makedirs(trace_dir, exist_ok=True)
-    trace_file = os.path.join(trace_dir, f"trace_{dname}.txt")
+TRACE_ROTATE_BYTES = 256 * 1024
+TRACE_ROTATE_DAYS  = 7
+
+_TRACE_HEADER = re.compile(rb"^=== Level (\d+)(.*?) \| (.+?) ===$", re.M)
+
+def _trace_base(dname):
+    return os.path.join("traces", f"trace_{dname}")
+
+def _read_trace_index(path):
+    entries = []
+    for line in _lines(path):
+        off, length, lvl, ts, verdict = line.split("\t", 4)
+        entries.append((int(off), int(length), int(lvl), int(ts), verdict))
+    return entries
+
+def _trace_segments(dname):
+    """Rotated segments as [(n, gz_path, idx_path)], oldest first."""
+    base = _trace_base(dname)
+    segs = []
+    for path in glob.glob(glob.escape(base) + ".*.txt.gz"):
+        n = path[len(base) + 1:-len(".txt.gz")]
+        if n.isdigit(): segs.append((int(n), path, f"{base}.{n}.idx"))
+    return sorted(segs)
+
+def _index_legacy_trace(txt, idx):
+    """Index a trace file written before indexing existed."""
+    with open(txt, "rb") as fh: data = fh.read()
+    heads = list(_TRACE_HEADER.finditer(data))
+    fallback = int(os.path.getmtime(txt))
+    lines = []
+    for i, m in enumerate(heads):
+        end = heads[i + 1].start() if i + 1 < len(heads) else len(data)
+        try:    ts = int(datetime.datetime.fromisoformat(m.group(3).decode()).timestamp())
+        except ValueError: ts = fallback
+        verdict = m.group(2).decode(errors="replace").strip() or "?"
+        lines.append(f"{m.start()}\t{end - m.start()}\t{m.group(1).decode()}\t{ts}\t{verdict}")
+    with open(idx, "w") as fh:
+        fh.write("".join(l + "\n" for l in lines))
+
+def _rotate_trace(dname):
+    """Move the active segment into a new gzip segment if it is too big or too old."""
+    base = _trace_base(dname)
+    txt, idx = base + ".txt", base + ".idx"
+    entries = _read_trace_index(idx)
+    if not entries: return
+    too_big = os.path.getsize(txt) >= TRACE_ROTATE_BYTES
+    too_old = time.time() - entries[0][3] >= TRACE_ROTATE_DAYS * 86400
+    if not (too_big or too_old): return
+
+    segs = _trace_segments(dname)
+    n = segs[-1][0] + 1 if segs else 1
+    gz_path, seg_idx = f"{base}.{n}.txt.gz", f"{base}.{n}.idx"
+    lines = []
+    with open(txt, "rb") as src, open(gz_path + ".tmp", "wb") as out:
+        for off, length, lvl, ts, verdict in entries:
+            src.seek(off)
+            member = gzip.compress(src.read(length))
+            lines.append(f"{out.tell()}\t{len(member)}\t{lvl}\t{ts}\t{verdict}")
+            out.write(member)
+    with open(seg_idx, "w") as fh:
+        fh.write("".join(l + "\n" for l in lines))
+    os.replace(gz_path + ".tmp", gz_path)
+    os.remove(txt); os.remove(idx)
+
+def write_trace(dname, level, verdict, body):
+    """Append one attempt record to the level's trace and index it."""
+    os.makedirs("traces", exist_ok=True)
+    base = _trace_base(dname)
+    txt, idx = base + ".txt", base + ".idx"
+    if os.path.isfile(txt) and not os.path.isfile(idx):
+        _index_legacy_trace(txt, idx)
+    _rotate_trace(dname)
+    now = datetime.datetime.now()
+    record = f"=== Level {level} {verdict} | {now} ===\n{body}\n".encode("utf-8", "replace")
+    with open(txt, "ab") as fh:
+        off = fh.seek(0, os.SEEK_END)
+        fh.write(record)
+    _append(idx, f"{off}\t{len(record)}\t{level}\t{int(now.timestamp())}\t{verdict}")
+    return txt
+
+def read_trace(dname, n=1):
+    """The n-th most recent record as (level, epoch, verdict, text), or None.
+
+    Walks segment indexes newest first and reads only the one record.
+    """
+    base = _trace_base(dname)
+    txt, idx = base + ".txt", base + ".idx"
+    if os.path.isfile(txt) and not os.path.isfile(idx):
+        _index_legacy_trace(txt, idx)
+    sources = [(txt, idx, False)]
+    sources += [(gz, sidx, True) for _, gz, sidx in reversed(_trace_segments(dname))]
+    for data_path, idx_path, packed in sources:
+        entries = _read_trace_index(idx_path)
+        if n <= len(entries):
+            off, length, lvl, ts, verdict = entries[-n]
+            with open(data_path, "rb") as fh:
+                fh.seek(off)
+                raw = fh.read(length)
+            if packed: raw = gzip.decompress(raw)
+            return lvl, ts, verdict, raw.decode("utf-8", "replace")
+        n -= len(entries)
+    return None
 
+def show_trace(level, n=1):
+    dname = get_dirname(level)
+    rec = read_trace(dname, n)
     print()
-    print(f"{BOLD}{CYAN}┌─────────────────────────────────────────────────────────┐{RESET}")
-    print(f"{CYAN}│{RESET}  {BOLD}Grading Level {level:<3}{RESET}  File: {WHITE}{fname:<28}{RESET}{CYAN}│{RESET}")
-    print(f"{BOLD}{CYAN}└─────────────────────────────────────────────────────────┘{RESET}")
-
-    src = os.path.join(task_dir, fname)
-    if not os.path.isfile(src):
-        print(f"{RED}  ✗ ERROR:{RESET} {src} not found.")
-        print(f"  Create your file there and run {BOLD}grademe{RESET} again.")
-        return
-
-    gcc = find_gcc()
-    if not gcc:
-        print(f"{RED}  ✗ ERROR:{RESET} gcc not found. Install MinGW-w64 or GCC.")
-        print("  Download: https://www.mingw-w64.org/  or use MSYS2.")
-        return
+    if rec is None:
+        print(f"  {GRAY}No trace #{n} for {get_filename(level)}.{RESET}")
+    else:
+        lvl, ts, verdict, text = rec
+        when = datetime.datetime.fromtimestamp(ts).strftime("%Y-%m-%d %H:%M")
+        col = GREEN if verdict == "PASS" else RED
+        print(f"{BOLD}  Trace #{n} (most recent = 1) — Level {lvl}{RESET}  {col}{verdict}{RESET}  {GRAY}{when}{RESET}")
+        print(f"{GRAY}  ──────────────────────────────{RESET}")
+        body = text.split("\n", 1)[1] if "\n" in text else ""
+        for line in body.rstrip("\n").splitlines():
+            print(f"  {line}")
+    print()
+    pause()
 
-    binary = "eval_bin.exe" if sys.platform == "win32" else "eval_bin"
-    print(f"{GRAY}  Compiling...{RESET}", end="", flush=True)
+# ══════════════════════════════════════════════════════════════════
+#  GRADER
+# ══════════════════════════════════════════════════════════════════
+GRADE_PHASES = ["source", "gcc", "compile", "run", "match", "trace", "state", "save"]
+LOGGED_PHASES = GRADE_PHASES[:-1]   # the auto-save runs after the attempt line is written
 
-    compile_result = subprocess.run(
-        [gcc, "-Wall", "-Wextra", "-Werror", src, "-o", binary, "-lm"],
-        capture_output=True, text=True
-    )
+class PhaseTimer:
+    """Monotonic lap timer: lap(name) charges the time since the last lap to name."""
+    def __init__(self):
+        self.phases = {}
+        self._t = time.perf_counter()
 
-    if compile_result.returncode != 0:
-        print(f"\r{RED}  ✗ COMPILE ERROR{RESET}")
-        print()
-        print(compile_result.stderr)
-        with open(trace_file, "a") as tf:
-            tf.write(f"=== Level {level} COMPILE ERROR | {datetime.datetime.now()} ===\n")
-            tf.write(compile_result.stderr + "\n")
-        print(f"{GRAY}  Trace saved: {trace_file}{RESET}")
-        return
-    print(f"\r{GREEN}  ✓ Compiled OK{RESET}")
+    def lap(self, name):
+        now = time.perf_counter()
+        self.phases[name] = self.phases.get(name, 0.0) + now - self._t
+        self._t = now
 
-    # --- Run & check ---
-    output, _ = run_program(f"./{binary}")
-    PASS = False
+    def extras(self):
+        return {f"ph_{k}": round(v, 5) for k, v in self.phases.items()}
 
-    def contains(text, sub): return sub in text
+def check_output(lvl, out):
+    """Apply level lvl's acceptance rule to the program output."""
     def line_eq(text, n, val):
         lines = text.splitlines()
         return len(lines) >= n and lines[n-1] == val
 
-    lvl = level
-    out = output
-
+    PASS = False
     if   lvl == 0:  PASS = out == "Hello, C World!"
     elif lvl == 1:  PASS = "Program starting" in out and "Program done" in out
     elif lvl == 2:  PASS = all(x in out for x in ["Preprocessing","Compilation","Assembly","Linking"])
@@ -1542,19 +1281,9 @@ def grade_me():
     elif lvl == 48: PASS = all(x in out for x in ["strlen: 5","strcpy: world","strcmp equal: 0","strchr: llo"])
     elif lvl == 49: PASS = all(x in out for x in ["upper: HELLO WORLD","lower: hello world","reverse: edcba","words: 4"])
     elif lvl == 50: PASS = all(x in out for x in ['atoi("42"):    42','atoi("-100"):  -100','atoi("0"):     0','itoa(12345):   12345','itoa(-7):      -7'])
-    elif lvl == 51:
-        inp_out, _ = run_program(f"./{binary}", stdin_data="Hello42\n")
-        PASS = "You entered: Hello42" in inp_out
-        output = inp_out
-        out = inp_out
-    elif lvl == 52:
-        inp_out, _ = run_program(f"./{binary}", stdin_data="Hello World 42\n")
-        PASS = all(x in inp_out for x in ["Uppercase: 2","Lowercase: 8","Digits: 2","Spaces: 2"])
-        output = inp_out; out = inp_out
-    elif lvl == 53:
-        inp_out, _ = run_program(f"./{binary}", stdin_data="hello\nworld\n42\n")
-        PASS = all(x in inp_out for x in ["Line 1 (len=5): hello","Line 2 (len=5): world","Line 3 (len=2): 42"])
-        output = inp_out; out = inp_out
+    elif lvl == 51: PASS = "You entered: Hello42" in out
+    elif lvl == 52: PASS = all(x in out for x in ["Uppercase: 2","Lowercase: 8","Digits: 2","Spaces: 2"])
+    elif lvl == 53: PASS = all(x in out for x in ["Line 1 (len=5): hello","Line 2 (len=5): world","Line 3 (len=2): 42"])
     elif lvl == 54: PASS = "global: 0x" in out and "stack:  0x" in out and "heap:   0x" in out
     elif lvl == 55: PASS = "After double_val: 5" in out and "After double_ref: 10" in out
     elif lvl == 56: PASS = all(x in out for x in ["Before swap: a=10, b=20","After swap:  a=20, b=10","Before swap: s1=hello, s2=world","After swap:  s1=world, s2=hello"])
@@ -1562,29 +1291,127 @@ def grade_me():
     elif lvl == 58: PASS = all(x in out for x in ["x    = 42","**pp = 42","After **pp = 99: x = 99"])
     elif lvl == 59: PASS = all(x in out for x in ["ft_add(10, 3) = 13","ft_sub(10, 3) = 7","ft_mul(10, 3) = 30","2 4 6 8 10","You have completed"])
     else:           PASS = True
+    return PASS
+
+def grade_level(level, advance=True):
+    """Compile, run and check `level`, then record the attempt.
+
+    This is the engine behind both grademe and the headless `grade`
+    subcommand: it never prints or prompts. Returns a dict with status
+    ("missing", "no-compiler", "compile-error", "pass" or "fail"), the
+    program output, run usage, compile timings and the trace path. On a
+    pass the level is advanced only when `advance` is true. Per-phase
+    times (GRADE_PHASES) are returned in "phases"; all but "save" are
+    stored with the attempt as ph_<phase> extras, since the attempt
+    line must be in the log before the auto-save copies it.
+    """
+    timer = PhaseTimer()
+    fname = get_filename(level)
+    dname = get_dirname(level)
+    task_dir = os.path.join("rendu", dname)
+    os.makedirs(task_dir, exist_ok=True)
+    src = os.path.join(task_dir, fname)
+    result = {"level": level, "file": src, "status": None, "passed": False,
+              "verdict": None, "output": "", "usage": {}, "compile": None,
+              "stderr": "", "trace": None, "new_point": False, "phases": timer.phases}
 
-    # Show output box
-    print()
-    print(f"{GRAY}┌── Your output ─────────────────────────────────────────────┐{RESET}")
-    for line in output.splitlines():
-        print(f"{GRAY}│{RESET} {line}")
-    print(f"{GRAY}└────────────────────────────────────────────────────────────┘{RESET}")
-    print()
-
-    # Append trace
-    with open(trace_file, "a") as tf:
-        tf.write(f"=== Level {level} | {datetime.datetime.now()} ===\n{output}\n")
+    found = os.path.isfile(src)
+    timer.lap("source")
+    if not found:
+        result["status"] = "missing"; return result
+    gcc = find_gcc()
+    timer.lap("gcc")
+    if not gcc:
+        result["status"] = "no-compiler"; return result
 
-    # Cleanup binary
+    binary = "eval_bin.exe" if sys.platform == "win32" else "eval_bin"
+    ok, stderr, result["compile"] = two_tier_compile(gcc, src, binary)
+    timer.lap("compile")
+    if not ok:
+        result.update(status="compile-error", stderr=stderr,
+                      trace=write_trace(dname, level, "COMPILE ERROR", stderr))
+        return result
+
+    cap = output_cap(level)
+    output, _, usage = run_program(f"./{binary}", stdin_data=STDIN_INPUTS.get(level), max_output=cap)
+    timer.lap("run")
+    verdict = usage.get("verdict")
+    PASS = not verdict and check_output(level, output)
+    result.update(status="pass" if PASS else "fail", passed=PASS, verdict=verdict,
+                  output=output, usage=usage, cap=cap)
+    timer.lap("match")
+
+    result["trace"] = write_trace(dname, level, "PASS" if PASS else (verdict or "FAIL"), output)
     try: os.remove(binary)
     except: pass
+    timer.lap("trace")
 
     if PASS:
-        add_attempt(level, "PASS")
         inc_streak()
         if not already_passed(level):
             add_score(1)
             mark_passed(level)
+            result["new_point"] = True
+    else:
+        reset_streak()
+    timer.lap("state")
+    add_attempt(level, "PASS" if PASS else "FAIL", dict(usage, **timer.extras()))
+    timer.lap("state")
+    if PASS:
+        auto_save()
+        timer.lap("save")
+        if advance: set_level(level + 1)
+    return result
+
+def grade_me():
+    level = get_level()
+    fname = get_filename(level)
+
+    print()
+    print(f"{BOLD}{CYAN}┌─────────────────────────────────────────────────────────┐{RESET}")
+    print(f"{CYAN}│{RESET}  {BOLD}Grading Level {level:<3}{RESET}  File: {WHITE}{fname:<28}{RESET}{CYAN}│{RESET}")
+    print(f"{BOLD}{CYAN}└─────────────────────────────────────────────────────────┘{RESET}")
+    print(f"{GRAY}  Compiling...{RESET}", end="", flush=True)
+
+    r = grade_level(level)
+    if r["status"] == "missing":
+        print(f"\r{RED}  ✗ ERROR:{RESET} {r['file']} not found.")
+        print(f"  Create your file there and run {BOLD}grademe{RESET} again.")
+        return
+    if r["status"] == "no-compiler":
+        print(f"\r{RED}  ✗ ERROR:{RESET} gcc not found. Install MinGW-w64 or GCC.")
+        print("  Download: https://www.mingw-w64.org/  or use MSYS2.")
+        return
+
+    ct = r["compile"]
+    check_ms = f"check {fmt_ms(ct['check'])}"
+    build_ms = f"build {fmt_ms(ct['build'])}" if ct["build"] is not None else "build cancelled"
+    if r["status"] == "compile-error":
+        print(f"\r{RED}  ✗ COMPILE ERROR{RESET}  {GRAY}({check_ms}, {build_ms}){RESET}")
+        print()
+        print(r["stderr"])
+        print(f"{GRAY}  Trace saved: {r['trace']}{RESET}")
+        return
+    print(f"\r{GREEN}  ✓ Compiled OK{RESET}  {GRAY}({check_ms}, {build_ms}){RESET}")
+
+    verdict, usage, cap = r["verdict"], r["usage"], r["cap"]
+
+    # Show output box
+    print()
+    print(f"{GRAY}┌── Your output ─────────────────────────────────────────────┐{RESET}")
+    shown = r["output"].splitlines()
+    if verdict == "OUTPUT LIMIT": shown = shown[:20]
+    for line in shown:
+        print(f"{GRAY}│{RESET} {line}")
+    if verdict == "OUTPUT LIMIT":
+        print(f"{GRAY}│{RESET} {RED}... output passed {cap // 1024} KB — program killed{RESET}")
+    print(f"{GRAY}└────────────────────────────────────────────────────────────┘{RESET}")
+    if usage:
+        print(f"  {GRAY}Run: {fmt_usage(usage)}{RESET}")
+    print()
+
+    if r["passed"]:
+        if r["new_point"]:
             score_msg = f"  {GREEN}+1 point awarded!{RESET}  Score: {BOLD}{get_score()}/60{RESET}"
         else:
             score_msg = f"  {GRAY}(already cleared — no extra point){RESET}"
@@ -1601,11 +1428,9 @@ def grade_me():
         print(f"{GREEN}  Level {BOLD}{level}{RESET}{GREEN} cleared!  [ {WHITE}{fname}{GREEN} ]{RESET}")
         print(score_msg)
         if streak_msg: print(streak_msg)
-        auto_save()
         print(f"  {GRAY}(auto-saved){RESET}")
 
         next_lvl = level + 1
-        set_level(next_lvl)
 
         if next_lvl > MAX_LEVEL:
             print()
@@ -1626,14 +1451,13 @@ def grade_me():
         print()
         pause(f"  Press Enter for Level {next_lvl}...")
     else:
-        add_attempt(level, "FAIL")
-        reset_streak()
         attempts   = get_attempts(level)
         fails_here = get_fails_for(level)
         total_fail = get_total_fail()
 
+        label = f"✗  {verdict or 'FAIL'}"
         print(f"{RED}  ╔══════════════════════════════════════════════════════╗{RESET}")
-        print(f"{RED}  ║                    ✗  FAIL                          ║{RESET}")
+        print(f"{RED}  ║{label:^53}║{RESET}")
         print(f"{RED}  ╚══════════════════════════════════════════════════════╝{RESET}")
         print()
         print(f"  Attempt {BOLD}#{attempts}{RESET} on level {BOLD}{level}{RESET}. {RED}Fails on this level: {fails_here}{RESET}  |  {RED}Total fails all-time: {total_fail}{RESET}")
@@ -1641,7 +1465,7 @@ def grade_me():
 
         exp_str = EXPECTED.get(level, "")
         if exp_str:
-            show_diff(exp_str, output, level)
+            show_diff(exp_str, "\n".join(shown), level)
 
         if attempts == 1:
             print(f"  {YELLOW}Tip:{RESET} Compare your output letter-by-letter with expected.")
@@ -1657,14 +1481,541 @@ def grade_me():
         print()
         print(f"  Score: {BOLD}{get_score()}/60{RESET}   Streak reset to 0.")
         print()
-        time.sleep(0.3)
+        _sleep(0.3)
         pause("  Press Enter to try again...")
 
+# ══════════════════════════════════════════════════════════════════
+#  FUNCTION-LEVEL HARNESS  (unitgrade)
+#  The student's main is renamed at compile time, the object file is
+#  linked against a generated driver, and the driver calls the
+#  student's functions once per stdin line — thousands of checks in
+#  a single process, verified against a Python oracle.
+# ══════════════════════════════════════════════════════════════════
+UNIT_CASES = 2000
+INT_MIN, INT_MAX = -2**31, 2**31 - 1
+
+DRIVER_TEMPLATE = """#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <unistd.h>
+
+%(protos)s
+
+int main(void)
+{
+    static char line[8192];
+
+    while (fgets(line, sizeof line, stdin))
+    {
+        line[strcspn(line, "\\n")] = 0;
+        {
+%(body)s
+        }
+    }
+    return 0;
+}
+"""
+
+def _gen_putnbr(rng, n):
+    cases = [0, 1, -1, 9, 10, -10, 99, 100, -100, INT_MAX, INT_MIN, INT_MIN + 1]
+    while len(cases) < n:
+        digits = rng.randint(1, 10)
+        cases.append(rng.randint(-(10 ** digits) + 1, 10 ** digits - 1))
+    return [str(max(INT_MIN, min(INT_MAX, x))) for x in cases]
+
+def _gen_digitsum(rng, n):
+    cases = [0, 1, 9, 10, 100, 12345, 9999, 1000000, 99999999]
+    while len(cases) < n:
+        cases.append(rng.randint(0, 10 ** rng.randint(1, 8) - 1))
+    return [str(x) for x in cases]
+
+def _oracle_digitsum(line):
+    return f"{sum(int(d) for d in line)} {int(line[::-1])}"
+
+_STR_ALPHABET = "".join(chr(i) for i in range(32, 127))
+
+def _gen_strfuncs(rng, n):
+    cases = ["hello\thello\tl", "\t\tx", "a\t\ta", "abc\tabd\tz", "world\thello\td"]
+    while len(cases) < n:
+        size = rng.choice([0, 1, 2, 5, 16, 64, rng.randint(0, 1000)])
+        s1 = "".join(rng.choice(_STR_ALPHABET) for _ in range(size))
+        roll = rng.random()
+        if roll < 0.3:   s2 = s1
+        elif roll < 0.6: s2 = s1[:rng.randint(0, len(s1))]
+        else:            s2 = "".join(rng.choice(_STR_ALPHABET) for _ in range(rng.randint(0, 64)))
+        ch = rng.choice(s1) if s1 and rng.random() < 0.7 else rng.choice(_STR_ALPHABET)
+        cases.append(f"{s1}\t{s2}\t{ch}")
+    return cases
+
+def _oracle_strfuncs(line):
+    s1, s2, ch = line.split("\t")
+    sign = (s1 > s2) - (s1 < s2)
+    return f"{len(s1)} 1 {sign} 1 {s1.find(ch)}"
+
+def _gen_funcptr(rng, n):
+    cases = ["10 3", "0 0", "-5 5", "30000 -30000", "1 -1"]
+    while len(cases) < n:
+        cases.append(f"{rng.randint(-30000, 30000)} {rng.randint(-30000, 30000)}")
+    return cases
+
+def _oracle_funcptr(line):
+    a, b = map(int, line.split())
+    return f"{a + b} {a - b} {a * b} {a * 2} {b * 2} {(a - b) * 2}"
+
+FUNC_TESTS = {
+    7: {
+        "protos": "void ft_putnbr(int n);",
+        "body":   "ft_putnbr((int)strtol(line, NULL, 10));\n"
+                  "write(1, \"\\n\", 1);",
+        "gen":    _gen_putnbr,
+        "oracle": lambda line: line,
+    },
+    38: {
+        "protos": "int ft_digit_sum(int n);\nint ft_reverse(int n);",
+        "body":   "int n = atoi(line);\n"
+                  "printf(\"%d %d\\n\", ft_digit_sum(n), ft_reverse(n));",
+        "gen":    _gen_digitsum,
+        "oracle": _oracle_digitsum,
+    },
+    48: {
+        "protos": "int   ft_strlen(char *s);\n"
+                  "char *ft_strcpy(char *dst, char *src);\n"
+                  "int   ft_strcmp(char *s1, char *s2);\n"
+                  "char *ft_strchr(char *s, char c);",
+        "body":   "static char buf[8192];\n"
+                  "char *s1 = line;\n"
+                  "char *s2 = strchr(s1, '\\t');\n"
+                  "char *ch;\n"
+                  "*s2++ = 0;\n"
+                  "ch = strchr(s2, '\\t');\n"
+                  "*ch++ = 0;\n"
+                  "char *cpy = ft_strcpy(buf, s1);\n"
+                  "int   cmp = ft_strcmp(s1, s2);\n"
+                  "char *hit = ft_strchr(s1, *ch);\n"
+                  "printf(\"%d %d %d %d %ld\\n\", ft_strlen(s1),\n"
+                  "       cpy == buf && strcmp(buf, s1) == 0,\n"
+                  "       (cmp > 0) - (cmp < 0), ft_strcmp(s1, s1) == 0,\n"
+                  "       hit ? (long)(hit - s1) : -1L);",
+        "gen":    _gen_strfuncs,
+        "oracle": _oracle_strfuncs,
+    },
+    59: {
+        "protos": "int  ft_add(int a, int b);\n"
+                  "int  ft_sub(int a, int b);\n"
+                  "int  ft_mul(int a, int b);\n"
+                  "void ft_map(int *arr, int n, int (*f)(int));\n"
+                  "static int miles_double(int x) { return x * 2; }",
+        "body":   "int a, b;\n"
+                  "sscanf(line, \"%d %d\", &a, &b);\n"
+                  "int arr[3] = {a, b, a - b};\n"
+                  "ft_map(arr, 3, miles_double);\n"
+                  "printf(\"%d %d %d %d %d %d\\n\", ft_add(a, b), ft_sub(a, b),\n"
+                  "       ft_mul(a, b), arr[0], arr[1], arr[2]);",
+        "gen":    _gen_funcptr,
+        "oracle": _oracle_funcptr,
+    },
+}
+
+def _indent(text, pad):
+    return "\n".join(pad + l for l in text.splitlines())
+
+def unit_grade(level=None, seed=None):
+    """Link the student's functions against a generated driver and check them."""
+    if level is None: level = get_level()
+    fname = get_filename(level)
+    dname = get_dirname(level)
+    spec  = FUNC_TESTS.get(level)
+    print()
+    if spec is None:
+        lvls = ", ".join(str(l) for l in sorted(FUNC_TESTS))
+        print(f"  {YELLOW}No function-level tests for level {level}.{RESET}  Available on levels: {lvls}")
+        print()
+        pause()
+        return
+    src = os.path.join("rendu", dname, fname)
+    if not os.path.isfile(src):
+        print(f"{RED}  ✗ ERROR:{RESET} {src} not found.")
+        print()
+        pause()
+        return
+    gcc = find_gcc()
+    if not gcc:
+        print(f"{RED}  ✗ ERROR:{RESET} gcc not found. Install MinGW-w64 or GCC.")
+        print()
+        pause()
+        return
+
+    if seed is None: seed = random.randrange(1 << 30)
+    rng    = random.Random(seed)
+    inputs = spec["gen"](rng, UNIT_CASES)
+
+    print(f"  {BOLD}Function tests — Level {level}{RESET}  {GRAY}({len(inputs)} cases, seed {seed}){RESET}")
+    with tempfile.TemporaryDirectory(prefix="miles3103_") as tmp:
+        obj    = os.path.join(tmp, "student.o")
+        driver = os.path.join(tmp, "driver.c")
+        binary = os.path.join(tmp, "unit_bin.exe" if sys.platform == "win32" else "unit_bin")
+        with open(driver, "w") as fh:
+            fh.write(DRIVER_TEMPLATE % {"protos": spec["protos"],
+                                        "body":   _indent(spec["body"], " " * 12)})
+
+        r = subprocess.run([gcc, "-Wall", "-Wextra", "-Werror", "-Dmain=miles_student_main",
+                            "-c", src, "-o", obj], capture_output=True, text=True)
+        if r.returncode != 0:
+            print(f"  {RED}✗ COMPILE ERROR{RESET}")
+            print(r.stderr)
+            pause()
+            return
+        r = subprocess.run([gcc, driver, obj, "-o", binary, "-lm"],
+                           capture_output=True, text=True)
+        if r.returncode != 0:
+            print(f"  {RED}✗ LINK ERROR{RESET} — your file must define these functions (not static):")
+            print(f"{GRAY}{_indent(spec['protos'], '    ')}{RESET}")
+            print(r.stderr)
+            pause()
+            return
+
+        t0 = time.time()
+        output, rc, _ = run_program(binary, stdin_data="\n".join(inputs) + "\n",
+                                    max_output=UNIT_CASES * 256)
+        elapsed = time.time() - t0
+
+    got = output.splitlines()
+    failures = []
+    for i, line in enumerate(inputs):
+        expected = spec["oracle"](line)
+        actual = got[i] if i < len(got) else None
+        if actual != expected:
+            failures.append((line, expected, actual))
+    passed = len(inputs) - len(failures)
+
+    if not failures:
+        print(f"  {GREEN}✓ {passed}/{len(inputs)} checks passed{RESET}  {GRAY}({elapsed * 1000:.0f} ms, 1 process){RESET}")
+    else:
+        print(f"  {RED}✗ {passed}/{len(inputs)} checks passed{RESET}  {GRAY}({elapsed * 1000:.0f} ms){RESET}")
+        if rc != 0:
+            print(f"  {RED}Driver exited with status {rc} after {len(got)} results.{RESET}")
+        print()
+        for line, expected, actual in failures[:5]:
+            shown = line.replace("\t", " ⇥ ")
+            print(f"  {BOLD}input   :{RESET} {shown[:60]}")
+            print(f"  {BOLD}expected:{RESET} {GREEN}{expected}{RESET}")
+            print(f"  {BOLD}got     :{RESET} {RED}{actual if actual is not None else '(no output)'}{RESET}")
+            print()
+        if len(failures) > 5:
+            print(f"  {GRAY}... and {len(failures) - 5} more.{RESET}")
+
+    write_trace(dname, level, "UNIT", f"seed={seed}\n{passed}/{len(inputs)} checks passed")
+    print()
+    pause()
+
+# ══════════════════════════════════════════════════════════════════
+#  FUZZ  (stdin levels 51-53)
+#  Hundreds of generated inputs — empty, long, non-ASCII, around the
+#  32-byte read boundary — are piped into the one compiled binary on a
+#  thread pool. Expected output comes from a byte-level Python oracle;
+#  the smallest failing input is then shrunk to a minimal case.
+# ══════════════════════════════════════════════════════════════════
+FUZZ_CASES       = 300
+FUZZ_MAX_LINE    = 255      # bytes per line, so a 256-byte buffer always fits
+FUZZ_SHRINK_RUNS = 300      # program runs spent minimising one failure
+FUZZ_ASCII    = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789 .,!?-_'"
+FUZZ_NONASCII = ["é", "ß", "ñ", "€", "日本", "Ω", "😀"]
+
+def _fuzz_line(rng):
+    """One line (no newline) of bytes, biased towards edge-case lengths."""
+    kind = rng.randrange(6)
+    if kind == 0: return b""
+    if kind == 1: n = rng.choice([1, 31, 32, 33, 63, 64, 65, FUZZ_MAX_LINE - 1, FUZZ_MAX_LINE])
+    elif kind == 2: n = rng.randint(100, FUZZ_MAX_LINE)
+    else: n = rng.randint(1, 40)
+    unicode_odds = 0.3 if kind == 3 else 0.0
+    out = bytearray()
+    while len(out) < n:
+        ch = rng.choice(FUZZ_NONASCII) if rng.random() < unicode_odds else rng.choice(FUZZ_ASCII)
+        enc = ch.encode()
+        if len(out) + len(enc) > n: enc = rng.choice(FUZZ_ASCII).encode()
+        out += enc
+    return bytes(out)
+
+def _gen_readbuf(rng):
+    line = _fuzz_line(rng)
+    return line + b"\n" if rng.random() < 0.8 else line
+
+def _oracle_readbuf(data):
+    buf = data[:32]
+    if buf.endswith(b"\n"): buf = buf[:-1]
+    return b"You entered: " + buf
+
+def _gen_parseinput(rng): return _fuzz_line(rng) + b"\n"
+
+def _oracle_parseinput(data):
+    line = data.split(b"\n", 1)[0]
+    up = sum(65 <= b <= 90 for b in line)
+    lo = sum(97 <= b <= 122 for b in line)
+    dg = sum(48 <= b <= 57 for b in line)
+    sp = line.count(b" ")
+    return b"Uppercase: %d\nLowercase: %d\nDigits: %d\nSpaces: %d" % (up, lo, dg, sp)
+
+def _gen_multiline(rng): return b"".join(_fuzz_line(rng) + b"\n" for _ in range(3))
+
+def _oracle_multiline(data):
+    lines = data.split(b"\n")[:3]
+    return b"\n".join(b"Line %d (len=%d): %s" % (i + 1, len(l), l) for i, l in enumerate(lines))
+
+# gen(rng) -> stdin bytes, valid(data) keeps shrinking within the input
+# format, oracle(data) -> expected stdout bytes.
+FUZZ_TESTS = {
+    51: {"gen": _gen_readbuf,    "oracle": _oracle_readbuf,
+         "valid": lambda d: b"\n" not in d[:-1]},
+    52: {"gen": _gen_parseinput, "oracle": _oracle_parseinput,
+         "valid": lambda d: d.endswith(b"\n") and d.count(b"\n") == 1},
+    53: {"gen": _gen_multiline,  "oracle": _oracle_multiline,
+         "valid": lambda d: d.endswith(b"\n") and d.count(b"\n") == 3},
+}
+
+def _fuzz_expected(spec, data):
+    return spec["oracle"](data).decode("utf-8", errors="replace").strip()
+
+def _fuzz_ok(expected, out):
+    """Every expected line must appear as a whole output line (prompts are tolerated)."""
+    got = {l.rstrip() for l in out.splitlines()}
+    return all(l.rstrip() in got for l in expected.splitlines())
+
+def _shrink(data, fails, valid, budget=FUZZ_SHRINK_RUNS):
+    """Delta-debug `data` down while fails(data) holds. Returns (data, runs)."""
+    runs, n = 0, 2
+    while data and runs < budget:
+        chunk = max(1, len(data) // n)
+        for start in range(0, len(data), chunk):
+            cand = data[:start] + data[start + chunk:]
+            if not valid(cand): continue
+            runs += 1
+            if fails(cand):
+                data, n = cand, max(n - 1, 2)
+                break
+            if runs >= budget: break
+        else:
+            if chunk == 1: break
+            n = min(n * 2, len(data))
+    for i in range(len(data)):              # then make the remaining bytes plain
+        if runs >= budget: break
+        if data[i:i+1] in (b"a", b"\n"): continue
+        cand = data[:i] + b"a" + data[i+1:]
+        runs += 1
+        if fails(cand): data = cand
+    return data, runs
+
+def _show_bytes(data):
+    return data.decode("utf-8", errors="backslashreplace").replace("\n", "⏎")
+
+def fuzz_level(level=None, cases=FUZZ_CASES, seed=None):
+    """Pipe generated inputs into the level binary and compare with the oracle."""
+    if level is None: level = get_level()
+    dname = get_dirname(level)
+    spec  = FUZZ_TESTS.get(level)
+    print()
+    if spec is None:
+        lvls = ", ".join(str(l) for l in sorted(FUZZ_TESTS))
+        print(f"  {YELLOW}No fuzz tests for level {level}.{RESET}  Available on levels: {lvls}")
+        print()
+        pause()
+        return
+    src = os.path.join("rendu", dname, get_filename(level))
+    if not os.path.isfile(src):
+        print(f"{RED}  ✗ ERROR:{RESET} {src} not found.")
+        print()
+        pause()
+        return
+    gcc = find_gcc()
+    if not gcc:
+        print(f"{RED}  ✗ ERROR:{RESET} gcc not found. Install MinGW-w64 or GCC.")
+        print()
+        pause()
+        return
+
+    if seed is None: seed = random.randrange(1 << 30)
+    rng     = random.Random(seed)
+    inputs  = [spec["gen"](rng) for _ in range(cases)]
+    workers = min(32, (os.cpu_count() or 1) * 4)   # the work is waiting on child processes
+
+    print(f"  {BOLD}Fuzz — Level {level}{RESET}  {GRAY}({cases} inputs, seed {seed}, {workers} workers){RESET}")
+    with tempfile.TemporaryDirectory(prefix="miles3103_") as tmp:
+        binary = os.path.join(tmp, "fuzz_bin.exe" if sys.platform == "win32" else "fuzz_bin")
+        r = compile_source(gcc, src, binary)
+        if r.returncode != 0:
+            print(f"  {RED}✗ COMPILE ERROR{RESET}")
+            print(r.stderr)
+            pause()
+            return
+
+        runner = BinaryRunner(binary)
+        def run(data):
+            out, _, usage = runner.run(data)
+            return out, usage.get("verdict")
+        def fails(data):
+            out, verdict = run(data)
+            return bool(verdict) or not _fuzz_ok(_fuzz_expected(spec, data), out)
+
+        t0 = time.perf_counter()
+        results = [(out, usage.get("verdict")) for out, _, usage in runner.run_many(inputs, workers)]
+        elapsed = time.perf_counter() - t0
+
+        failures = []
+        for data, (out, verdict) in zip(inputs, results):
+            expected = _fuzz_expected(spec, data)
+            if verdict or not _fuzz_ok(expected, out):
+                failures.append((data, expected, verdict or out))
+        passed = cases - len(failures)
+        rate = f"{elapsed * 1000:.0f} ms, {cases / elapsed:.0f}/s" if elapsed else ""
+
+        if not failures:
+            print(f"  {GREEN}✓ {passed}/{cases} inputs passed{RESET}  {GRAY}({rate}){RESET}")
+            summary = f"seed={seed}\n{passed}/{cases} inputs passed"
+        else:
+            print(f"  {RED}✗ {passed}/{cases} inputs passed{RESET}  {GRAY}({rate}){RESET}")
+            smallest = min(failures, key=lambda f: len(f[0]))[0]
+            t1 = time.perf_counter()
+            minimal, runs = _shrink(smallest, fails, spec["valid"])
+            out, verdict = run(minimal)
+            expected = _fuzz_expected(spec, minimal)
+            print(f"  {GRAY}Shrunk a {len(smallest)}-byte input to {len(minimal)} bytes "
+                  f"({runs} runs, {(time.perf_counter() - t1) * 1000:.0f} ms){RESET}")
+            print()
+            print(f"  {BOLD}minimal input:{RESET} {YELLOW}{_show_bytes(minimal) or '(empty)'}{RESET}")
+            print(f"  {BOLD}expected     :{RESET}")
+            print(f"{GREEN}{_indent(expected, '    ')}{RESET}")
+            print(f"  {BOLD}got          :{RESET}")
+            print(f"{RED}{_indent(verdict or out or '(no output)', '    ')}{RESET}")
+            summary = (f"seed={seed}\n{passed}/{cases} inputs passed\n"
+                       f"minimal failing input: {_show_bytes(minimal)!r}")
+        runner.close()
+
+    write_trace(dname, level, "FUZZ", summary)
+    print()
+    pause()
+
+# ══════════════════════════════════════════════════════════════════
+#  BUILD MATRIX  (optimisation levels + sanitizers)
+# ══════════════════════════════════════════════════════════════════
+BUILD_MATRIX = [
+    ("-O0",       ["-O0"]),
+    ("-O2",       ["-O2"]),
+    ("-O3",       ["-O3"]),
+    ("asan+ubsan", ["-O1", "-g", "-fno-omit-frame-pointer", "-fsanitize=address,undefined"]),
+]
+
+SANITIZER_MARKERS = ("ERROR: AddressSanitizer", "ERROR: LeakSanitizer", "runtime error:")
+
+def _build_one(gcc, src, out_dir, name, flags):
+    binary = os.path.join(out_dir, "bm_" + re.sub(r"[^a-zA-Z0-9]", "", name))
+    if sys.platform == "win32": binary += ".exe"
+    t0 = time.perf_counter()
+    r = compile_source(gcc, src, binary, flags)
+    return {"name": name, "binary": binary, "ok": r.returncode == 0,
+            "compile": time.perf_counter() - t0, "stderr": r.stderr,
+            "sanitized": any(f.startswith("-fsanitize") for f in flags)}
+
+def _sanitizer_findings(log_prefix):
+    """Collect distinct sanitizer report lines written to <log_prefix>.<pid>."""
+    found = []
+    for path in sorted(glob.glob(log_prefix + ".*")):
+        with open(path, errors="replace") as fh:
+            for line in fh:
+                if any(m in line for m in SANITIZER_MARKERS):
+                    line = re.sub(r"==\d+==", "", line).strip()
+                    line = re.sub(r"0x[0-9a-f]+", "0x…", line)
+                    if line not in found: found.append(line)
+    return found
+
+def build_matrix(level, runs=3):
+    """Build the level at several -O levels and with sanitizers, then run each."""
+    fname = get_filename(level)
+    src = os.path.join("rendu", get_dirname(level), fname)
+    print()
+    if not os.path.isfile(src):
+        print(f"{RED}  ✗ ERROR:{RESET} {src} not found.")
+        print(); pause(); return
+    gcc = find_gcc()
+    if not gcc:
+        print(f"{RED}  ✗ ERROR:{RESET} gcc not found. Install MinGW-w64 or GCC.")
+        print(); pause(); return
+
+    print(f"  {BOLD}Build matrix — Level {level}{RESET}  {GRAY}({fname}, {len(BUILD_MATRIX)} builds in parallel){RESET}")
+    stdin_data = STDIN_INPUTS.get(level)
+    with tempfile.TemporaryDirectory(prefix="miles3103_") as tmp:
+        with ThreadPoolExecutor(max_workers=len(BUILD_MATRIX)) as pool:
+            builds = list(pool.map(lambda b: _build_one(gcc, src, tmp, *b), BUILD_MATRIX))
+
+        # Runs are sequential so the timings don't compete with each other.
+        reference = None
+        for b in builds:
+            if not b["ok"]: continue
+            log_prefix = os.path.join(tmp, "san_" + os.path.basename(b["binary"]))
+            env = dict(os.environ)
+            env["ASAN_OPTIONS"]  = f"log_path={log_prefix}:detect_leaks=1"
+            env["UBSAN_OPTIONS"] = f"log_path={log_prefix}:print_stacktrace=1"
+            walls = []
+            for _ in range(runs):
+                out, rc, usage = run_program(b["binary"], stdin_data=stdin_data,
+                                             limits={"cpu": RLIMIT_CPU_SECS}, env=env,
+                                             max_output=output_cap(level))
+                walls.append(usage.get("wall", 0.0))
+            b.update(size=os.path.getsize(b["binary"]), run=min(walls), rc=rc, output=out,
+                     findings=_sanitizer_findings(log_prefix))
+            if reference is None: reference = out
+
+    print(f"  {GRAY}──────────────────────────────────────────────────────────────{RESET}")
+    print(f"  {BOLD}{'Build':<12}{'compile':>10}{'size':>10}{'run':>10}  {'output':<8}{'findings'}{RESET}")
+    for b in builds:
+        if not b["ok"]:
+            first = next((l for l in b["stderr"].splitlines() if l.strip()), "build failed")
+            print(f"  {b['name']:<12}{fmt_ms(b['compile']):>10}  {RED}✗ {first[:46]}{RESET}")
+            continue
+        same = f"{GREEN}same{RESET}    " if b["output"] == reference else f"{YELLOW}differs{RESET} "
+        if b["findings"]:
+            found = f"{RED}{len(b['findings'])} issue(s){RESET}"
+        elif b["rc"] < 0:
+            found = f"{RED}signal {-b['rc']}{RESET}"
+        else:
+            found = f"{GREEN}clean{RESET}" if b["sanitized"] else f"{GRAY}-{RESET}"
+        print(f"  {b['name']:<12}{fmt_ms(b['compile']):>10}{b['size'] / 1024:>8.1f}KB{fmt_ms(b['run']):>10}  {same}{found}")
+
+    findings = [f for b in builds if b["ok"] for f in b["findings"]]
+    if findings:
+        print()
+        print(f"  {BOLD}{RED}Sanitizer findings:{RESET}")
+        for f in findings[:5]:
+            print(f"    {f[:100]}")
+    if any(b["ok"] and b["output"] != reference for b in builds):
+        print()
+        print(f"  {YELLOW}Tip:{RESET} output that changes with -O usually means undefined behaviour.")
+    print()
+    pause()
+
 # ══════════════════════════════════════════════════════════════════
 #  STATS TABLE
 # ══════════════════════════════════════════════════════════════════
-def show_stats():
+def level_stats():
+    """Per-level pass/fail counts up to the current level, from one read of .attempts."""
     current = get_level()
+    passed = set(_lines(".passed"))
+    counts = {}
+    for line in _lines(".attempts"):
+        parsed = parse_attempt(line)
+        if parsed and parsed[1] in ("PASS", "FAIL"):
+            counts.setdefault(parsed[0], {"PASS": 0, "FAIL": 0})[parsed[1]] += 1
+    rows = []
+    for i in range(min(current + 1, MAX_LEVEL + 1)):
+        n = counts.get(str(i), {"PASS": 0, "FAIL": 0})
+        p, f = n["PASS"], n["FAIL"]
+        if str(i) in passed: status = "clean" if f == 0 else "retry"
+        elif i == current:   status = "active"
+        elif p == 0 and f == 0: status = "untried"
+        else:                status = "stuck"
+        rows.append({"level": i, "file": get_filename(i), "pass": p, "fail": f, "status": status})
+    return rows
+
+def show_stats():
     print()
     print(c(BOLD+CYAN, "╔══════════════════════════════════════════════════════════╗"))
     print(c(BOLD+CYAN, "║               ◆  PER-LEVEL STATS  ◆                     ║"))
@@ -1673,20 +2024,16 @@ def show_stats():
     print(c(CYAN, "╠══════════════════════════════════════════════════════════╣"))
 
     total_p = total_f = 0
-    for i in range(min(current + 1, MAX_LEVEL + 1)):
-        fname = get_filename(i)
-        p = get_passes_for(i)
-        f = get_fails_for(i)
+    for row in level_stats():
+        i, fname, p, f = row["level"], row["file"], row["pass"], row["fail"]
         total_p += p; total_f += f
-        if already_passed(i):
-            status = "✓ clean" if f == 0 else f"✓ +{f}retry"
-            col = GREEN if f == 0 else YELLOW
-        elif i == current:
-            status = "► active"; col = CYAN
-        elif p == 0 and f == 0:
-            status = "─ untried"; col = GRAY
-        else:
-            status = "✗ stuck"; col = RED
+        status, col = {
+            "clean":   ("✓ clean", GREEN),
+            "retry":   (f"✓ +{f}retry", YELLOW),
+            "active":  ("► active", CYAN),
+            "untried": ("─ untried", GRAY),
+            "stuck":   ("✗ stuck", RED),
+        }[row["status"]]
         short = fname[:22]
         print(f"{CYAN}║{RESET}  {col}{i:<4}  {short:<22}  {p:>5}  {f:>5}  {status:<8}{RESET}  {CYAN}║{RESET}")
 
@@ -1698,23 +2045,126 @@ def show_stats():
 
 # ══════════════════════════════════════════════════════════════════
 #  SAVE / LOAD
+#  Slots are content-addressed: saves/<slot>/manifest.json lists, per
+#  state file, the sha256 names of 64 KiB chunks kept once each in
+#  saves/.objects/. Append-only logs (.attempts, .passed) are stored as
+#  base + delta: the previous save's chunks plus chunks of the new tail,
+#  so a save only reads and writes the bytes added since the last one.
+#  Slots written by older versions (plain copied files) still load.
 # ══════════════════════════════════════════════════════════════════
+OBJECTS_DIR  = os.path.join("saves", ".objects")
+SAVE_CHUNK   = 64 * 1024
+STATE_FILES  = ["level", "score", "passed", "attempts", "streak", "best"]
+APPEND_ONLY  = {"passed", "attempts"}
+MAX_DELTAS   = 64          # re-chunk a log once it has this many pieces
+TAIL_BYTES   = 32          # bytes of a log's end kept to verify it was only appended to
+
+def _put_object(data):
+    h = hashlib.sha256(data).hexdigest()
+    path = os.path.join(OBJECTS_DIR, h)
+    if not os.path.exists(path):
+        os.makedirs(OBJECTS_DIR, exist_ok=True)
+        with open(path + ".tmp", "wb") as fh: fh.write(data)
+        os.replace(path + ".tmp", path)
+    return h
+
+def _get_object(h):
+    with open(os.path.join(OBJECTS_DIR, h), "rb") as fh: return fh.read()
+
+def _chunk_stream(fh):
+    hashes = []
+    while True:
+        block = fh.read(SAVE_CHUNK)
+        if not block: return hashes
+        hashes.append(_put_object(block))
+
+def _read_manifest(slot_dir):
+    try:
+        with open(os.path.join(slot_dir, "manifest.json")) as fh: return json.load(fh)
+    except (OSError, ValueError): return None
+
+def _entry_chunks(entry):
+    return entry.get("chunks") or entry.get("base", []) + entry.get("delta", [])
+
+def _snapshot_file(name, prev):
+    """Manifest entry for .<name>, reusing prev's chunks for an appended log."""
+    try: fh = open(f".{name}", "rb")
+    except OSError: return None
+    with fh:
+        size = os.fstat(fh.fileno()).st_size
+        if name in APPEND_ONLY and prev and "tail" in prev:
+            base, bsize = _entry_chunks(prev), prev["size"]
+            tail = bytes.fromhex(prev["tail"])
+            if bsize <= size and len(base) < MAX_DELTAS:
+                fh.seek(bsize - len(tail))
+                if fh.read(len(tail)) == tail:
+                    delta = _chunk_stream(fh)
+                    fh.seek(max(0, size - TAIL_BYTES))
+                    return {"size": size, "base": base, "delta": delta, "tail": fh.read().hex()}
+        chunks = _chunk_stream(fh)
+        if name not in APPEND_ONLY:
+            return {"size": size, "chunks": chunks}
+        fh.seek(max(0, size - TAIL_BYTES))
+        return {"size": size, "base": chunks, "delta": [], "tail": fh.read().hex()}
+
+def _manifest_chunks(manifest):
+    return {h for entry in manifest.get("files", {}).values() for h in _entry_chunks(entry)}
+
 def _copy_state_to(slot_dir):
     os.makedirs(slot_dir, exist_ok=True)
-    for f in [".level",".score",".passed",".attempts",".streak",".best"]:
-        try: shutil.copy2(f, os.path.join(slot_dir, f.lstrip(".")))
-        except: pass
-    with open(os.path.join(slot_dir, "timestamp"), "w") as tf:
-        tf.write(datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
-    with open(os.path.join(slot_dir, "meta"), "w") as mf:
-        mf.write(f"Level={get_level()} Score={get_score()}")
+    old  = _read_manifest(slot_dir)
+    prev = old or _read_manifest(os.path.join("saves", "autosave")) or {}
+    files = {}
+    for name in STATE_FILES:
+        entry = _snapshot_file(name, prev.get("files", {}).get(name))
+        if entry is not None: files[name] = entry
+    manifest = {
+        "version":   2,
+        "timestamp": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "meta":      f"Level={get_level()} Score={get_score()}",
+        "files":     files,
+    }
+    path = os.path.join(slot_dir, "manifest.json")
+    with open(path + ".tmp", "w") as fh: json.dump(manifest, fh)
+    os.replace(path + ".tmp", path)
+    for f in STATE_FILES + ["timestamp", "meta"]:      # plain copies from older versions
+        try: os.remove(os.path.join(slot_dir, f))
+        except OSError: pass
+    if old:                 # chunks of re-chunked logs and rewritten small files
+        dropped = _manifest_chunks(old) - _manifest_chunks(manifest)
+        if dropped: _gc_objects(dropped)
 
 def _copy_state_from(slot_dir):
-    for f in ["level","score","passed","attempts","streak","best"]:
-        src = os.path.join(slot_dir, f)
-        dst = f".{f}"
-        try: shutil.copy2(src, dst)
-        except: pass
+    manifest = _read_manifest(slot_dir)
+    if manifest is None:
+        for f in STATE_FILES:
+            try: shutil.copy2(os.path.join(slot_dir, f), f".{f}")
+            except: pass
+        return
+    for name, entry in manifest["files"].items():
+        with open(f".{name}.tmp", "wb") as fh:
+            for h in _entry_chunks(entry): fh.write(_get_object(h))
+        os.replace(f".{name}.tmp", f".{name}")
+
+def _slot_info(slot_dir, default_ts="unknown"):
+    """(timestamp, meta) for a slot, from its manifest only."""
+    manifest = _read_manifest(slot_dir)
+    if manifest is not None:
+        return manifest.get("timestamp", default_ts), manifest.get("meta", "")
+    return (_read(os.path.join(slot_dir, "timestamp"), default_ts),
+            _read(os.path.join(slot_dir, "meta"), ""))
+
+def _gc_objects(candidates=None):
+    """Delete chunks no manifest refers to any more (only among candidates, if given)."""
+    if not os.path.isdir(OBJECTS_DIR): return
+    live = set()
+    for slot in os.listdir("saves"):
+        manifest = _read_manifest(os.path.join("saves", slot))
+        if manifest: live |= _manifest_chunks(manifest)
+    for h in os.listdir(OBJECTS_DIR) if candidates is None else candidates:
+        if h not in live:
+            try: os.remove(os.path.join(OBJECTS_DIR, h))
+            except OSError: pass
 
 def sanitize_slot(name): return re.sub(r'[^a-zA-Z0-9_\-]', '', name) or "quicksave"
 
@@ -1731,13 +2181,12 @@ def do_load(slot="quicksave"):
     if not os.path.isdir(slot_dir):
         print(f"  {RED}No save found with name '{slot}'.{RESET}  Use {CYAN}saves{RESET} to list slots.")
         return
-    ts   = _read(os.path.join(slot_dir, "timestamp"), "unknown")
-    meta = _read(os.path.join(slot_dir, "meta"), "")
+    ts, meta = _slot_info(slot_dir)
     confirm = input(f"  Load '{slot}' ({meta}, saved {ts})? This overwrites current progress. (y/n): ")
     if confirm.strip().lower() == "y":
         _copy_state_from(slot_dir)
         print(f"  {GREEN}✓ Loaded{RESET} slot '{BOLD}{slot}{RESET}'  →  level={get_level()}, score={get_score()}/60")
-        time.sleep(1)
+        _sleep(1)
     else:
         print(f"  {GRAY}Load cancelled.{RESET}")
 
@@ -1751,10 +2200,9 @@ def list_saves():
     if os.path.isdir(saves_dir):
         for slot in sorted(os.listdir(saves_dir)):
             slot_dir = os.path.join(saves_dir, slot)
-            if not os.path.isdir(slot_dir): continue
+            if slot.startswith(".") or not os.path.isdir(slot_dir): continue
             found = True
-            ts   = _read(os.path.join(slot_dir, "timestamp"), "no date")
-            meta = _read(os.path.join(slot_dir, "meta"), "")
+            ts, meta = _slot_info(slot_dir, "no date")
             marker = f"{GRAY}[auto]{RESET} " if slot == "autosave" else ""
             print(f"{CYAN}║{RESET}  {BOLD}{slot:<15}{RESET}  {meta}  {marker}{GRAY}{ts}{RESET}  {CYAN}║{RESET}")
     if not found:
@@ -1775,8 +2223,9 @@ def delete_save(slot):
     confirm = input(f"  Delete save '{slot}'? (y/n): ")
     if confirm.strip().lower() == "y":
         shutil.rmtree(slot_dir)
+        _gc_objects()
         print(f"  {RED}Deleted{RESET} save slot '{slot}'.")
-        time.sleep(1)
+        _sleep(1)
     else:
         print(f"  {GRAY}Cancelled.{RESET}")
 
@@ -1790,12 +2239,18 @@ def show_help():
     print(c(BOLD+CYAN, "╠══════════════════════════════════════════════════════════╣"))
     cmds = [
         (GREEN,  "grademe",      "compile & grade your solution"),
+        (GREEN,  "unitgrade",    "test your functions with 1000s of inputs"),
+        (GREEN,  "fuzz [n]",     "pipe n generated inputs (levels 51-53)"),
         (CYAN,   "hint",         "re-read the current subject"),
         (WHITE,  "open",         "open your .c file in notepad / $EDITOR"),
         (WHITE,  "cat",          "print your current .c file"),
         (CYAN,   "score",        "show full scoreboard"),
         (CYAN,   "stats",        "per-level pass/fail breakdown"),
         (CYAN,   "history",      "attempt log for this level"),
+        (CYAN,   "timings",      "where grademe spends its time"),
+        (CYAN,   "trace [n]",    "show the n-th most recent trace record"),
+        (CYAN,   "perf [K]",     "time K runs of your program (default 10)"),
+        (CYAN,   "buildmatrix",  "-O0/-O2/-O3 + sanitizer builds compared"),
         (MAGENTA,"save [name]",  "save progress to a named slot"),
         (MAGENTA,"load [name]",  "restore a saved slot"),
         (MAGENTA,"saves",        "list all save slots"),
@@ -1815,26 +2270,170 @@ def show_help():
 # ══════════════════════════════════════════════════════════════════
 #  HISTORY
 # ══════════════════════════════════════════════════════════════════
+def attempt_history(level):
+    """Attempts on `level`, oldest first, as {"result", "time", "extras"} dicts."""
+    out = []
+    for line in _lines(".attempts"):
+        parsed = parse_attempt(line)
+        if parsed and parsed[0] == str(level):
+            out.append({"result": parsed[1], "time": parsed[2], "extras": parsed[3]})
+    return out
+
 def show_history(level):
     print()
     print(f"{BOLD}  Attempt history — Level {level}{RESET}")
     print(f"{GRAY}  ──────────────────────────────{RESET}")
-    found = False
-    for line in _lines(".attempts"):
-        parts = line.split(":")
-        if len(parts) >= 3 and parts[0] == str(level):
-            found = True
-            result = parts[1]
-            ts = parts[2]
-            if result == "PASS":
-                print(f"  {GREEN}✓ PASS{RESET}  at {ts}")
-            else:
-                print(f"  {RED}✗ FAIL{RESET}  at {ts}")
-    if not found:
+    history = attempt_history(level)
+    for a in history:
+        extras = a["extras"]
+        run = fmt_usage(extras) if "wall" in extras else ""
+        if a["result"] == "PASS":
+            print(f"  {GREEN}✓ PASS{RESET}  at {a['time']}  {GRAY}{run}{RESET}")
+        else:
+            label = extras.get("verdict", "FAIL")
+            print(f"  {RED}✗ {label}{RESET}  at {a['time']}  {GRAY}{run}{RESET}")
+    if not history:
         print(f"  {GRAY}No attempts yet on this level.{RESET}")
     print()
     pause()
 
+# ══════════════════════════════════════════════════════════════════
+#  TIMINGS  (where grademe spends its time)
+# ══════════════════════════════════════════════════════════════════
+def _percentile(sorted_values, q):
+    """Nearest-rank percentile of an already sorted list."""
+    return sorted_values[max(0, math.ceil(q / 100 * len(sorted_values)) - 1)]
+
+def phase_timings():
+    """{phase: sorted seconds} over every attempt that recorded phase times."""
+    samples = {p: [] for p in LOGGED_PHASES}
+    for line in _lines(".attempts"):
+        parsed = parse_attempt(line)
+        if not parsed: continue
+        for k, v in parsed[3].items():
+            if k.startswith("ph_") and k[3:] in samples:
+                try: samples[k[3:]].append(float(v))
+                except ValueError: pass
+    return {p: sorted(v) for p, v in samples.items()}
+
+def show_timings():
+    samples = phase_timings()
+    print()
+    print(f"{BOLD}  grademe phase timings{RESET}  {GRAY}(all levels, attempts that recorded them){RESET}")
+    print(f"{GRAY}  ──────────────────────────────────────────────────────────{RESET}")
+    if not any(samples.values()):
+        print(f"  {GRAY}No timed attempts yet — run grademe first.{RESET}")
+        print()
+        pause()
+        return
+    print(f"  {BOLD}{'Phase':<9}{'n':>6}{'p50':>10}{'p90':>10}{'p99':>10}{'max':>10}{RESET}")
+    for phase in LOGGED_PHASES:
+        v = samples[phase]
+        if not v:
+            print(f"  {phase:<9}{0:>6}{GRAY}{'—':>10}{'—':>10}{'—':>10}{'—':>10}{RESET}")
+            continue
+        cells = "".join(f"{fmt_ms(_percentile(v, q)):>10}" for q in (50, 90, 99))
+        print(f"  {phase:<9}{len(v):>6}{cells}{fmt_ms(v[-1]):>10}")
+    print()
+    pause()
+
+# ══════════════════════════════════════════════════════════════════
+#  PERF  (repeat runs of the current level)
+# ══════════════════════════════════════════════════════════════════
+def _median(values):
+    v = sorted(values)
+    n = len(v)
+    return v[n // 2] if n % 2 else (v[n // 2 - 1] + v[n // 2]) / 2
+
+def perf_level(level, runs=10):
+    """Compile the current solution once and time it over several runs."""
+    fname = get_filename(level)
+    src = os.path.join("rendu", get_dirname(level), fname)
+    print()
+    if not os.path.isfile(src):
+        print(f"{RED}  ✗ ERROR:{RESET} {src} not found.")
+        print(); pause(); return
+    gcc = find_gcc()
+    if not gcc:
+        print(f"{RED}  ✗ ERROR:{RESET} gcc not found. Install MinGW-w64 or GCC.")
+        print(); pause(); return
+
+    binary = "perf_bin.exe" if sys.platform == "win32" else "perf_bin"
+    r = compile_source(gcc, src, binary)
+    if r.returncode != 0:
+        print(f"  {RED}✗ COMPILE ERROR{RESET}")
+        print(r.stderr)
+        pause(); return
+
+    print(f"  {BOLD}Perf — Level {level}{RESET}  {GRAY}({fname}, {runs} runs){RESET}")
+    samples = []
+    with BinaryRunner(binary, max_output=output_cap(level)) as runner:
+        for _ in range(runs):
+            _, rc, usage = runner.run(STDIN_INPUTS.get(level))
+            samples.append(usage)
+    try: os.remove(binary)
+    except: pass
+
+    print(f"  {GRAY}──────────────────────────────────────────{RESET}")
+    print(f"  {BOLD}{'':<8}{'min':>12}{'median':>12}{'max':>12}{RESET}")
+    keys = ["wall", "user", "sys"] if "user" in samples[0] else ["wall"]
+    for k in keys:
+        vals = [float(u[k]) for u in samples]
+        print(f"  {k:<8}{fmt_ms(min(vals)):>12}{fmt_ms(_median(vals)):>12}{fmt_ms(max(vals)):>12}")
+    if "minflt" in samples[0]:
+        rss = [int(u["rss"]) for u in samples if "rss" in u]
+        flt = _median([int(u["minflt"]) + int(u["majflt"]) for u in samples])
+        if rss:
+            print(f"  {'max rss':<8}{max(rss) / 1024:>10.1f}MB")
+        else:
+            own = _own_maxrss() // (1024 if sys.platform == "darwin" else 1)
+            print(f"  {'max rss':<8}{'<' + f'{own / 1024:.1f}':>10}MB  {GRAY}(below the grader's own){RESET}")
+        print(f"  {'faults':<8}{flt:>12.0f}  {GRAY}(median){RESET}")
+    if rc != 0:
+        print(f"  {YELLOW}Note:{RESET} program exited with status {rc}.")
+    print()
+    pause()
+
+def bench_runners(level, runs=200):
+    """Runs/second of the current solution through each way of starting it.
+
+    Compares a plain subprocess.run loop, run_program() (the grader's
+    path) and BinaryRunner, both one run at a time and on its worker
+    pool. Returns {"level", "runs", "workers", "spawn", "compile_error",
+    "rates": {name: runs/s}}.
+    """
+    src = os.path.join("rendu", get_dirname(level), get_filename(level))
+    result = {"level": level, "runs": runs, "rates": {}, "compile_error": None}
+    gcc = find_gcc()
+    if not os.path.isfile(src) or not gcc:
+        result["compile_error"] = f"{src} not found" if gcc else "gcc not found"
+        return result
+    data = STDIN_INPUTS.get(level)
+    with tempfile.TemporaryDirectory(prefix="miles3103_") as tmp:
+        binary = os.path.join(tmp, "bench_bin.exe" if sys.platform == "win32" else "bench_bin")
+        r = compile_source(gcc, src, binary)
+        if r.returncode != 0:
+            result["compile_error"] = r.stderr
+            return result
+
+        def rate(fn):
+            t0 = time.perf_counter()
+            fn()
+            return round(runs / (time.perf_counter() - t0), 1)
+        raw = (data or "").encode()
+        result["rates"]["subprocess.run"] = rate(lambda: [
+            subprocess.run([binary], input=raw, capture_output=True, timeout=RUN_TIMEOUT)
+            for _ in range(runs)])
+        result["rates"]["run_program"] = rate(lambda: [
+            run_program(binary, stdin_data=data) for _ in range(runs)])
+        with BinaryRunner(binary) as runner:
+            result["spawn"] = runner.spawn
+            result["rates"]["BinaryRunner"] = rate(lambda: [runner.run(data) for _ in range(runs)])
+            workers = min(32, (os.cpu_count() or 1) * 4)
+            result["workers"] = workers
+            result["rates"]["BinaryRunner pool"] = rate(lambda: runner.run_many([data] * runs, workers))
+    return result
+
 # ══════════════════════════════════════════════════════════════════
 #  OPEN FILE
 # ══════════════════════════════════════════════════════════════════
@@ -1869,6 +2468,267 @@ def cat_file(level):
     print()
     pause()
 
+# ══════════════════════════════════════════════════════════════════
+#  COHORT ANALYTICS  (python miles3103.py analyze <root>)
+#  Every directory under <root> holding a .attempts file is one
+#  student. Top-level subtrees are split across worker processes; each
+#  walks its share, reads .attempts/.passed in one streaming pass and
+#  returns per-level counters, which are merged into a columnar summary.
+# ══════════════════════════════════════════════════════════════════
+ANALYZE_TRIES_EDGES  = [1, 2, 3, 4, 5, 10]
+ANALYZE_TRIES_LABELS = ["1", "2", "3", "4", "5-9", "10+"]
+ANALYZE_TIME_EDGES   = [0, 60, 300, 900, 3600, 86400]
+ANALYZE_TIME_LABELS  = ["<1m", "1-5m", "5-15m", "15-60m", "1-24h", "1d+"]
+ANALYZE_BATCH        = 64     # top-level entries per worker task
+
+def _new_cohort():
+    n = MAX_LEVEL + 1
+    return {"students": 0,
+            "attempted": [0] * n, "passed": [0] * n,
+            "pass": [0] * n, "fail": [0] * n,
+            "tries": [[] for _ in range(n)], "seconds": [[] for _ in range(n)]}
+
+def _merge_cohort(acc, part):
+    acc["students"] += part["students"]
+    for key in ("attempted", "passed", "pass", "fail"):
+        acc[key] = [a + b for a, b in zip(acc[key], part[key])]
+    for key in ("tries", "seconds"):
+        for a, b in zip(acc[key], part[key]): a.extend(b)
+
+def _scan_student(path, acc):
+    """Fold one student's .attempts/.passed into acc, reading each file once."""
+    first, tries, done = {}, {}, set()
+    try:
+        with open(os.path.join(path, ".attempts"), encoding="utf-8", errors="replace") as fh:
+            for line in fh:
+                lvl, _, rest = line.partition(":")
+                result, _, rest = rest.partition(":")
+                if not lvl.isdigit(): continue
+                l = int(lvl)
+                if l > MAX_LEVEL: continue
+                if l in done:                       # practice after the first pass
+                    acc["pass" if result == "PASS" else "fail"][l] += 1
+                    continue
+                hhmm, _, extra = rest.partition("|")
+                if extra.startswith("t="):          # epoch seconds when recorded
+                    t = int(extra[2:].partition(",")[0].strip() or 0)
+                else:                               # older lines: minutes of the day
+                    h, _, m = hhmm.strip().partition(":")
+                    t = int(h or 0) * 3600 + int(m or 0) * 60 if h.isdigit() and m.isdigit() else None
+                if l not in first: first[l] = t
+                tries[l] = tries.get(l, 0) + 1
+                if result == "PASS":
+                    acc["pass"][l] += 1
+                    done.add(l)
+                    acc["tries"][l].append(tries[l])
+                    if t is not None and first[l] is not None:
+                        dt = t - first[l]
+                        if not extra.startswith("t="): dt %= 86400
+                        acc["seconds"][l].append(max(0, dt))
+                else:
+                    acc["fail"][l] += 1
+    except OSError:
+        return
+    passed = done | {int(x) for x in _lines(os.path.join(path, ".passed"))
+                     if x.isdigit() and int(x) <= MAX_LEVEL}
+    acc["students"] += 1
+    for l in tries: acc["attempted"][l] += 1
+    for l in passed: acc["passed"][l] += 1
+
+def _walk_students(top, acc):
+    for dirpath, dirnames, filenames in os.walk(top):
+        if ".attempts" in filenames:
+            _scan_student(dirpath, acc)
+            dirnames[:] = []                # rendu/, saves/ … are not students
+        else:
+            dirnames[:] = [d for d in dirnames if not d.startswith(".")]
+
+def _analyze_batch(tops):
+    acc = _new_cohort()
+    for top in tops: _walk_students(top, acc)
+    return acc
+
+def _hist(values, edges):
+    counts = [0] * len(edges)
+    for v in values: counts[bisect.bisect_right(edges, v) - 1] += 1
+    return counts
+
+def analyze_cohort(root, workers=None):
+    """Aggregate every student directory under root into a columnar summary dict."""
+    t0 = time.perf_counter()
+    acc = _new_cohort()
+    if os.path.isfile(os.path.join(root, ".attempts")):
+        _scan_student(root, acc)
+        tops = []
+    else:
+        tops = sorted(e.path for e in os.scandir(root) if e.is_dir() and not e.name.startswith("."))
+    batches = [tops[i:i + ANALYZE_BATCH] for i in range(0, len(tops), ANALYZE_BATCH)]
+    if len(batches) > 1:
+        from concurrent.futures import ProcessPoolExecutor     # pulls in multiprocessing; only needed here
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for part in pool.map(_analyze_batch, batches): _merge_cohort(acc, part)
+    elif batches:
+        _merge_cohort(acc, _analyze_batch(batches[0]))
+
+    levels = range(MAX_LEVEL + 1)
+    return {
+        "root": os.path.abspath(root),
+        "students": acc["students"],
+        "seconds": round(time.perf_counter() - t0, 3),
+        "level": list(levels),
+        "file": [get_filename(l) for l in levels],
+        "attempted": acc["attempted"],
+        "passed": acc["passed"],
+        "pass": acc["pass"],
+        "fail": acc["fail"],
+        "fail_pass_ratio": [round(f / p, 3) if p else None for f, p in zip(acc["fail"], acc["pass"])],
+        "median_tries_to_pass": [_median(v) if v else None for v in acc["tries"]],
+        "median_seconds_to_pass": [_median(v) if v else None for v in acc["seconds"]],
+        "tries_hist": {"labels": ANALYZE_TRIES_LABELS,
+                       "counts": [_hist(v, ANALYZE_TRIES_EDGES) for v in acc["tries"]]},
+        "time_hist": {"labels": ANALYZE_TIME_LABELS,
+                      "counts": [_hist(v, ANALYZE_TIME_EDGES) for v in acc["seconds"]]},
+    }
+
+def _fmt_duration(seconds):
+    if seconds is None: return "—"
+    if seconds < 60:   return f"{seconds:.0f}s"
+    if seconds < 3600: return f"{seconds / 60:.0f}m"
+    return f"{seconds / 3600:.1f}h"
+
+def cohort_report(summary, top=10):
+    """Plain-text table of the levels with the worst fail/pass ratio."""
+    rows = sorted((l for l in summary["level"] if summary["attempted"][l]),
+                  key=lambda l: -(summary["fail"][l] / max(1, summary["pass"][l])))[:top]
+    out = [f"{summary['students']} students under {summary['root']} ({summary['seconds']}s)",
+           f"{'Lvl':<4} {'File':<20} {'tried':>6} {'passed':>6} {'fail/pass':>9} {'tries':>6} {'time':>6}"]
+    for l in rows:
+        ratio = summary["fail_pass_ratio"][l]
+        tries = summary["median_tries_to_pass"][l]
+        out.append(f"{l:<4} {summary['file'][l][:20]:<20} {summary['attempted'][l]:>6} {summary['passed'][l]:>6} "
+                   f"{'∞' if ratio is None else f'{ratio:.2f}':>9} {'—' if tries is None else f'{tries:g}':>6} "
+                   f"{_fmt_duration(summary['median_seconds_to_pass'][l]):>6}")
+    return "\n".join(out)
+
+# ══════════════════════════════════════════════════════════════════
+#  HEADLESS CLI  (python miles3103.py grade --level N --json ...)
+#  Thin wrappers over the same engine functions as the shell. They
+#  never prompt, never draw the screen and exit with 0 on success,
+#  1 on a failed grade and 2 on bad arguments or missing files.
+# ══════════════════════════════════════════════════════════════════
+def _emit(args, data, text):
+    if args.json: print(json.dumps(data, ensure_ascii=False))
+    else:         print(text)
+
+def cli_grade(args):
+    level = args.level if args.level is not None else get_level()
+    if not 0 <= level <= MAX_LEVEL:
+        print(f"level must be 0-{MAX_LEVEL}", file=sys.stderr); return 2
+    r = grade_level(level, advance=(level == get_level()))
+    if r["status"] == "fail" and EXPECTED.get(level) and level != 54:
+        r["diff"] = diff_lines(EXPECTED[level], r["output"])
+    r["score"], r["current_level"] = get_score(), get_level()
+    text = f"level {level}: {r['status'].upper()}"
+    if r["verdict"]: text += f" ({r['verdict']})"
+    if r["status"] == "compile-error": text += "\n" + r["stderr"]
+    _emit(args, r, text)
+    return {"pass": 0, "fail": 1, "compile-error": 1}.get(r["status"], 2)
+
+def cli_stats(args):
+    rows = level_stats()
+    _emit(args, {"level": get_level(), "score": get_score(), "streak": get_streak(),
+                 "best": get_best(), "levels": rows},
+          "\n".join(f"{r['level']:<4} {r['file']:<22} {r['pass']:>5} {r['fail']:>5}  {r['status']}"
+                    for r in rows))
+    return 0
+
+def cli_history(args):
+    level = args.level if args.level is not None else get_level()
+    history = attempt_history(level)
+    _emit(args, {"level": level, "attempts": history},
+          "\n".join(f"{a['result']:<5} {a['time']}  {fmt_usage(a['extras']) if 'wall' in a['extras'] else ''}"
+                    for a in history))
+    return 0
+
+def cli_save(args):
+    slot = sanitize_slot(args.slot)
+    _copy_state_to(os.path.join("saves", slot))
+    _emit(args, {"slot": slot, "level": get_level(), "score": get_score()},
+          f"saved slot '{slot}' (level={get_level()}, score={get_score()}/60)")
+    return 0
+
+def cli_load(args):
+    slot = sanitize_slot(args.slot)
+    slot_dir = os.path.join("saves", slot)
+    if not os.path.isdir(slot_dir):
+        print(f"no save slot named '{slot}'", file=sys.stderr); return 2
+    if not args.yes:
+        print("load overwrites current progress; pass --yes to confirm", file=sys.stderr); return 2
+    _copy_state_from(slot_dir)
+    _emit(args, {"slot": slot, "level": get_level(), "score": get_score()},
+          f"loaded slot '{slot}' (level={get_level()}, score={get_score()}/60)")
+    return 0
+
+def cli_bench(args):
+    level = args.level if args.level is not None else get_level()
+    if not 0 <= level <= MAX_LEVEL:
+        print(f"level must be 0-{MAX_LEVEL}", file=sys.stderr); return 2
+    r = bench_runners(level, max(1, args.runs))
+    if r["compile_error"]:
+        print(r["compile_error"], file=sys.stderr); return 2
+    _emit(args, r, "\n".join(f"{name:<18} {rps:>8.1f} runs/s" for name, rps in r["rates"].items()))
+    return 0
+
+def cli_analyze(args):
+    if not os.path.isdir(args.root):
+        print(f"{args.root} is not a directory", file=sys.stderr); return 2
+    summary = analyze_cohort(args.root, args.workers)
+    text = cohort_report(summary)
+    if args.out:
+        with open(args.out, "w") as fh: json.dump(summary, fh, separators=(",", ":"))
+        text += f"\nwrote {args.out}"
+    _emit(args, summary, text)
+    return 0
+
+def cli_catalog(args):
+    if args.action == "export":
+        export_catalog(args.dir)
+        print(f"exported {len(SUBJECTS)} subjects and {len(EXPECTED)} expected outputs to {args.dir}")
+        return 0
+    texts = read_catalog_dir(args.dir)
+    if not texts["S"] and not texts["E"]:
+        print(f"no subjects/ or expected/ texts in {args.dir}", file=sys.stderr); return 2
+    build_catalog(texts)
+    print(f"wrote {CATALOG_FILE} ({len(texts['S'])} subjects, {len(texts['E'])} expected outputs)")
+    return 0
+
+def add_cli_commands(parser):
+    sub = parser.add_subparsers(dest="command")
+    def command(name, func, help, level=False, slot=False):
+        p = sub.add_parser(name, help=help)
+        p.add_argument("--json", action="store_true", help="print one JSON object")
+        if level: p.add_argument("--level", type=int, help="level number (default: current)")
+        if slot:
+            p.add_argument("--slot", default="quicksave", help="save slot name")
+            p.add_argument("--yes", action="store_true", help="don't ask for confirmation")
+        p.set_defaults(func=func)
+        return p
+    command("grade",   cli_grade,   "grade one level", level=True)
+    command("stats",   cli_stats,   "per-level pass/fail counts")
+    command("history", cli_history, "attempt log for a level", level=True)
+    command("save",    cli_save,    "save progress to a slot", slot=True)
+    command("load",    cli_load,    "restore a save slot", slot=True)
+    bench = command("bench", cli_bench, "runs/second of each way of starting the binary", level=True)
+    bench.add_argument("--runs", type=int, default=200, help="runs per method (default 200)")
+    analyze = command("analyze", cli_analyze, "per-level statistics over many student directories")
+    analyze.add_argument("root", help="directory containing the students' exam folders")
+    analyze.add_argument("--out", help="also write the columnar JSON summary to this file")
+    analyze.add_argument("--workers", type=int, help="worker processes (default: CPU count)")
+    catalog = sub.add_parser("catalog", help="export or rebuild miles3103.dat for editing subjects")
+    catalog.add_argument("action", choices=["export", "build"])
+    catalog.add_argument("dir", help="directory holding subjects/NN.txt and expected/NN.txt")
+    catalog.set_defaults(func=cli_catalog)
+
 # ══════════════════════════════════════════════════════════════════
 #  INIT
 # ══════════════════════════════════════════════════════════════════
@@ -1883,35 +2743,49 @@ def init():
 # ══════════════════════════════════════════════════════════════════
 #  MAIN LOOP
 # ══════════════════════════════════════════════════════════════════
-def main():
+BANNER = [
+    c(BOLD+CYAN, "╔══════════════════════════════════════════════════════════╗"),
+    c(BOLD+CYAN, "║      MILES3103 — C MASTERY EXAM v14.0  (60 Levels)      ║"),
+    c(BOLD+CYAN, "╚══════════════════════════════════════════════════════════╝"),
+]
+
+def main(argv=None):
+    global DELAYS
+    parser = argparse.ArgumentParser(description="Miles3103 C Mastery Exam")
+    parser.add_argument("--no-delay", action="store_true",
+                        help="skip the cosmetic pauses after messages")
+    add_cli_commands(parser)
+    args = parser.parse_args(argv)
+    if args.no_delay: DELAYS = False
+
+    if args.command:
+        if args.func not in (cli_analyze, cli_catalog): init()   # these don't touch exam state
+        sys.exit(args.func(args))
     init()
+    screen = Screen()
 
     while True:
         level = get_level()
-        fname = get_filename(level)
-
-        clear()
-        print(c(BOLD+CYAN, "╔══════════════════════════════════════════════════════════╗"))
-        print(c(BOLD+CYAN, "║      MILES3103 — C MASTERY EXAM v14.0  (60 Levels)      ║"))
-        print(c(BOLD+CYAN, "╚══════════════════════════════════════════════════════════╝"))
-        print()
-        show_progress()
-        print()
 
         if level > MAX_LEVEL:
+            clear()
+            for line in BANNER: print(line)
+            print()
             print(f"{GREEN}  ALL LEVELS COMPLETE — You are a C programmer now.{RESET}")
             show_scoreboard()
             sys.exit(0)
 
-        show_subject(level)
-
+        fname = get_filename(level)
         dname = get_dirname(level)
-        print(f"{GRAY}  ────────────────────────────────────────────────────────{RESET}")
-        print(f"  {BOLD}Your file :{RESET} {WHITE}rendu/{dname}/{fname}{RESET}")
-        print(f"  {BOLD}Trace log :{RESET} {GRAY}traces/trace_{dname}.txt{RESET}")
-        print(f"{GRAY}  ────────────────────────────────────────────────────────{RESET}")
-        print(f"  {GREEN}grademe{RESET} · {CYAN}hint{RESET} · {WHITE}open{RESET} · {WHITE}cat{RESET} · {CYAN}score{RESET} · {CYAN}stats{RESET} · {MAGENTA}save{RESET} · {MAGENTA}load{RESET} · {MAGENTA}saves{RESET} · {WHITE}help{RESET}")
-        print(f"{GRAY}  ────────────────────────────────────────────────────────{RESET}")
+        frame = BANNER + [""] + progress_lines() + [""] + subject_lines(level) + [
+            f"{GRAY}  ────────────────────────────────────────────────────────{RESET}",
+            f"  {BOLD}Your file :{RESET} {WHITE}rendu/{dname}/{fname}{RESET}",
+            f"  {BOLD}Trace log :{RESET} {GRAY}traces/trace_{dname}.txt{RESET}",
+            f"{GRAY}  ────────────────────────────────────────────────────────{RESET}",
+            f"  {GREEN}grademe{RESET} · {CYAN}hint{RESET} · {WHITE}open{RESET} · {WHITE}cat{RESET} · {CYAN}score{RESET} · {CYAN}stats{RESET} · {MAGENTA}save{RESET} · {MAGENTA}load{RESET} · {MAGENTA}saves{RESET} · {WHITE}help{RESET}",
+            f"{GRAY}  ────────────────────────────────────────────────────────{RESET}",
+        ]
+        screen.draw(frame)
 
         try:
             raw = input(f"  {BOLD}{CYAN}exam{RESET}[{YELLOW}lvl{level}{RESET}|{GREEN}{get_score()}/60{RESET}]{BOLD}> {RESET}").strip()
@@ -1921,10 +2795,21 @@ def main():
             sys.exit(0)
 
         inp = raw.lower()
+        # Commands printing a line or two leave the frame intact for a partial redraw.
+        quiet = (raw in ("", "save", "skip", "reset", "resetscore")
+                 or raw.startswith(("save ", "goto ")))
 
         if raw == "grademe":
             os.makedirs(os.path.join("rendu", get_dirname(level)), exist_ok=True)
             grade_me()
+        elif raw == "unitgrade":
+            unit_grade(level)
+        elif raw == "fuzz" or raw.startswith("fuzz "):
+            try:
+                n = int(raw[5:]) if raw.startswith("fuzz ") else FUZZ_CASES
+                fuzz_level(level, max(1, n))
+            except ValueError:
+                print(f"  {RED}Usage: fuzz [n]{RESET}"); _sleep(1)
         elif raw in ("score","scoreboard"):
             show_scoreboard()
         elif raw == "stats":
@@ -1932,9 +2817,9 @@ def main():
         elif raw in ("saves","savelist"):
             list_saves()
         elif raw == "save":
-            do_save("quicksave"); time.sleep(1)
+            do_save("quicksave"); _sleep(1)
         elif raw.startswith("save "):
-            do_save(raw[5:]); time.sleep(1)
+            do_save(raw[5:]); _sleep(1)
         elif raw == "load":
             do_load("quicksave")
         elif raw.startswith("load "):
@@ -1950,19 +2835,35 @@ def main():
             cat_file(level)
         elif raw == "history":
             show_history(level)
+        elif raw == "timings":
+            show_timings()
+        elif raw == "trace" or raw.startswith("trace "):
+            try:
+                n = int(raw[6:]) if raw.startswith("trace ") else 1
+                show_trace(level, max(1, n))
+            except ValueError:
+                print(f"  {RED}Usage: trace [n]{RESET}"); _sleep(1)
+        elif raw == "buildmatrix":
+            build_matrix(level)
+        elif raw == "perf" or raw.startswith("perf "):
+            try:
+                runs = int(raw[5:]) if raw.startswith("perf ") else 10
+                perf_level(level, max(1, runs))
+            except ValueError:
+                print(f"  {RED}Usage: perf [runs]{RESET}"); _sleep(1)
         elif raw == "skip":
             print(f"  {YELLOW}Skipping level {level}...{RESET}")
-            set_level(level + 1); time.sleep(1)
+            set_level(level + 1); _sleep(1)
         elif raw.startswith("goto "):
             try:
                 target = int(raw[5:])
                 if 0 <= target <= MAX_LEVEL:
                     set_level(target)
-                    print(f"  {YELLOW}Jumped to level {target}.{RESET}"); time.sleep(1)
+                    print(f"  {YELLOW}Jumped to level {target}.{RESET}"); _sleep(1)
                 else:
-                    print(f"  {RED}Invalid level. Use 0-{MAX_LEVEL}{RESET}"); time.sleep(1)
+                    print(f"  {RED}Invalid level. Use 0-{MAX_LEVEL}{RESET}"); _sleep(1)
             except ValueError:
-                print(f"  {RED}Usage: goto <number>{RESET}"); time.sleep(1)
+                print(f"  {RED}Usage: goto <number>{RESET}"); _sleep(1)
         elif raw == "reset":
             confirm = input("  Reset level to 0? (score is kept) (y/n): ")
             if confirm.strip().lower() == "y": set_level(0)
@@ -1971,7 +2872,7 @@ def main():
             if confirm.strip().lower() == "y":
                 set_level(0); set_score(0); set_streak(0); set_best(0)
                 open(".passed","w").close(); open(".attempts","w").close()
-                print(f"  {RED}Full reset done.{RESET}"); time.sleep(1)
+                print(f"  {RED}Full reset done.{RESET}"); _sleep(1)
         elif raw in ("help","h","?"):
             show_help()
         elif raw in ("exit","quit","q"):
@@ -1981,7 +2882,10 @@ def main():
             pass  # just redraw
         else:
             print(f"  {RED}Unknown command.{RESET} Type {BOLD}help{RESET} for the list.")
-            time.sleep(1)
+            _sleep(1)
+            quiet = True
+
+        if not quiet: screen.invalidate()
 
 if __name__ == "__main__":
     main()
@@ -10,7 +10,8 @@
 SHOWCASE PROJECT — Everything combined.
 
 This is a real command-line task manager that:
-  ✓ Persists data to JSON
+  ✓ Persists data to JSON (or a binary columnar snapshot), with an
+    append-only journal per change
   ✓ Uses dataclasses with validation
   ✓ Has a clean OOP design
   ✓ Uses generators for filtering
@@ -18,28 +19,68 @@ This is a real command-line task manager that:
   ✓ Uses comprehensions throughout
   ✓ Handles errors gracefully
   ✓ Has proper type hints
+  ✓ Indexes tasks by id, status, priority and tag for fast lookups
+  ✓ Keeps stats counters as tasks change (check them: stats --check)
+  ✓ Keeps tasks in priority queues: next(k) gives the k most urgent
+  ✓ Full-text search over titles and notes: search("deploy fix*")
+  ✓ Batches mutations: `with manager.batch():`, add_many, complete_many
+  ✓ Compact columnar store for large task lists: TaskManager(columnar=True)
+  ✓ Optional SQLite backend: TaskManager(backend="sqlite", filepath=...)
 
 Run it:
   python3 task_manager.py add "Learn Python" --priority high --tag study
   python3 task_manager.py list
+  python3 task_manager.py next -n 10
+  python3 task_manager.py search "python deco*" --status todo
   python3 task_manager.py done 1
   python3 task_manager.py stats
+Tasks are kept in ~/.miles3103_tasks.json (choose another with --file
+before the command). Commands load lazily: add only reads next_id, and
+list streams the file instead of loading it.
 
 Or just run directly for the demo:
   python3 task_manager.py
+
+Benchmark the indexes at 10k/100k/1M tasks:
+  python3 task_manager.py --bench
+
+Compare the JSON and SQLite backends at 1M tasks:
+  python3 task_manager.py --bench-backends
+
+Measure task memory (dict of Task vs TaskTable) at 1M tasks:
+  python3 task_manager.py --bench-memory
+
+Compare JSON and binary snapshot save/load at 1M tasks:
+  python3 task_manager.py --bench-snapshot
+
+Time full-text search at 1M tasks:
+  python3 task_manager.py --bench-search
 """
 
 import json
+import math
+import mmap
 import os
+import re
+import sqlite3
+import struct
 import sys
 import time
+import random
 import argparse
+import bisect
 import functools
-from dataclasses import dataclass, field, asdict
-from datetime import datetime, date
+import heapq
+import tempfile
+import tracemalloc
+from array import array
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, date, timedelta
 from pathlib import Path
-from typing import Optional, Generator
+from typing import Optional, Generator, Iterable
 from enum import Enum
+from itertools import chain, islice, takewhile
 
 # ============================================================================
 #  ENUMS — type-safe constants
@@ -74,7 +115,7 @@ def log_action(func):
 #  DATACLASS — Task
 # ============================================================================
 
-@dataclass
+@dataclass(slots=True)
 class Task:
     title:      str
     priority:   Priority  = Priority.MEDIUM
@@ -98,6 +139,17 @@ class Task:
     def mark_in_progress(self) -> None:
         self.status = Status.IN_PROGRESS
 
+    def update(self, fields: dict) -> None:
+        """Set fields from to_dict()-style values (priority/status may be strings)."""
+        for name, value in fields.items():
+            if name == "priority":
+                value = Priority(value)
+            elif name == "status":
+                value = Status(value)
+            elif name == "tags":
+                value = list(value)
+            setattr(self, name, value)
+
     @property
     def is_done(self) -> bool:
         return self.status == Status.DONE
@@ -108,17 +160,25 @@ class Task:
         return (date.today() - created).days
 
     def to_dict(self) -> dict:
-        d = asdict(self)
-        d["priority"] = self.priority.value
-        d["status"]   = self.status.value
-        return d
+        # Spelled out rather than asdict(), which deep-copies field by field
+        # and dominated the cost of saving large task lists
+        return {"title": self.title, "priority": self.priority.value,
+                "status": self.status.value, "tags": list(self.tags),
+                "notes": self.notes, "created_at": self.created_at,
+                "done_at": self.done_at, "id": self.id}
 
     @classmethod
     def from_dict(cls, data: dict) -> "Task":
-        data = data.copy()
-        data["priority"] = Priority(data["priority"])
-        data["status"]   = Status(data["status"])
-        return cls(**data)
+        # Fields are passed straight through; the old data.copy() + cls(**data)
+        # allocated a second dict per task
+        return cls(title      = data["title"],
+                   priority   = Priority(data["priority"]),
+                   status     = Status(data["status"]),
+                   tags       = data.get("tags", []),
+                   notes      = data.get("notes", ""),
+                   created_at = data.get("created_at") or datetime.now().isoformat(),
+                   done_at    = data.get("done_at"),
+                   id         = data.get("id", 0))
 
     def __str__(self) -> str:
         icon = {"todo": "○", "in_progress": "◑", "done": "●", "cancelled": "✗"}
@@ -127,37 +187,1294 @@ class Task:
         return (f"  {icon[self.status.value]} #{self.id:3d} "
                 f"{pri[self.priority.value]} {self.title:<30}{tags}")
 
+# ============================================================================
+#  TASK TABLE — struct-of-arrays store
+# ============================================================================
+
+PRIORITIES = list(Priority)     # column code → enum
+STATUSES   = list(Status)
+PRIORITY_CODE = {p: i for i, p in enumerate(PRIORITIES)}
+STATUS_CODE   = {s: i for i, s in enumerate(STATUSES)}
+EPOCH   = datetime(1970, 1, 1)
+NO_TIME = -2 ** 63              # done_at of a task that is not done
+
+def _to_micros(iso: Optional[str]) -> int:
+    """Naive ISO timestamp → microseconds since the epoch (exact, no time zone)."""
+    if iso is None:
+        return NO_TIME
+    return (datetime.fromisoformat(iso) - EPOCH) // timedelta(microseconds=1)
+
+def _from_micros(micros: int) -> Optional[str]:
+    if micros == NO_TIME:
+        return None
+    return (EPOCH + timedelta(microseconds=micros)).isoformat()
+
+class TaskTable:
+    """Struct-of-arrays task store: one typed array per field.
+
+    Row i holds one task. Priority and status are one-byte codes,
+    timestamps are epoch microseconds, titles and notes are UTF-8
+    slices of one shared string pool, and each distinct tag list is
+    interned once and referenced by number. A row costs tens of bytes
+    instead of a Task with its own strings and list.
+
+    It is read and written like the manager's id → Task dict, but
+    lookups return TaskView objects made on demand that read and write
+    the row in place. Rows are appended in ascending id order (ids come
+    from next_id), so finding an id is a binary search, and only the
+    newest row can be deleted. Rewritten titles and notes leave their
+    old bytes in the pool until repack().
+    """
+
+    def __init__(self):
+        self.ids      = array("q")
+        self.priority = array("b")
+        self.status   = array("b")
+        self.created  = array("q")
+        self.done     = array("q")
+        self.tagset   = array("i")
+        self.title    = array("q")      # (offset, length) pairs into pool
+        self.notes    = array("q")
+        self.pool     = bytearray()
+        self.tagsets: list[tuple[str, ...]] = [()]
+        self._tagset_ids: dict[tuple[str, ...], int] = {(): 0}
+
+    def _row(self, task_id: int) -> int:
+        row = bisect.bisect_left(self.ids, task_id)
+        return row if row < len(self.ids) and self.ids[row] == task_id else -1
+
+    def text(self, column: array, row: int) -> str:
+        start, length = column[2 * row], column[2 * row + 1]
+        return self.pool[start:start + length].decode()
+
+    def set_text(self, column: array, row: int, value: str) -> None:
+        data = value.encode()
+        column[2 * row], column[2 * row + 1] = len(self.pool), len(data)
+        self.pool += data
+
+    def repack(self) -> None:
+        """Rebuild the string pool without the bytes of overwritten text."""
+        old, self.pool = self.pool, bytearray()
+        for column in (self.title, self.notes):
+            for i in range(0, len(column), 2):
+                start, length = column[i], column[i + 1]
+                column[i] = len(self.pool)
+                self.pool += old[start:start + length]
+
+    def pool_waste(self) -> int:
+        """Bytes in the pool no row refers to."""
+        live = sum(self.title[1::2]) + sum(self.notes[1::2])
+        return len(self.pool) - live
+
+    def tagset_id(self, tags) -> int:
+        """Number of the interned tag list equal to tags."""
+        key = tuple(tags)
+        number = self._tagset_ids.get(key)
+        if number is None:
+            number = self._tagset_ids[key] = len(self.tagsets)
+            self.tagsets.append(tuple(sys.intern(tag) for tag in key))
+        return number
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, task_id: int) -> bool:
+        return self._row(task_id) >= 0
+
+    def __iter__(self):
+        return iter(self.ids)
+
+    def get(self, task_id: int, default=None):
+        row = self._row(task_id)
+        return TaskView(self, row) if row >= 0 else default
+
+    def __getitem__(self, task_id: int) -> "TaskView":
+        row = self._row(task_id)
+        if row < 0:
+            raise KeyError(task_id)
+        return TaskView(self, row)
+
+    def values(self) -> "TaskRows":
+        return TaskRows(self)
+
+    def __setitem__(self, task_id: int, task) -> None:
+        """Store a Task (or view) as row task_id, appending if it is new."""
+        row = self._row(task_id)
+        if row >= 0:
+            view = TaskView(self, row)
+            for name in ("title", "priority", "status", "tags", "notes", "created_at", "done_at"):
+                setattr(view, name, getattr(task, name))
+            return
+        if self.ids and task_id < self.ids[-1]:
+            raise ValueError(f"TaskTable ids must be added in ascending order "
+                             f"(#{task_id} after #{self.ids[-1]})")
+        self.ids.append(task_id)
+        self.priority.append(PRIORITY_CODE[Priority(task.priority)])
+        self.status.append(STATUS_CODE[Status(task.status)])
+        self.tagset.append(self.tagset_id(task.tags))
+        self.created.append(_to_micros(task.created_at))
+        self.done.append(_to_micros(task.done_at))
+        for column, text in ((self.title, task.title), (self.notes, task.notes)):
+            data = text.encode()
+            column.extend((len(self.pool), len(data)))
+            self.pool += data
+
+    def tasks(self) -> Generator[Task, None, None]:
+        """Every row as a standalone Task, read straight from the columns."""
+        pool, tagsets, title, notes = bytes(self.pool), self.tagsets, self.title, self.notes
+        rows = zip(self.ids, self.priority, self.status, self.tagset, self.created, self.done)
+        for row, (task_id, priority, status, tagset, created, done) in enumerate(rows):
+            i = 2 * row
+            yield Task(title      = pool[title[i]:title[i] + title[i + 1]].decode(),
+                       priority   = PRIORITIES[priority],
+                       status     = STATUSES[status],
+                       tags       = list(tagsets[tagset]),
+                       notes      = pool[notes[i]:notes[i] + notes[i + 1]].decode(),
+                       created_at = _from_micros(created),
+                       done_at    = _from_micros(done),
+                       id         = task_id)
+
+    def __delitem__(self, task_id: int) -> None:
+        if not self.ids or self.ids[-1] != task_id:
+            raise ValueError(f"TaskTable can only remove its newest row, not #{task_id}")
+        for column in (self.ids, self.priority, self.status, self.tagset,
+                       self.created, self.done):
+            column.pop()
+        for column in (self.title, self.notes):
+            del column[-2:]
+
+class TaskRows:
+    """Re-iterable view over every row of a TaskTable, like dict.values()."""
+
+    __slots__ = ("_table",)
+
+    def __init__(self, table: TaskTable):
+        self._table = table
+
+    def __len__(self) -> int:
+        return len(self._table)
+
+    def __iter__(self) -> Generator["TaskView", None, None]:
+        table = self._table
+        return (TaskView(table, row) for row in range(len(table)))
+
+class TaskView:
+    """A Task backed by one TaskTable row; setting an attribute writes the row."""
+
+    __slots__ = ("_table", "_row")
+
+    def __init__(self, table: TaskTable, row: int):
+        self._table = table
+        self._row   = row
+
+    @property
+    def id(self) -> int:
+        return self._table.ids[self._row]
+
+    @property
+    def title(self) -> str:
+        return self._table.text(self._table.title, self._row)
+
+    @title.setter
+    def title(self, value: str) -> None:
+        self._table.set_text(self._table.title, self._row, value)
+
+    @property
+    def notes(self) -> str:
+        return self._table.text(self._table.notes, self._row)
+
+    @notes.setter
+    def notes(self, value: str) -> None:
+        self._table.set_text(self._table.notes, self._row, value)
+
+    @property
+    def priority(self) -> Priority:
+        return PRIORITIES[self._table.priority[self._row]]
+
+    @priority.setter
+    def priority(self, value: Priority) -> None:
+        self._table.priority[self._row] = PRIORITY_CODE[Priority(value)]
+
+    @property
+    def status(self) -> Status:
+        return STATUSES[self._table.status[self._row]]
+
+    @status.setter
+    def status(self, value: Status) -> None:
+        self._table.status[self._row] = STATUS_CODE[Status(value)]
+
+    @property
+    def tags(self) -> list[str]:
+        """A copy: assign a new list to change the tags."""
+        return list(self._table.tagsets[self._table.tagset[self._row]])
+
+    @tags.setter
+    def tags(self, value: list[str]) -> None:
+        self._table.tagset[self._row] = self._table.tagset_id(value)
+
+    @property
+    def created_at(self) -> str:
+        return _from_micros(self._table.created[self._row])
+
+    @created_at.setter
+    def created_at(self, value: str) -> None:
+        self._table.created[self._row] = _to_micros(value)
+
+    @property
+    def done_at(self) -> Optional[str]:
+        return _from_micros(self._table.done[self._row])
+
+    @done_at.setter
+    def done_at(self, value: Optional[str]) -> None:
+        self._table.done[self._row] = _to_micros(value)
+
+    # Behaviour is Task's own, running against the row
+    mark_done        = Task.mark_done
+    mark_in_progress = Task.mark_in_progress
+    update           = Task.update
+    is_done          = Task.is_done
+    age_days         = Task.age_days
+    to_dict          = Task.to_dict
+    __str__          = Task.__str__
+
+    def materialize(self) -> Task:
+        """A standalone Task copy of this row."""
+        return Task.from_dict(self.to_dict())
+
+    def __repr__(self) -> str:
+        return repr(self.materialize())
+
+# ============================================================================
+#  STATS COUNTERS
+# ============================================================================
+
+@dataclass(slots=True)
+class TaskCounts:
+    """Running totals behind stats(), kept in step with every mutation."""
+    by_status: dict[Status, int]   = field(default_factory=lambda: dict.fromkeys(Status, 0))
+    pending:   dict[Priority, int] = field(default_factory=lambda: dict.fromkeys(Priority, 0))
+    tags:      dict[str, int]      = field(default_factory=dict)
+
+    def count(self, status: Status, priority: Priority, tags: Iterable[str],
+              sign: int = 1) -> None:
+        """Add (sign=1) or remove (sign=-1) one task with these fields."""
+        self.by_status[status] += sign
+        if status != Status.DONE:
+            self.pending[priority] += sign
+        for tag in tags:
+            n = self.tags.get(tag, 0) + sign
+            if n:
+                self.tags[tag] = n
+            else:
+                del self.tags[tag]
+
+    def add(self, task: Task, sign: int = 1) -> None:
+        self.count(task.status, task.priority, task.tags, sign)
+
+    @property
+    def total(self) -> int:
+        return sum(self.by_status.values())
+
+    def top_tags(self, k: int = 5) -> list[tuple[str, int]]:
+        """The k most used tags; ties keep first-seen order, like Counter.most_common."""
+        return heapq.nlargest(k, self.tags.items(), key=lambda item: item[1])
+
+    def copy(self) -> "TaskCounts":
+        return TaskCounts(dict(self.by_status), dict(self.pending), dict(self.tags))
+
+    def to_dict(self) -> dict:
+        return {"by_status": {s.value: n for s, n in self.by_status.items()},
+                "pending":   {p.value: n for p, n in self.pending.items()},
+                "tags":      self.tags}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "TaskCounts":
+        counts = cls()
+        for status, n in data.get("by_status", {}).items():
+            counts.by_status[Status(status)] = n
+        for priority, n in data.get("pending", {}).items():
+            counts.pending[Priority(priority)] = n
+        counts.tags = dict(data.get("tags", {}))
+        return counts
+
+# ============================================================================
+#  PRIORITY QUEUES — tasks in (priority rank, id) order
+# ============================================================================
+
+RANKED = [Priority.URGENT, Priority.HIGH, Priority.MEDIUM, Priority.LOW]
+OPEN   = (Status.TODO, Status.IN_PROGRESS)     # what next() offers
+
+class SortedIds:
+    """Ascending task ids, stored as a list of short sorted chunks.
+
+    One flat sorted list would make every insert or delete a memmove of
+    everything after it, which at a million ids costs more than the
+    rest of a mutation; here it moves one chunk at most. The chunk
+    holding an id is found by binary search over the chunk maxima.
+    Appending a larger id than any held, the usual case since new tasks
+    get the next id, is O(1).
+    """
+    __slots__ = ("chunks", "maxes", "size")
+    CHUNK = 1024
+
+    def __init__(self, ids: Iterable[int] = ()):
+        ids = list(ids)                             # must be ascending
+        self.chunks = [ids[i:i + self.CHUNK] for i in range(0, len(ids), self.CHUNK)]
+        self.maxes  = [chunk[-1] for chunk in self.chunks]
+        self.size   = len(ids)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __iter__(self):
+        return chain.from_iterable(self.chunks)
+
+    def iter_from(self, value) -> Iterable:
+        """Items >= value, ascending."""
+        i = bisect.bisect_left(self.maxes, value)
+        if i == len(self.chunks):
+            return iter(())
+        chunk = self.chunks[i]
+        return chain(chunk[bisect.bisect_left(chunk, value):],
+                     chain.from_iterable(islice(self.chunks, i + 1, None)))
+
+    def add(self, task_id: int) -> None:
+        chunks, maxes = self.chunks, self.maxes
+        self.size += 1
+        if not maxes or task_id > maxes[-1]:
+            if chunks and len(chunks[-1]) < self.CHUNK:
+                chunks[-1].append(task_id)
+                maxes[-1] = task_id
+            else:
+                chunks.append([task_id])
+                maxes.append(task_id)
+            return
+        i = bisect.bisect_left(maxes, task_id)
+        chunk = chunks[i]
+        bisect.insort(chunk, task_id)
+        if len(chunk) > 2 * self.CHUNK:
+            half = len(chunk) // 2
+            chunks[i:i + 1] = [chunk[:half], chunk[half:]]
+            maxes[i:i + 1]  = [chunk[half - 1], chunk[-1]]
+
+    def discard(self, task_id: int) -> None:
+        i = bisect.bisect_left(self.maxes, task_id)
+        if i == len(self.maxes):
+            return
+        chunk = self.chunks[i]
+        j = bisect.bisect_left(chunk, task_id)
+        if chunk[j] != task_id:
+            return
+        del chunk[j]
+        self.size -= 1
+        if not chunk:
+            del self.chunks[i], self.maxes[i]
+        elif j == len(chunk):
+            self.maxes[i] = chunk[-1]
+
+class TaskQueues:
+    """Task ids per (priority, status), each kept sorted by id.
+
+    These are the ordered views behind list_tasks() and next(): walking
+    the priorities in rank order and merging their status lists gives
+    tasks in (priority rank, id) order without a sort, and the first k
+    cost O(k) reads plus one O(log n) step per list. The lists hold the
+    same int objects as the other indexes.
+    """
+    __slots__ = ("lists",)
+
+    def __init__(self):
+        self.lists: dict[tuple[Priority, Status], SortedIds] = {
+            (p, s): SortedIds() for p in Priority for s in Status}
+
+    def add(self, task_id: int, priority: Priority, status: Status) -> None:
+        self.lists[priority, status].add(task_id)
+
+    def discard(self, task_id: int, priority: Priority, status: Status) -> None:
+        self.lists[priority, status].discard(task_id)
+
+    def ordered(self, priority: Priority, statuses: Iterable[Status]) -> Iterable[int]:
+        """Ids of this priority with any of these statuses, ascending."""
+        return heapq.merge(*(self.lists[priority, s] for s in statuses))
+
+    def size(self, priorities: Iterable[Priority], statuses: Iterable[Status]) -> int:
+        return sum(len(self.lists[p, s]) for p in priorities for s in statuses)
+
+# ============================================================================
+#  SEARCH INDEX — words in titles and notes
+# ============================================================================
+
+WORD = re.compile(r"[^\W_]+")           # letters and digits, split as SQLite's FTS5 does
+QUERY_WORD = re.compile(r"([^\W_]+)(\*?)")
+SEARCH_MAGIC  = b"MTSRCH01"
+SEARCH_HEADER = struct.Struct("<8s2q")  # magic, size and mtime_ns of the snapshot it matches
+SEARCH_FIELD  = struct.Struct("<3q")    # words, bytes of words, ids
+
+def words(text: str) -> set[str]:
+    return set(WORD.findall(text.lower()))
+
+def parse_query(query: str) -> list[tuple[str, bool]]:
+    """Search words as (word, is_prefix); a trailing * makes a word a prefix."""
+    return [(word, bool(star)) for word, star in QUERY_WORD.findall(query.lower())]
+
+class SortedTerms(SortedIds):
+    """SortedIds holding index words instead of task ids."""
+    __slots__ = ()
+
+class SearchIndex:
+    """Inverted index over task titles and notes, behind TaskManager.search().
+
+    title and notes map each word to the ids of the tasks using it
+    there. A word used by one task only (most ids, names and typos)
+    maps to that id itself rather than a one-element set, which saves
+    a couple of hundred bytes per word. terms holds every indexed word
+    in order, so a prefix is a binary search and a short scan.
+    """
+    __slots__ = ("title", "notes", "terms")
+
+    def __init__(self):
+        self.title: dict[str, int | set[int]] = {}
+        self.notes: dict[str, int | set[int]] = {}
+        self.terms = SortedTerms()
+
+    @classmethod
+    def build(cls, tasks: Iterable[Task]) -> "SearchIndex":
+        index = cls()
+        for task in tasks:
+            for word in words(task.title):
+                cls._put(index.title, word, task.id)
+            for word in words(task.notes):
+                cls._put(index.notes, word, task.id)
+        index.terms = SortedTerms(sorted(index.title.keys() | index.notes.keys()))
+        return index
+
+    @staticmethod
+    def _put(postings: dict, word: str, task_id: int) -> None:
+        ids = postings.get(word)
+        if ids is None:
+            postings[word] = task_id
+        elif type(ids) is int:
+            postings[word] = {ids, task_id}
+        else:
+            ids.add(task_id)
+
+    @staticmethod
+    def _take(postings: dict, word: str, task_id: int) -> None:
+        ids = postings[word]
+        if type(ids) is int:
+            del postings[word]
+        else:
+            ids.discard(task_id)
+            if len(ids) == 1:
+                postings[word] = ids.pop()
+
+    @staticmethod
+    def _ids(ids) -> set[int]:
+        return set() if ids is None else {ids} if type(ids) is int else ids
+
+    def add(self, task: Task) -> None:
+        for postings, text in ((self.title, task.title), (self.notes, task.notes)):
+            for word in words(text):
+                if word not in self.title and word not in self.notes:
+                    self.terms.add(word)
+                self._put(postings, word, task.id)
+
+    def discard(self, task: Task) -> None:
+        """Remove a task, which must still have the text it was added with."""
+        for postings, text in ((self.title, task.title), (self.notes, task.notes)):
+            for word in words(text):
+                self._take(postings, word, task.id)
+                if word not in self.title and word not in self.notes:
+                    self.terms.discard(word)
+
+    def lookup(self, word: str, prefix: bool = False) -> tuple[set[int], set[int]]:
+        """Ids with the word (or a word starting with it) in the title, and in the notes."""
+        if not prefix:
+            return self._ids(self.title.get(word)), self._ids(self.notes.get(word))
+        title, notes = set(), set()
+        for term in takewhile(lambda term: term.startswith(word), self.terms.iter_from(word)):
+            title |= self._ids(self.title.get(term))
+            notes |= self._ids(self.notes.get(term))
+        return title, notes
+
+def _stamp(path: Path) -> tuple[int, int]:
+    """Size and mtime of a snapshot, which its search index records."""
+    st = path.stat()
+    return st.st_size, st.st_mtime_ns
+
+def write_search_index(path: Path, index: SearchIndex, stamp: tuple[int, int],
+                       durable: bool = True) -> None:
+    """Atomically write index to path, stamped with the snapshot it belongs to.
+
+    Per field: the words in order, newline separated, then each word's
+    id count and all the ids, as little-endian int64 arrays.
+    """
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as fh:
+        fh.write(SEARCH_HEADER.pack(SEARCH_MAGIC, *stamp))
+        for postings in (index.title, index.notes):
+            used   = [word for word in index.terms if word in postings]
+            counts = array("q")
+            ids    = array("q")
+            for word in used:
+                posting = postings[word]
+                if type(posting) is int:
+                    counts.append(1)
+                    ids.append(posting)
+                else:
+                    counts.append(len(posting))
+                    ids.extend(posting)
+            blob = "\n".join(used).encode()
+            fh.write(SEARCH_FIELD.pack(len(used), len(blob), len(ids)))
+            fh.write(blob)
+            fh.write(counts.tobytes())
+            fh.write(ids.tobytes())
+        fh.flush()
+        if durable:
+            os.fsync(fh.fileno())
+    os.replace(tmp, path)
+
+def read_search_index(path: Path, stamp: tuple[int, int]) -> Optional[SearchIndex]:
+    """The index stored at path, or None if missing, damaged or for another snapshot."""
+    try:
+        data = path.read_bytes()
+        magic, *saved = SEARCH_HEADER.unpack_from(data)
+        if magic != SEARCH_MAGIC or tuple(saved) != stamp:
+            return None
+        index, pos = SearchIndex(), SEARCH_HEADER.size
+        for postings in (index.title, index.notes):
+            n, blob_len, ids_len = SEARCH_FIELD.unpack_from(data, pos)
+            pos += SEARCH_FIELD.size
+            used = data[pos:pos + blob_len].decode().split("\n") if n else []
+            pos += blob_len
+            counts = array("q", data[pos:pos + 8 * n])
+            pos += 8 * n
+            ids = array("q", data[pos:pos + 8 * ids_len])
+            pos += 8 * ids_len
+            start = 0
+            for word, count in zip(used, counts):
+                postings[word] = ids[start] if count == 1 else set(ids[start:start + count])
+                start += count
+        if pos != len(data):
+            return None
+    except (OSError, ValueError, struct.error):
+        return None
+    terms = list(index.title) if not index.notes else sorted(index.title.keys() | index.notes.keys())
+    index.terms = SortedTerms(terms)
+    return index
+
+# ============================================================================
+#  BINARY SNAPSHOT — columnar file format for a TaskTable
+# ============================================================================
+#
+#  header    magic "MTASKS02", then next_id, rows, tagsets_len, stats_len,
+#            pool_len as little-endian int64 ("MTASKS01" files have no
+#            stats_len and no stats section)
+#  columns   ids, created, done (int64), title, notes (int64 offset/length
+#            pairs), tagset (int32), priority, status (int8); rows long each
+#  tagsets   JSON list of the interned tag lists, indexed by tagset
+#  stats     JSON TaskCounts
+#  pool      UTF-8 titles and notes
+#
+#  Each section is the TaskTable array's own bytes, so saving is one write
+#  per column and loading is one copy per column out of an mmap.
+
+SNAPSHOT_MAGIC    = b"MTASKS02"
+SNAPSHOT_HEADER   = struct.Struct("<8s5q")
+SNAPSHOT_V1       = (b"MTASKS01", struct.Struct("<8s4q"))
+SNAPSHOT_COLUMNS  = (("ids", 1), ("created", 1), ("done", 1), ("title", 2),
+                     ("notes", 2), ("tagset", 1), ("priority", 1), ("status", 1))
+
+def is_binary_snapshot(path: Path) -> bool:
+    with open(path, "rb") as fh:
+        return fh.read(len(SNAPSHOT_MAGIC)) in (SNAPSHOT_MAGIC, SNAPSHOT_V1[0])
+
+def _unpack_header(buf) -> tuple[int, int, int, int, int, int]:
+    """(next_id, rows, tagsets_len, stats_len, pool_len, header size) of either version."""
+    magic = bytes(buf[:len(SNAPSHOT_MAGIC)])
+    if magic == SNAPSHOT_MAGIC and len(buf) >= SNAPSHOT_HEADER.size:
+        _, next_id, rows, tagsets_len, stats_len, pool_len = SNAPSHOT_HEADER.unpack_from(buf)
+        return next_id, rows, tagsets_len, stats_len, pool_len, SNAPSHOT_HEADER.size
+    if magic == SNAPSHOT_V1[0] and len(buf) >= SNAPSHOT_V1[1].size:
+        _, next_id, rows, tagsets_len, pool_len = SNAPSHOT_V1[1].unpack_from(buf)
+        return next_id, rows, tagsets_len, 0, pool_len, SNAPSHOT_V1[1].size
+    raise ValueError("not a task snapshot")
+
+def _columns_size(rows: int) -> int:
+    table = TaskTable()
+    return sum(rows * width * getattr(table, name).itemsize for name, width in SNAPSHOT_COLUMNS)
+
+def write_snapshot(fh, table: TaskTable, next_id: int, counts: TaskCounts) -> None:
+    """Write table and its counters to the binary file fh."""
+    tagsets = json.dumps(table.tagsets, separators=(",", ":")).encode()
+    stats   = json.dumps(counts.to_dict(), separators=(",", ":")).encode()
+    fh.write(SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, next_id, len(table),
+                                  len(tagsets), len(stats), len(table.pool)))
+    for name, _ in SNAPSHOT_COLUMNS:
+        column = getattr(table, name)
+        if sys.byteorder == "big":
+            column = array(column.typecode, column)
+            column.byteswap()
+        fh.write(column)
+    fh.write(tagsets)
+    fh.write(stats)
+    fh.write(table.pool)
+
+def read_snapshot(path: Path) -> tuple[TaskTable, int, Optional[dict]]:
+    """Load a binary snapshot; returns the table, next_id and stored counters.
+
+    Raises ValueError if the file is not a complete snapshot.
+    """
+    table = TaskTable()
+    with open(path, "rb") as fh, \
+         mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm, \
+         memoryview(mm) as view:
+        next_id, rows, tagsets_len, stats_len, pool_len, offset = _unpack_header(mm)
+        for name, width in SNAPSHOT_COLUMNS:
+            column = getattr(table, name)
+            size   = rows * width * column.itemsize
+            column.frombytes(view[offset:offset + size])
+            if sys.byteorder == "big":
+                column.byteswap()
+            offset += size
+        if offset + tagsets_len + stats_len + pool_len != len(mm):
+            raise ValueError("snapshot truncated")
+        tagsets = json.loads(view[offset:offset + tagsets_len].tobytes())
+        offset += tagsets_len
+        stats   = json.loads(view[offset:offset + stats_len].tobytes()) if stats_len else None
+        table.pool = bytearray(view[offset + stats_len:])
+    table.tagsets = [tuple(map(sys.intern, tags)) for tags in tagsets]
+    table._tagset_ids = {tags: i for i, tags in enumerate(table.tagsets)}
+    return table, next_id, stats
+
+# ============================================================================
+#  STREAMING READS — header and tasks straight from a snapshot file
+# ============================================================================
+
+def snapshot_header(path: Path) -> tuple[int, Optional[int], Optional[dict]]:
+    """(next_id, task count, stored counters) without reading any task.
+
+    The count and counters are None for snapshots written before they
+    were stored. In a JSON snapshot they come before "tasks", so only
+    the text up to that key is read and parsed.
+    """
+    if not path.exists():
+        return 1, 0, {}
+    try:
+        if is_binary_snapshot(path):
+            with open(path, "rb") as fh:
+                next_id, rows, tagsets_len, stats_len, _, size = _unpack_header(
+                    fh.read(SNAPSHOT_HEADER.size))
+                if not stats_len:
+                    return next_id, rows, None
+                fh.seek(size + _columns_size(rows) + tagsets_len)
+                return next_id, rows, json.loads(fh.read(stats_len))
+        with open(path, encoding="utf-8") as fh:
+            text = ""
+            while not (start := re.search(r'"tasks":\s*\[', text)):
+                more = fh.read(1 << 16)
+                if not more:
+                    return 1, None, None
+                text += more
+        header = json.loads(text[:start.start()].rstrip().rstrip(",") + "}")
+    except ValueError:              # damaged; the full load will reset it anyway
+        return 1, None, None
+    return header.get("next_id", 1), header.get("count"), header.get("stats")
+
+def iter_json_tasks(path: Path, chunk_size: int = 1 << 16) -> Generator[dict, None, None]:
+    """Yield the task dicts of a JSON snapshot one at a time.
+
+    The file is read chunk_size characters at a time and each task is
+    decoded with JSONDecoder.raw_decode as soon as it is complete, so
+    memory stays at about one chunk however big the file is.
+    """
+    decoder = json.JSONDecoder()
+    skip    = re.compile(r"[\s,]*")
+    with open(path, encoding="utf-8") as fh:
+        buf = fh.read(chunk_size)
+        while not (start := re.search(r'"tasks":\s*\[', buf)):
+            more = fh.read(chunk_size)
+            if not more:
+                return
+            buf += more
+        pos = start.end()
+        while True:
+            pos = skip.match(buf, pos).end()
+            if pos < len(buf) and buf[pos] == "]":
+                return
+            try:
+                task, pos = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                more = fh.read(chunk_size)
+                if not more:
+                    raise
+                buf, pos = buf[pos:] + more, 0
+                continue
+            yield task
+            if pos > chunk_size:
+                buf, pos = buf[pos:], 0
+
+def iter_binary_tasks(path: Path, status: Optional[Status] = None,
+                      priority: Optional[Priority] = None,
+                      keep: set[int] = frozenset()) -> Generator[dict, None, None]:
+    """Yield the task dicts of a binary snapshot, reading columns in place.
+
+    Rows whose stored status or priority differ from the ones given are
+    skipped without being decoded, unless their id is in keep.
+    """
+    if sys.byteorder == "big":      # the columns are little-endian on disk
+        table, _, _ = read_snapshot(path)
+        yield from (task.to_dict() for task in table.tasks())
+        return
+    status_code   = STATUS_CODE[Status(status)] if status else None
+    priority_code = PRIORITY_CODE[Priority(priority)] if priority else None
+    typecodes = TaskTable()
+    columns   = {}
+    with open(path, "rb") as fh, \
+         mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm, \
+         memoryview(mm) as view:
+        try:
+            _, rows, tagsets_len, stats_len, _, offset = _unpack_header(mm)
+            for name, width in SNAPSHOT_COLUMNS:
+                column = getattr(typecodes, name)
+                size   = rows * width * column.itemsize
+                columns[name] = view[offset:offset + size].cast(column.typecode)
+                offset += size
+            tagsets = json.loads(view[offset:offset + tagsets_len].tobytes())
+            pool    = columns["pool"] = view[offset + tagsets_len + stats_len:]
+            title, notes = columns["title"], columns["notes"]
+            statuses, priorities, ids = columns["status"], columns["priority"], columns["ids"]
+            for row in range(rows):
+                if (((status_code is not None and statuses[row] != status_code)
+                        or (priority_code is not None and priorities[row] != priority_code))
+                        and ids[row] not in keep):
+                    continue
+                i = 2 * row
+                yield {"title": str(pool[title[i]:title[i] + title[i + 1]], "utf-8"),
+                       "priority": PRIORITIES[columns["priority"][row]].value,
+                       "status": STATUSES[columns["status"][row]].value,
+                       "tags": list(tagsets[columns["tagset"][row]]),
+                       "notes": str(pool[notes[i]:notes[i] + notes[i + 1]], "utf-8"),
+                       "created_at": _from_micros(columns["created"][row]),
+                       "done_at": _from_micros(columns["done"][row]),
+                       "id": columns["ids"][row]}
+        finally:
+            for column in columns.values():
+                column.release()        # the mmap cannot close while views exist
+
+def iter_snapshot_tasks(path: Path, **where) -> Generator[dict, None, None]:
+    """Yield the task dicts of either kind of snapshot, in id order.
+
+    where holds iter_binary_tasks' filters; they only prune binary
+    snapshots, so callers still check every task they get.
+    """
+    if not path.exists():
+        return
+    if is_binary_snapshot(path):
+        yield from iter_binary_tasks(path, **where)
+    else:
+        yield from iter_json_tasks(path)
+
 # ============================================================================
 #  TASK MANAGER
 # ============================================================================
 
 class TaskManager:
-    """Manages a collection of tasks with JSON persistence."""
+    """Manages a collection of tasks with JSON persistence.
+
+    Tasks live in an id → Task map, with secondary indexes
+    (status → ids, priority → ids, tag → ids) kept in step on every
+    mutation, so lookups are O(1) and filters only touch matching ids.
+    Change a task's status through the manager (complete,
+    mark_in_progress), not on the Task itself, or the indexes go stale.
+
+    Persistence is a snapshot plus a write-ahead journal. The snapshot
+    is the plain JSON file (same format as always); each mutation
+    appends one JSON line to <file>.journal and fsyncs it, so a
+    mutation costs O(1) I/O. Once the journal holds at least
+    `compact_every` operations and as many as there are tasks (so the
+    rewrite stays amortised O(1) per mutation), or on compact(), the
+    snapshot is rewritten and the journal emptied.
+
+    Inside `with manager.batch():` mutations apply in memory and their
+    journal entries are held back; on exit they are written as a single
+    journal line (or folded into one snapshot rewrite), and if the block
+    raises every change is undone and nothing is written. add_many,
+    complete_many and update_many validate everything first and then
+    run as one batch.
+
+    TaskManager(..., columnar=True) keeps the tasks in a TaskTable
+    instead of a dict of Task objects, for a fraction of the memory at
+    large sizes; lookups then return TaskViews onto the table.
+
+    TaskManager(..., binary=True) writes the snapshot in the binary
+    columnar format (see BINARY SNAPSHOT) instead of JSON. Either kind
+    of snapshot is recognised on load, and both hold the same data, so
+    export() converts between them.
 
-    def __init__(self, filepath: str = "/tmp/miles3103_tasks.json"):
+    TaskManager(..., lazy=True) reads only next_id and the task count
+    at startup (the snapshot header and the end of the journal), so
+    add() costs the same however many tasks exist. The tasks are loaded
+    the first time anything touches them; until then filter() and
+    list_tasks() stream from the files instead (see stream()).
+
+    list_tasks() and next(k) read the tasks in (priority rank, id) order
+    from TaskQueues, sorted id lists kept current like the other
+    indexes, instead of sorting them on every call.
+
+    search() finds tasks by the words in their title and notes through
+    a SearchIndex, built on first use and then kept and saved alongside
+    the snapshot.
+
+    stats() reads a TaskCounts that every mutation keeps current and
+    every snapshot stores, so it costs O(#statuses + #priorities + #tags)
+    rather than a pass over the tasks; a lazy manager gets it from the
+    snapshot header plus the journal. With debug=True each stats() call
+    also recounts from scratch and raises AssertionError on a mismatch.
+
+    TaskManager(backend="sqlite", filepath=...) returns a
+    SQLiteTaskManager instead, with the same public API.
+    """
+
+    def __new__(cls, *args, backend: str = "json", **kwargs):
+        if backend not in ("json", "sqlite"):
+            raise ValueError(f"Unknown backend: {backend!r}")
+        if cls is TaskManager and backend == "sqlite":
+            cls = SQLiteTaskManager
+        return super().__new__(cls)
+
+    def __init__(self, filepath: str = "/tmp/miles3103_tasks.json",
+                 compact_every: int = 1000, durable: bool = True, backend: str = "json",
+                 columnar: bool = False, binary: bool = False, lazy: bool = False,
+                 debug: bool = False):
         self._filepath = Path(filepath)
-        self._tasks: list[Task] = []
-        self._next_id: int = 1
+        self._journal_path = Path(str(filepath) + ".journal")
+        self._search_path  = Path(str(filepath) + ".search")
+        self._journal = None
+        self._journal_ops = 0
+        self.compact_every = compact_every
+        self.durable = durable
+        self.columnar = columnar
+        self.binary = binary
+        self.debug = debug
+        self._undo = None           # undo callbacks while a batch is open
+        self._pending = None        # journal ops held back until the batch ends
+        if lazy:
+            self._load_header()
+        else:
+            self._reset()
+            self._load()
+
+    # Set by _reset(); a lazy manager loads them on first use (__getattr__)
+    LAZY = ("_tasks", "_by_status", "_by_priority", "_by_tag", "_counts", "_queues", "_search")
+
+    def __getattr__(self, name: str):
+        # Only called for missing attributes, so loaded managers never get here
+        if name in TaskManager.LAZY:
+            self._load_all()
+            return self.__dict__[name]
+        raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+
+    @property
+    def _loaded(self) -> bool:
+        return "_tasks" in self.__dict__
+
+    def _load_header(self) -> None:
+        """Lazy start: find next_id and the task count without parsing any task."""
+        self._next_id, self._count, stats = snapshot_header(self._filepath)
+        self._header_counts = TaskCounts.from_dict(stats) if stats is not None else None
+        if self._journal_path.exists():
+            self._read_journal_tail()
+
+    def _read_journal_tail(self) -> None:
+        """Take next_id and the task count from the last add (or clear) in the journal.
+
+        Ids only grow between clears, so the newest add decides next_id;
+        usually that is the last line. Ids are handed out one at a time,
+        so the tasks added since the snapshot number next_id minus the
+        snapshot's next_id (batches holding a clear are compacted, not
+        journaled). The file is only read: a torn final line is skipped
+        here and cut off by the next write (_open_journal) or full load.
+        _journal_ops is estimated from the lines read.
+        """
+        with open(self._journal_path, "rb") as fh:
+            size   = fh.seek(0, os.SEEK_END)
+            window = 1 << 16
+            while True:
+                start = max(0, size - window)
+                fh.seek(start)
+                data  = fh.read(size - start)
+                lines = data.split(b"\n")
+                torn  = lines.pop()
+                if start > 0:
+                    lines = lines[1:]           # may begin mid-line
+                found = None
+                for line in reversed(lines):
+                    try:
+                        op = json.loads(line)
+                    except (json.JSONDecodeError, UnicodeDecodeError):
+                        continue
+                    for sub in reversed(op["ops"] if op["op"] == "batch" else [op]):
+                        if sub["op"] == "add":
+                            found = sub["task"]["id"] + 1
+                        elif sub["op"] == "clear":
+                            found = 1
+                        if found:
+                            break
+                    if found:
+                        break
+                if found or start == 0:
+                    break
+                window *= 4
+        if found:
+            if found == 1:                      # the newest op was a clear
+                self._count = 0
+            elif self._count is not None:
+                self._count += found - self._next_id
+            self._next_id = found
+        self._journal_ops = len(lines) * size // max(len(data), 1)
+
+    def _load_all(self) -> None:
+        """Load every task into memory (first touch of a lazy manager)."""
+        next_id = self._next_id
+        self._reset()
+        self._journal_ops = 0
         self._load()
+        self._next_id = max(self._next_id, next_id)
+        for op in self._pending or ():      # a batch still holding back ops
+            self._apply(op)
+
+    def _unload(self) -> None:
+        """Drop the loaded tasks; the next touch reloads them from disk."""
+        for name in TaskManager.LAZY:
+            self.__dict__.pop(name, None)
+        self._load_header()
+
+    def _size(self) -> int:
+        """Number of tasks, from the header while they are not loaded."""
+        if self._loaded or self.__dict__.get("_count") is None:
+            return len(self._tasks)
+        return self._count
+
+    def _reset(self) -> None:
+        self._tasks: dict[int, Task] | TaskTable = TaskTable() if self.columnar else {}
+        self._by_status: dict[Status, set[int]] = {s: set() for s in Status}
+        self._by_priority: dict[Priority, set[int]] = {p: set() for p in Priority}
+        self._by_tag: dict[str, set[int]] = {}
+        self._counts = TaskCounts()
+        self._queues = TaskQueues()
+        self._search: Optional[SearchIndex] = None     # built on the first search()
+        self._next_id: int = 1
+
+    def _index(self, task: Task) -> None:
+        self._tasks[task.id] = task
+        self._add_keys(task)
+
+    def _unindex(self, task: Task) -> None:
+        self._drop_keys(task)
+        del self._tasks[task.id]
+
+    def _add_keys(self, task: Task) -> None:
+        """Enter the task in the status, priority and tag indexes."""
+        task_id = task.id               # one int object shared by every index
+        self._counts.add(task)
+        self._by_status[task.status].add(task_id)
+        self._by_priority[task.priority].add(task_id)
+        for tag in task.tags:
+            self._by_tag.setdefault(tag, set()).add(task_id)
+        self._queues.add(task_id, task.priority, task.status)
+        if self._search is not None:
+            self._search.add(task)
+
+    def _drop_keys(self, task: Task) -> None:
+        self._counts.add(task, -1)
+        self._by_status[task.status].discard(task.id)
+        self._by_priority[task.priority].discard(task.id)
+        for tag in task.tags:
+            ids = self._by_tag[tag]
+            ids.discard(task.id)
+            if not ids:
+                del self._by_tag[tag]
+        self._queues.discard(task.id, task.priority, task.status)
+        if self._search is not None:
+            self._search.discard(task)
+
+    def _reindex(self, task: Task, fields: dict) -> None:
+        """Apply task.update(fields) and refresh every index it touches."""
+        self._drop_keys(task)
+        task.update(fields)
+        self._add_keys(task)
+
+    def _set_status(self, task: Task, change) -> None:
+        """Apply change(task) and move the task to its new status bucket."""
+        self._counts.count(task.status, task.priority, (), -1)
+        self._by_status[task.status].discard(task.id)
+        self._queues.discard(task.id, task.priority, task.status)
+        change(task)
+        self._by_status[task.status].add(task.id)
+        self._queues.add(task.id, task.priority, task.status)
+        self._counts.count(task.status, task.priority, ())
+
+    def _store_add(self, task: Task) -> None:
+        """Index a new task and journal it (a lazy manager only journals it)."""
+        if self._loaded:
+            self._index(task)
+            if self._undo is not None:
+                self._undo.append(lambda: self._unindex(task))
+        elif self._count is not None:
+            self._count += 1                # keeps _size() current for compaction
+        self._log({"op": "add", "task": task.to_dict()})
+
+    def _store_status(self, task: Task, change) -> None:
+        """Apply a status change and journal it.
+
+        The entry also records the old status and the priority, which
+        lets a lazy manager update its counters without the task.
+        """
+        old = {"status": task.status, "done_at": task.done_at}
+        if self._undo is not None:
+            self._undo.append(lambda: self._set_status(task, lambda t: t.update(old)))
+        self._set_status(task, change)
+        self._log({"op": "status", "id": task.id, "status": task.status.value,
+                   "done_at": task.done_at, "prev": old["status"].value,
+                   "priority": task.priority.value})
+
+    def _store_update(self, task: Task, fields: dict) -> None:
+        """Apply validated field changes and journal them (with the old counted fields)."""
+        old  = {name: getattr(task, name) for name in fields}
+        prev = {"status": task.status.value, "priority": task.priority.value, "tags": task.tags}
+        if self._undo is not None:
+            self._undo.append(lambda: self._reindex(task, old))
+        self._reindex(task, fields)
+        self._log({"op": "update", "id": task.id, "fields": fields, "prev": prev})
 
     def _load(self) -> None:
-        """Load tasks from JSON file."""
+        """Load the snapshot (JSON or binary), then replay the journal on top of it."""
         if self._filepath.exists():
             try:
-                data = json.loads(self._filepath.read_text())
-                self._tasks = [Task.from_dict(t) for t in data["tasks"]]
-                self._next_id = data.get("next_id", len(self._tasks) + 1)
-            except (json.JSONDecodeError, KeyError):
-                self._tasks = []
+                if is_binary_snapshot(self._filepath):
+                    table, next_id, stats = read_snapshot(self._filepath)
+                    self._load_table(table, next_id, count=stats is None)
+                else:
+                    data = json.loads(self._filepath.read_text())
+                    for t in data["tasks"]:
+                        self._index(Task.from_dict(t))
+                    self._next_id = data.get("next_id", len(self._tasks) + 1)
+                    stats = data.get("stats")
+                if stats is not None:
+                    # Same totals as counted, but in the stored tag order,
+                    # which is also what a lazy manager reports
+                    counts = TaskCounts.from_dict(stats)
+                    if self.debug:
+                        self._check_counts(counts)
+                    self._counts = counts
+                # The saved search index, if it matches this snapshot; the
+                # journal replay below keeps it current
+                self._search = read_search_index(self._search_path, _stamp(self._filepath))
+            except (ValueError, KeyError):
+                self._reset()
+        if self._journal_path.exists():
+            good = 0
+            with open(self._journal_path, "rb") as fh:
+                for line in fh:
+                    try:
+                        op = json.loads(line)
+                    except (json.JSONDecodeError, UnicodeDecodeError):
+                        break               # torn final write from a crash
+                    self._apply(op)
+                    self._journal_ops += len(op["ops"]) if op["op"] == "batch" else 1
+                    good += len(line)
+            if good < self._journal_path.stat().st_size:
+                os.truncate(self._journal_path, good)   # so new appends start on a clean line
+
+    def _load_table(self, table: TaskTable, next_id: int, count: bool = True) -> None:
+        """Adopt a TaskTable read from a binary snapshot (count=False: skip the counters)."""
+        self._next_id = next_id
+        if not self.columnar:
+            for task in table.tasks():
+                self._index(task)
+            return
+        self._tasks = table
+        # Index straight from the columns rather than through TaskViews
+        by_status   = [self._by_status[s] for s in STATUSES]
+        by_priority = [self._by_priority[p] for p in PRIORITIES]
+        queues      = [[[] for _ in STATUSES] for _ in PRIORITIES]
+        tagsets     = table.tagsets
+        for task_id, status, priority, tagset in zip(table.ids, table.status,
+                                                     table.priority, table.tagset):
+            by_status[status].add(task_id)
+            by_priority[priority].add(task_id)
+            queues[priority][status].append(task_id)    # rows ascend by id
+            for tag in tagsets[tagset]:
+                self._by_tag.setdefault(tag, set()).add(task_id)
+            if count:
+                self._counts.count(STATUSES[status], PRIORITIES[priority], tagsets[tagset])
+        for p, row in zip(PRIORITIES, queues):
+            for s, ids in zip(STATUSES, row):
+                self._queues.lists[p, s] = SortedIds(ids)
+
+    def _apply(self, op: dict) -> None:
+        """Replay one journal operation."""
+        kind = op["op"]
+        if kind == "add":
+            task = Task.from_dict(op["task"])
+            self._index(task)
+            self._next_id = max(self._next_id, task.id + 1)
+        elif kind == "status":
+            task = self._tasks.get(op["id"])
+            if task:
+                def change(t: Task) -> None:
+                    t.status  = Status(op["status"])
+                    t.done_at = op.get("done_at")
+                self._set_status(task, change)
+        elif kind == "update":
+            task = self._tasks.get(op["id"])
+            if task:
+                self._reindex(task, op["fields"])
+        elif kind == "clear":
+            self._reset()
+        elif kind == "batch":
+            for sub in op["ops"]:
+                self._apply(sub)
+
+    def _log(self, op: dict) -> None:
+        """Journal one operation, or hold it back while a batch is open."""
+        if self._pending is not None:
+            self._pending.append(op)
+            return
+        self._append(op)
+        self._journal_ops += 1
+        if self._journal_ops >= max(self.compact_every, self._size()):
+            self.compact()
+
+    def _append(self, op: dict) -> None:
+        """Append one line to the journal (fsync'd when durable)."""
+        if self._journal is None:
+            self._open_journal()
+        self._journal.write(json.dumps(op, separators=(",", ":")) + "\n")
+        self._journal.flush()
+        if self.durable:
+            os.fsync(self._journal.fileno())
+
+    def _open_journal(self) -> None:
+        """Open the journal for appending, first cutting off a torn final line.
+
+        _load() does the same, but a lazy manager appends without loading.
+        """
+        if self._journal_path.exists():
+            with open(self._journal_path, "r+b") as fh:
+                size = end = fh.seek(0, os.SEEK_END)
+                while end > 0:
+                    start = max(0, end - (1 << 16))
+                    fh.seek(start)
+                    newline = fh.read(end - start).rfind(b"\n")
+                    if newline >= 0:
+                        end = start + newline + 1
+                        break
+                    end = start
+                if end < size:
+                    fh.truncate(end)
+        self._journal = open(self._journal_path, "a", encoding="utf-8")
+
+    @contextmanager
+    def batch(self):
+        """Group mutations into one all-or-nothing write.
+
+        Nested batches join the outermost one.
+        """
+        if self._undo is not None:
+            yield self
+            return
+        self._undo, self._pending = [], []
+        next_id, loaded = self._next_id, self._loaded
+        try:
+            yield self
+            self._flush_batch(self._pending)
+        except BaseException:
+            if loaded:
+                for undo in reversed(self._undo):
+                    undo()
+            else:
+                self._unload()      # nothing was written, so disk holds the old state
+            self._next_id = next_id
+            self._abort_batch()
+            raise
+        finally:
+            self._undo = self._pending = None
+
+    def _flush_batch(self, ops: list[dict]) -> None:
+        """Persist a finished batch with a single write."""
+        if not ops:
+            return
+        self._journal_ops += len(ops)
+        if (self._journal_ops >= max(self.compact_every, self._size())
+                or any(op["op"] == "clear" for op in ops)):
+            # The snapshot already holds the whole batch; a clear is never
+            # journaled, so lazy starts can count tasks from the ids
+            self.compact()
+        else:
+            # One line, so a torn write drops the whole batch on replay
+            self._append({"op": "batch", "ops": ops})
+
+    def _abort_batch(self) -> None:
+        """Discard a failed batch (the JSON backend has nothing written yet)."""
 
     def _save(self) -> None:
-        """Persist tasks to JSON file."""
-        data = {
-            "next_id": self._next_id,
-            "saved_at": datetime.now().isoformat(),
-            "tasks": [t.to_dict() for t in self._tasks]
-        }
-        self._filepath.write_text(json.dumps(data, indent=2))
+        """Atomically write the full snapshot."""
+        self.export(self._filepath, binary=self.binary)
+
+    def export(self, path: str, binary: bool = False) -> None:
+        """Atomically write a snapshot of the current tasks to path (and the search index, if built)."""
+        path = Path(path)
+        tmp  = path.with_name(path.name + ".tmp")
+        if binary:
+            table = self._tasks
+            if isinstance(table, TaskTable):
+                if table.pool_waste() > len(table.pool) // 2:
+                    table.repack()
+            else:
+                table = TaskTable()
+                for task in sorted(self._tasks.values(), key=lambda t: t.id):
+                    table[task.id] = task
+            with open(tmp, "wb") as fh:
+                write_snapshot(fh, table, self._next_id, self._counts)
+                fh.flush()
+                if self.durable:
+                    os.fsync(fh.fileno())
+        else:
+            tasks = self._tasks
+            data = {
+                "next_id": self._next_id,
+                "saved_at": datetime.now().isoformat(),
+                "count": len(tasks),
+                "stats": self._counts.to_dict(),
+                "tasks": [t.to_dict() for t in (tasks.tasks() if isinstance(tasks, TaskTable)
+                                                 else tasks.values())]
+            }
+            with open(tmp, "w", encoding="utf-8") as fh:
+                fh.write(json.dumps(data, indent=2))
+                fh.flush()
+                if self.durable:
+                    os.fsync(fh.fileno())
+        os.replace(tmp, path)
+        search_path = Path(str(path) + ".search")
+        if self._search is not None:
+            write_search_index(search_path, self._search, _stamp(path), self.durable)
+        else:
+            search_path.unlink(missing_ok=True)     # would describe the old snapshot
+
+    def compact(self) -> None:
+        """Fold the journal into a fresh snapshot and start an empty journal."""
+        self._save()
+        self.close()
+        self._journal_path.unlink(missing_ok=True)
+        self._journal_ops = 0
+
+    def close(self) -> None:
+        """Close the journal file handle (it is reopened on the next mutation)."""
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
 
     @log_action
     def add(self, title: str, priority: Priority = Priority.MEDIUM,
@@ -170,9 +1487,8 @@ class TaskManager:
             tags     = tags or [],
             notes    = notes,
         )
-        self._tasks.append(task)
-        self._next_id += 1
-        self._save()
+        self._next_id += 1              # before _store_add, which may write a snapshot
+        self._store_add(task)
         print(f"  ✓ Added task #{task.id}: {task.title}")
         return task
 
@@ -183,60 +1499,394 @@ class TaskManager:
         if not task:
             print(f"  ✗ Task #{task_id} not found")
             return False
-        task.mark_done()
-        self._save()
+        self._store_status(task, Task.mark_done)
         print(f"  ✓ Completed: {task.title}")
         return True
 
+    @log_action
+    def mark_in_progress(self, task_id: int) -> bool:
+        """Mark a task as being worked on."""
+        task = self._find(task_id)
+        if not task:
+            print(f"  ✗ Task #{task_id} not found")
+            return False
+        self._store_status(task, Task.mark_in_progress)
+        print(f"  ✓ Started: {task.title}")
+        return True
+
+    def _require(self, task_ids: Iterable[int]) -> list[Task]:
+        """Look up every id, raising ValueError if any is unknown."""
+        task_ids = list(task_ids)
+        tasks    = [self._find(task_id) for task_id in task_ids]
+        missing  = [task_id for task_id, task in zip(task_ids, tasks) if task is None]
+        if missing:
+            raise ValueError(f"Unknown task id(s): {missing}")
+        return tasks
+
+    @log_action
+    def add_many(self, items: Iterable[dict]) -> list[Task]:
+        """Add several tasks at once; nothing is added if any item is invalid.
+
+        Each item holds add()'s arguments: title and optionally
+        priority, tags and notes.
+        """
+        tasks = [Task(id       = self._next_id + i,
+                      title    = item["title"],
+                      priority = Priority(item.get("priority", Priority.MEDIUM)),
+                      tags     = list(item.get("tags") or []),
+                      notes    = item.get("notes", ""))
+                 for i, item in enumerate(items)]
+        with self.batch():
+            for task in tasks:
+                self._store_add(task)
+            self._next_id += len(tasks)
+        print(f"  ✓ Added {len(tasks)} tasks")
+        return tasks
+
+    @log_action
+    def complete_many(self, task_ids: Iterable[int]) -> int:
+        """Mark several tasks done; nothing changes if any id is unknown."""
+        tasks = self._require(task_ids)
+        with self.batch():
+            for task in tasks:
+                self._store_status(task, Task.mark_done)
+        print(f"  ✓ Completed {len(tasks)} tasks")
+        return len(tasks)
+
+    UPDATABLE = ("title", "priority", "status", "tags", "notes")
+
+    @log_action
+    def update_many(self, updates: dict[int, dict]) -> int:
+        """Change fields on several tasks, e.g. {3: {"priority": "high"}}.
+
+        Every id and value is validated before anything changes.
+        Setting status to done stamps done_at; any other status clears it.
+        """
+        tasks = self._require(updates)
+        changes = []
+        for task, fields in zip(tasks, updates.values()):
+            unknown = set(fields) - set(self.UPDATABLE)
+            if unknown:
+                raise ValueError(f"Cannot update field(s): {sorted(unknown)}")
+            clean = {}
+            if "title" in fields:
+                clean["title"] = str(fields["title"]).strip()
+                if not clean["title"]:
+                    raise ValueError("Task title cannot be empty")
+            if "priority" in fields:
+                clean["priority"] = Priority(fields["priority"]).value
+            if "tags" in fields:
+                clean["tags"] = list(fields["tags"])
+            if "notes" in fields:
+                clean["notes"] = str(fields["notes"])
+            if "status" in fields:
+                status = Status(fields["status"])
+                clean["status"] = status.value
+                if status != Status.DONE:
+                    clean["done_at"] = None
+                elif not task.is_done:
+                    clean["done_at"] = datetime.now().isoformat()
+            changes.append((task, clean))
+        with self.batch():
+            for task, clean in changes:
+                self._store_update(task, clean)
+        print(f"  ✓ Updated {len(changes)} tasks")
+        return len(changes)
+
     def _find(self, task_id: int) -> Optional[Task]:
-        return next((t for t in self._tasks if t.id == task_id), None)
+        return self._tasks.get(task_id)
 
     def filter(self, status: Optional[Status] = None,
                priority: Optional[Priority] = None,
                tag: Optional[str] = None) -> Generator[Task, None, None]:
-        """Generator that yields tasks matching filters."""
-        for task in self._tasks:
-            if status   and task.status   != status:   continue
-            if priority and task.priority != priority:  continue
-            if tag      and tag not in task.tags:       continue
-            yield task
+        """Generator that yields tasks matching filters, in id order.
+
+        Each filter maps to an index set; the sets are intersected
+        smallest first, so the cost follows the rarest filter rather
+        than the number of tasks. A lazy manager that has not loaded
+        its tasks streams them from disk instead.
+        """
+        if not self._loaded and self._pending is None:
+            yield from self.stream(status=status, priority=priority, tag=tag)
+            return
+        sets = []
+        if status:   sets.append(self._by_status[status])
+        if priority: sets.append(self._by_priority[priority])
+        if tag:      sets.append(self._by_tag.get(tag, set()))
+        if not sets:
+            yield from list(self._tasks.values())
+            return
+        sets.sort(key=len)
+        for task_id in sorted(sets[0].intersection(*sets[1:])):
+            yield self._tasks[task_id]
+
+    def _ordered(self, status: Optional[Status] = None,
+                 priority: Optional[Priority] = None,
+                 tag: Optional[str] = None) -> Iterable[Task]:
+        """Matching tasks, urgent first, then by id."""
+        if not self._loaded and self._pending is None:
+            # One streaming pass per priority keeps memory constant and
+            # yields the first rows without reading the whole file
+            overlay = self._journal_overlay()
+            return (task for p in ([priority] if priority else RANKED)
+                    for task in self.stream(status, p, tag, overlay))
+        return self._queued([Status(status)] if status else list(Status), priority, tag)
+
+    def _queued(self, statuses: list[Status], priority: Optional[Priority],
+                tag: Optional[str]) -> Generator[Task, None, None]:
+        """Tasks with one of these statuses, in (priority rank, id) order, from the queues.
+
+        Rows come out already in order, so the first k cost O(k) reads
+        whatever the total. A tag with fewer tasks than the lists to
+        walk is cheaper taken from its own index.
+        """
+        ranked = [Priority(priority)] if priority else RANKED
+        tagged = self._by_tag.get(tag, set()) if tag else None
+        if tagged is not None and len(tagged) < self._queues.size(ranked, statuses):
+            for p in ranked:
+                yield from (task for task in self.filter(priority=p, tag=tag)
+                            if task.status in statuses)
+            return
+        for p in ranked:
+            for task_id in self._queues.ordered(p, statuses):
+                if tagged is None or task_id in tagged:
+                    yield self._tasks[task_id]
+
+    def next(self, k: int = 10, priority: Optional[Priority] = None,
+             tag: Optional[str] = None) -> list[Task]:
+        """The k most urgent open tasks (todo or in progress), by priority and then id.
+
+        Read off the front of the priority queues, so polling for the
+        top few stays cheap however large the backlog is.
+        """
+        if not self._loaded and self._pending is None:
+            tasks = (task for task in self._ordered(priority=priority, tag=tag)
+                     if task.status in OPEN)
+        else:
+            tasks = self._queued(list(OPEN), priority, tag)
+        return list(islice(tasks, k))
 
     def list_tasks(self, status: Optional[Status] = None,
                    priority: Optional[Priority] = None,
                    tag: Optional[str] = None) -> None:
         """Display tasks matching filters."""
-        tasks = list(self.filter(status=status, priority=priority, tag=tag))
-        if not tasks:
+        self.print_tasks(self._ordered(status=status, priority=priority, tag=tag))
+
+    @staticmethod
+    def print_tasks(tasks: Iterable[Task]) -> None:
+        """Print tasks as a table, each row as soon as it arrives."""
+        tasks = iter(tasks)
+        first = next(tasks, None)
+        if first is None:
             print("  (no tasks found)")
             return
 
-        # Sort by: priority (urgent first), then status, then id
-        priority_order = {Priority.URGENT: 0, Priority.HIGH: 1,
-                         Priority.MEDIUM: 2, Priority.LOW: 3}
-        tasks.sort(key=lambda t: (priority_order[t.priority], t.id))
-
         print(f"\n  {'#':>4}  {'P':1} {'Title':<30} Tags")
         print("  " + "-" * 55)
+        print(first)
         for task in tasks:
             print(task)
 
+    def _search_index(self) -> SearchIndex:
+        if self._search is None:
+            self._search = SearchIndex.build(self._tasks.values())
+        return self._search
+
+    def search(self, query: str, mode: str = "all", status: Optional[Status] = None,
+               priority: Optional[Priority] = None, tag: Optional[str] = None,
+               limit: int = 20) -> list[Task]:
+        """Tasks whose title or notes contain the query's words, best match first.
+
+        Words match whole words, ignoring case; end one with * to match
+        every word it starts. mode="all" wants every word, "any" at
+        least one. status, priority and tag narrow the results as in
+        filter(). Matches rank by how rare their words are (by title
+        and notes uses; a word in the title counts double), then by id.
+
+        The word index is built on the first search, kept current from
+        then on, and saved next to each snapshot as <file>.search. The
+        cost follows the number of matches, not of tasks.
+        """
+        if mode not in ("all", "any"):
+            raise ValueError(f"Unknown search mode: {mode!r}")
+        query = parse_query(query)
+        if not query:
+            raise ValueError("Search query has no words")
+        index  = self._search_index()
+        groups = [index.lookup(word, prefix) for word, prefix in query]
+        sets = []
+        if status:   sets.append(self._by_status[status])
+        if priority: sets.append(self._by_priority[priority])
+        if tag:      sets.append(self._by_tag.get(tag, set()))
+        if mode == "all":
+            # Start from the rarest word or filter and narrow that down,
+            # so no step costs more than the smallest set
+            narrow = sorted([*groups, *((ids, set()) for ids in sets)],
+                            key=lambda pair: len(pair[0]) + len(pair[1]))
+            title, notes = narrow[0]
+            found = title | notes
+            for title, notes in narrow[1:]:
+                found = (found & title) | (found & notes) if notes else found & title
+        else:
+            found = set().union(*chain.from_iterable(groups))
+            for ids in sorted(sets, key=len):
+                found &= ids
+        total = max(len(self._tasks), 1)
+        # Split the matches into groups of equal score with set operations
+        # instead of scoring them one by one; few words give few groups
+        parts = [(0.0, found)]
+        for title, notes in groups:
+            uses   = len(title) + len(notes)
+            weight = math.log(1 + total / uses) if uses else 0
+            split  = []
+            for score, part in parts:
+                in_title = part & title
+                in_notes = (part & notes) - in_title
+                split += [(score + 2 * weight, in_title), (score + weight, in_notes),
+                          (score, part - in_title - in_notes)]
+            parts = [(score, part) for score, part in split if part]
+        by_score: dict[float, set[int]] = {}
+        for score, part in parts:
+            by_score[score] = by_score.get(score, set()) | part
+        best = []
+        for score in sorted(by_score, reverse=True):
+            best += heapq.nsmallest(limit - len(best), by_score[score])
+            if len(best) >= limit:
+                break
+        return [self._tasks[task_id] for task_id in best]
+
+    def _journal_overlay(self) -> tuple[bool, dict[int, dict], dict[int, list[dict]]]:
+        """The journal as (cleared, added tasks, field changes by id), for stream()."""
+        cleared, added, changes = False, {}, {}
+        if not self._journal_path.exists():
+            return cleared, added, changes
+        def take(op: dict) -> None:
+            nonlocal cleared
+            kind = op["op"]
+            if kind == "add":
+                added[op["task"]["id"]] = op["task"]
+            elif kind == "status":
+                changes.setdefault(op["id"], []).append(
+                    {"status": op["status"], "done_at": op.get("done_at")})
+            elif kind == "update":
+                changes.setdefault(op["id"], []).append(op["fields"])
+            elif kind == "clear":
+                cleared = True
+                added.clear()
+                changes.clear()
+            elif kind == "batch":
+                for sub in op["ops"]:
+                    take(sub)
+        with open(self._journal_path, "rb") as fh:
+            for line in fh:
+                try:
+                    take(json.loads(line))
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    break
+        return cleared, added, changes
+
+    def stream(self, status: Optional[Status] = None,
+               priority: Optional[Priority] = None,
+               tag: Optional[str] = None, overlay=None) -> Generator[Task, None, None]:
+        """Yield matching tasks in id order, read from disk without loading them.
+
+        The snapshot is parsed incrementally and the journal is laid
+        over it, so only the journal is held in memory.
+        """
+        cleared, added, changes = overlay or self._journal_overlay()
+        status   = status and Status(status).value
+        priority = priority and Priority(priority).value
+        source   = () if cleared else iter_snapshot_tasks(self._filepath, status=status,
+                                                              priority=priority, keep=changes.keys())
+        for data in chain(source, added.values()):
+            for fields in changes.get(data["id"], ()):
+                data = {**data, **fields}
+            if ((status and data["status"] != status)
+                    or (priority and data["priority"] != priority)
+                    or (tag and tag not in data["tags"])):
+                continue
+            yield Task.from_dict(data)
+
+    def _stats_data(self) -> dict:
+        """Counts behind stats(): total, by_status, by_priority (pending), top_tags."""
+        counts = None
+        if not self._loaded and self._pending is None:
+            counts = self._lazy_counts()
+        if counts is None:
+            counts = self._counts
+        if self.debug:
+            self._check_counts(counts)
+        return {"total": counts.total, "by_status": dict(counts.by_status),
+                "by_priority": dict(counts.pending), "top_tags": counts.top_tags(5)}
+
+    def _lazy_counts(self) -> Optional[TaskCounts]:
+        """Counters of an unloaded manager: the snapshot's plus the journal's changes.
+
+        None if the snapshot has no counters or a journal entry lacks
+        the old values needed (written before they were recorded).
+        """
+        if self._header_counts is None:
+            return None
+        counts = self._header_counts.copy()
+        def take(op: dict) -> bool:
+            nonlocal counts
+            kind = op["op"]
+            if kind == "add":
+                task = op["task"]
+                counts.count(Status(task["status"]), Priority(task["priority"]), task["tags"])
+            elif kind == "status":
+                if "prev" not in op:
+                    return False
+                priority = Priority(op["priority"])
+                counts.count(Status(op["prev"]), priority, (), -1)
+                counts.count(Status(op["status"]), priority, ())
+            elif kind == "update":
+                if "prev" not in op:
+                    return False
+                old = op["prev"]
+                new = {**old, **{k: v for k, v in op["fields"].items() if k in old}}
+                for fields, sign in ((old, -1), (new, 1)):
+                    counts.count(Status(fields["status"]), Priority(fields["priority"]),
+                                 fields["tags"], sign)
+            elif kind == "clear":
+                counts = TaskCounts()
+            elif kind == "batch":
+                return all(take(sub) for sub in op["ops"])
+            return True
+        if self._journal_path.exists():
+            with open(self._journal_path, "rb") as fh:
+                for line in fh:
+                    try:
+                        op = json.loads(line)
+                    except (json.JSONDecodeError, UnicodeDecodeError):
+                        break
+                    if not take(op):
+                        return None
+        return counts
+
+    def _recount(self) -> TaskCounts:
+        """The counters rebuilt with a full pass over the tasks."""
+        counts = TaskCounts()
+        for task in self._tasks.values():
+            counts.add(task)
+        return counts
+
+    def _check_counts(self, counts: TaskCounts) -> None:
+        """Debug mode: compare counts with a full recount."""
+        fresh = self._recount()
+        for name in ("by_status", "pending", "tags"):
+            if getattr(counts, name) != getattr(fresh, name):
+                raise AssertionError(f"stats counters out of step ({name}): "
+                                     f"kept {getattr(counts, name)}, recounted {getattr(fresh, name)}")
+
     def stats(self) -> None:
         """Print statistics about all tasks."""
-        total   = len(self._tasks)
+        data  = self._stats_data()
+        total = data["total"]
         if total == 0:
             print("  No tasks yet.")
             return
-
-        by_status   = {s: sum(1 for t in self._tasks if t.status == s)
-                       for s in Status}
-        by_priority = {p: sum(1 for t in self._tasks if t.priority == p
-                              and not t.is_done)
-                       for p in Priority}
-
-        done_tasks  = [t for t in self._tasks if t.is_done and t.done_at]
-        all_tags    = [tag for t in self._tasks for tag in t.tags]
-        from collections import Counter
-        tag_freq    = Counter(all_tags)
+        by_status, by_priority = data["by_status"], data["by_priority"]
 
         print(f"\n  {'='*40}")
         print(f"  TASK MANAGER STATS — {date.today()}")
@@ -245,7 +1895,7 @@ class TaskManager:
         print()
         print(f"  By Status:")
         for status, count in by_status.items():
-            bar = "█" * count
+            bar = "█" * (count if total <= 40 else round(count * 40 / total))
             print(f"    {status.value:<12} {count:3}  {bar}")
 
         print(f"\n  Pending by Priority:")
@@ -253,9 +1903,9 @@ class TaskManager:
             if count > 0:
                 print(f"    {priority.value:<8} {count}")
 
-        if tag_freq:
+        if data["top_tags"]:
             print(f"\n  Top Tags:")
-            for tag, count in tag_freq.most_common(5):
+            for tag, count in data["top_tags"]:
                 print(f"    #{tag:<12} ×{count}")
 
         completion_rate = (by_status[Status.DONE] / total) * 100 if total else 0
@@ -264,11 +1914,487 @@ class TaskManager:
 
     def clear(self) -> None:
         """Remove all tasks."""
-        self._tasks = []
+        if self._undo is not None:
+            saved = {name: getattr(self, name) for name in (*TaskManager.LAZY, "_next_id")}
+            self._undo.append(lambda: self.__dict__.update(saved))
+            self._reset()
+            self._log({"op": "clear"})
+        else:
+            self._reset()
+            self.compact()
+        print("  All tasks cleared.")
+
+# ============================================================================
+#  SQLITE BACKEND
+# ============================================================================
+
+PRIORITY_RANK_SQL = ("CASE priority WHEN 'urgent' THEN 0 WHEN 'high' THEN 1 "
+                     "WHEN 'medium' THEN 2 ELSE 3 END")
+
+class SQLiteTaskManager(TaskManager):
+    """TaskManager stored in a SQLite database.
+
+    Tasks are rows in `tasks` (indexed on status, priority, created_at
+    and done_at) and tags rows in `task_tags`. A batch() is one
+    transaction, committed on exit and rolled back on error. filter(), list_tasks()
+    and stats() run as SQL, so only the rows asked for become Task
+    objects. The database uses WAL mode; every statement is a constant
+    parameterised string, so sqlite3's statement cache prepares each
+    one only once per connection.
+
+    Of TaskManager's options only durable and debug apply; the others
+    describe the JSON files and raise TypeError here. durable=True syncs
+    the WAL on every commit (synchronous=FULL), durable=False never
+    syncs. With debug=True each stats() call also checks the database
+    and its full-text index and raises AssertionError on damage.
+    """
+
+    _loaded = True      # nothing to load lazily; a failed batch just rolls back
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS tasks (
+            id         INTEGER PRIMARY KEY,
+            title      TEXT NOT NULL,
+            priority   TEXT NOT NULL,
+            status     TEXT NOT NULL,
+            notes      TEXT NOT NULL DEFAULT '',
+            created_at TEXT NOT NULL,
+            done_at    TEXT
+        );
+        CREATE TABLE IF NOT EXISTS task_tags (
+            task_id INTEGER NOT NULL REFERENCES tasks(id) ON DELETE CASCADE,
+            pos     INTEGER NOT NULL,
+            tag     TEXT NOT NULL,
+            PRIMARY KEY (task_id, pos)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS tasks_status     ON tasks(status);
+        CREATE INDEX IF NOT EXISTS tasks_priority   ON tasks(priority, status);
+        CREATE INDEX IF NOT EXISTS tasks_created_at ON tasks(created_at);
+        CREATE INDEX IF NOT EXISTS tasks_done_at    ON tasks(done_at);
+        CREATE INDEX IF NOT EXISTS task_tags_tag    ON task_tags(tag, task_id);
+        CREATE VIRTUAL TABLE IF NOT EXISTS task_text
+            USING fts5(title, notes, content='tasks', content_rowid='id');
+        CREATE TRIGGER IF NOT EXISTS task_text_add AFTER INSERT ON tasks BEGIN
+            INSERT INTO task_text(rowid, title, notes) VALUES (new.id, new.title, new.notes);
+        END;
+        CREATE TRIGGER IF NOT EXISTS task_text_drop AFTER DELETE ON tasks BEGIN
+            INSERT INTO task_text(task_text, rowid, title, notes)
+                VALUES ('delete', old.id, old.title, old.notes);
+        END;
+        CREATE TRIGGER IF NOT EXISTS task_text_edit AFTER UPDATE OF title, notes ON tasks
+            WHEN old.title IS NOT new.title OR old.notes IS NOT new.notes BEGIN
+            INSERT INTO task_text(task_text, rowid, title, notes)
+                VALUES ('delete', old.id, old.title, old.notes);
+            INSERT INTO task_text(rowid, title, notes) VALUES (new.id, new.title, new.notes);
+        END;
+    """
+    SELECT = ("SELECT id, title, priority, status, notes, created_at, done_at, "
+              "(SELECT json_group_array(tag) FROM "
+              "(SELECT tag FROM task_tags WHERE task_id = t.id ORDER BY pos)) "
+              "FROM tasks t")
+
+    def __init__(self, filepath: str = "/tmp/miles3103_tasks.db", *,
+                 durable: bool = True, backend: str = "sqlite", debug: bool = False):
+        self._filepath = Path(filepath)
+        self.durable = durable
+        self.debug = debug
+        self._db = sqlite3.connect(str(filepath))
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=FULL" if durable else "PRAGMA synchronous=OFF")
+        self._db.execute("PRAGMA foreign_keys=ON")
+        indexed = self._db.execute("SELECT 1 FROM sqlite_master WHERE name = 'task_text'").fetchone()
+        self._db.executescript(self.SCHEMA)
+        if not indexed:                     # a database from before full-text search
+            with self._db:
+                self._db.execute("INSERT INTO task_text(task_text) VALUES ('rebuild')")
+        self._undo = self._pending = None
+        self._next_id = self._db.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM tasks").fetchone()[0]
+
+    @staticmethod
+    def _row_task(row) -> Task:
+        return Task(id=row[0], title=row[1], priority=Priority(row[2]), status=Status(row[3]),
+                    notes=row[4], created_at=row[5], done_at=row[6], tags=json.loads(row[7]))
+
+    def _insert(self, tasks: Iterable[Task]) -> None:
+        """INSERT tasks and their tags (caller commits)."""
+        tags = []
+        def rows():
+            for t in tasks:
+                tags.extend((t.id, pos, tag) for pos, tag in enumerate(t.tags))
+                yield (t.id, t.title, t.priority.value, t.status.value,
+                       t.notes, t.created_at, t.done_at)
+        self._db.executemany("INSERT INTO tasks VALUES (?, ?, ?, ?, ?, ?, ?)", rows())
+        self._db.executemany("INSERT INTO task_tags VALUES (?, ?, ?)", tags)
+
+    @contextmanager
+    def _transaction(self):
+        """Commit on exit, unless an enclosing batch() will."""
+        if self._undo is not None:
+            yield
+        else:
+            with self._db:
+                yield
+
+    def _flush_batch(self, ops: list[dict]) -> None:
+        self._db.commit()
+
+    def _abort_batch(self) -> None:
+        self._db.rollback()
+
+    def _store_add(self, task: Task) -> None:
+        with self._transaction():
+            self._insert([task])
+
+    def _store_status(self, task: Task, change) -> None:
+        change(task)
+        with self._transaction():
+            self._db.execute("UPDATE tasks SET status = ?, done_at = ? WHERE id = ?",
+                             (task.status.value, task.done_at, task.id))
+
+    def _store_update(self, task: Task, fields: dict) -> None:
+        task.update(fields)
+        with self._transaction():
+            self._db.execute("UPDATE tasks SET title = ?, priority = ?, status = ?, "
+                             "notes = ?, done_at = ? WHERE id = ?",
+                             (task.title, task.priority.value, task.status.value,
+                              task.notes, task.done_at, task.id))
+            if "tags" in fields:
+                self._db.execute("DELETE FROM task_tags WHERE task_id = ?", (task.id,))
+                self._db.executemany("INSERT INTO task_tags VALUES (?, ?, ?)",
+                                     [(task.id, pos, tag) for pos, tag in enumerate(task.tags)])
+
+    def _find(self, task_id: int) -> Optional[Task]:
+        row = self._db.execute(self.SELECT + " WHERE id = ?", (task_id,)).fetchone()
+        return self._row_task(row) if row else None
+
+    def _where(self, status, priority, tag) -> tuple[str, list]:
+        clauses, params = [], []
+        if status:
+            clauses.append("status = ?");   params.append(Status(status).value)
+        if priority:
+            clauses.append("priority = ?"); params.append(Priority(priority).value)
+        if tag:
+            clauses.append("id IN (SELECT task_id FROM task_tags WHERE tag = ?)"); params.append(tag)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def filter(self, status: Optional[Status] = None,
+               priority: Optional[Priority] = None,
+               tag: Optional[str] = None) -> Generator[Task, None, None]:
+        """Generator over matching rows in id order, streamed from the cursor."""
+        where, params = self._where(status, priority, tag)
+        for row in self._db.execute(self.SELECT + where + " ORDER BY id", params):
+            yield self._row_task(row)
+
+    def _ordered(self, status: Optional[Status] = None,
+                 priority: Optional[Priority] = None,
+                 tag: Optional[str] = None) -> list[Task]:
+        where, params = self._where(status, priority, tag)
+        sql = f"{self.SELECT}{where} ORDER BY {PRIORITY_RANK_SQL}, id"
+        return [self._row_task(row) for row in self._db.execute(sql, params)]
+
+    def next(self, k: int = 10, priority: Optional[Priority] = None,
+             tag: Optional[str] = None) -> list[Task]:
+        """Top k open tasks: the (priority, status) index gives each pair's rows in
+        id order, so merge the open statuses per priority instead of sorting."""
+        tasks = []
+        for p in ([Priority(priority)] if priority else RANKED):
+            if len(tasks) == k:
+                break
+            runs = []
+            for status in OPEN:
+                where, params = self._where(status, p, tag)
+                runs.append(self._db.execute(f"{self.SELECT}{where} ORDER BY id LIMIT ?",
+                                             [*params, k - len(tasks)]))
+            rows = heapq.merge(*runs, key=lambda row: row[0])
+            tasks += (self._row_task(row) for row in islice(rows, k - len(tasks)))
+        return tasks
+
+    def search(self, query: str, mode: str = "all", status: Optional[Status] = None,
+               priority: Optional[Priority] = None, tag: Optional[str] = None,
+               limit: int = 20) -> list[Task]:
+        """Full-text search through the FTS5 table, ranked by bm25 with titles weighted double."""
+        if mode not in ("all", "any"):
+            raise ValueError(f"Unknown search mode: {mode!r}")
+        query = parse_query(query)
+        if not query:
+            raise ValueError("Search query has no words")
+        match = f" {'AND' if mode == 'all' else 'OR'} ".join(
+            f'"{word}"' + (" *" if prefix else "") for word, prefix in query)
+        where, params = self._where(status, priority, tag)
+        sql = (f"{self.SELECT} JOIN (SELECT rowid AS hit, bm25(task_text, 2.0, 1.0) AS score "
+               f"FROM task_text WHERE task_text MATCH ?) ON hit = t.id{where} "
+               f"ORDER BY score, id LIMIT ?")
+        return [self._row_task(row) for row in self._db.execute(sql, [match, *params, limit])]
+
+    def _stats_data(self) -> dict:
+        db = self._db
+        if self.debug:
+            self._check_db()
+        by_status = dict.fromkeys(Status, 0)
+        for status, count in db.execute("SELECT status, COUNT(*) FROM tasks GROUP BY status"):
+            by_status[Status(status)] = count
+        by_priority = dict.fromkeys(Priority, 0)
+        for priority, count in db.execute("SELECT priority, COUNT(*) FROM tasks "
+                                          "WHERE status != 'done' GROUP BY priority"):
+            by_priority[Priority(priority)] = count
+        top_tags = db.execute("SELECT tag, COUNT(*) AS n FROM task_tags "
+                              "GROUP BY tag ORDER BY n DESC, MIN(task_id) LIMIT 5").fetchall()
+        return {"total": sum(by_status.values()), "by_status": by_status,
+                "by_priority": by_priority, "top_tags": top_tags}
+
+    def _check_db(self) -> None:
+        """Debug mode: run SQLite's integrity checks on the tables, indexes and task_text."""
+        problems = [row[0] for row in self._db.execute("PRAGMA integrity_check")]
+        if problems != ["ok"]:
+            raise AssertionError(f"database damaged: {problems}")
+        try:
+            # rank = 1 also compares the index with the rows in tasks
+            self._db.execute("INSERT INTO task_text(task_text, rank) VALUES ('integrity-check', 1)")
+        except sqlite3.DatabaseError as e:
+            raise AssertionError(f"full-text index out of step: {e}") from None
+
+    def clear(self) -> None:
+        """Remove all tasks."""
+        with self._transaction():
+            self._db.execute("DELETE FROM task_tags")
+            self._db.execute("DELETE FROM tasks")
         self._next_id = 1
-        self._save()
         print("  All tasks cleared.")
 
+    def compact(self) -> None:
+        """Checkpoint the WAL into the main database file."""
+        self._db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def close(self) -> None:
+        self._db.execute("PRAGMA optimize")     # refresh planner statistics
+        self._db.close()
+
+# ============================================================================
+#  BENCHMARK — indexed lookups vs linear scans
+# ============================================================================
+
+def synthetic_tasks(n: int, seed: int = 42) -> Generator[Task, None, None]:
+    """Yield n reproducible tasks with mixed status, priority and tags."""
+    rng      = random.Random(seed)
+    tags     = [f"tag{i}" for i in range(50)]
+    statuses = [Status.TODO] * 6 + [Status.IN_PROGRESS] * 2 + [Status.DONE] * 2
+    start    = datetime(2024, 1, 1)
+    for i in range(1, n + 1):
+        yield Task(id=i, title=f"Task {i}", priority=rng.choice(list(Priority)),
+                   status=rng.choice(statuses), tags=rng.sample(tags, rng.randint(0, 3)),
+                   created_at=(start + timedelta(seconds=i)).isoformat())
+
+def _per_op(fn, reps: int) -> float:
+    """Microseconds per call of fn() over reps calls."""
+    start = time.perf_counter()
+    for _ in range(reps):
+        fn()
+    return (time.perf_counter() - start) / reps * 1e6
+
+def benchmark(sizes=(10_000, 100_000, 1_000_000)) -> None:
+    """Compare the indexed manager with the old linear scans at each size."""
+    rng = random.Random(7)
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in sizes:
+            manager = TaskManager(filepath=os.path.join(tmp, "bench.json"))
+            start = time.perf_counter()
+            for task in synthetic_tasks(n):
+                manager._index(task)
+            build = time.perf_counter() - start
+            tasks = list(manager._tasks.values())     # what the old code scanned
+            ids   = [rng.randint(1, n) for _ in range(1000)]
+            it    = iter(ids * 1000)
+
+            def scan(task_id: int) -> Optional[Task]:
+                return next((t for t in tasks if t.id == task_id), None)
+
+            rows = [
+                ("find by id",
+                 _per_op(lambda: manager._find(next(it)), 10_000),
+                 _per_op(lambda: scan(next(it)), 20)),
+                ("complete",
+                 _per_op(lambda: manager._set_status(manager._find(next(it)), Task.mark_done), 1000),
+                 _per_op(lambda: scan(next(it)).mark_done(), 20)),
+                ("filter tag",
+                 _per_op(lambda: sum(1 for _ in manager.filter(tag="tag7")), 5),
+                 _per_op(lambda: sum(1 for t in tasks if "tag7" in t.tags), 3)),
+                ("filter status+prio+tag",
+                 _per_op(lambda: sum(1 for _ in manager.filter(Status.TODO, Priority.URGENT, "tag7")), 5),
+                 _per_op(lambda: sum(1 for t in tasks if t.status == Status.TODO
+                                     and t.priority == Priority.URGENT and "tag7" in t.tags), 3)),
+                ("next 10",
+                 _per_op(lambda: manager.next(10), 1000),
+                 _per_op(lambda: sorted((t for t in tasks if t.status in OPEN),
+                                        key=lambda t: (RANKED.index(t.priority), t.id))[:10], 3)),
+            ]
+            print(f"\n  {n:,} tasks  (generated and indexed in {build:.2f}s)")
+            print(f"  {'operation':<24} {'indexed':>12} {'linear':>12} {'speedup':>9}")
+            print("  " + "-" * 60)
+            for name, fast, slow in rows:
+                print(f"  {name:<24} {fast:10.1f}µs {slow:10.1f}µs {slow / fast:8.0f}×")
+            del manager, tasks
+
+def _open_measured(make) -> tuple[TaskManager, float, int]:
+    """Open a manager with make(); return it, seconds taken and bytes it holds."""
+    tracemalloc.start()
+    start   = time.perf_counter()
+    manager = make()
+    elapsed = time.perf_counter() - start
+    held    = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return manager, elapsed, held
+
+def benchmark_backends(n: int = 1_000_000) -> None:
+    """Compare the JSON and SQLite backends on load, per-op latency and memory."""
+    rng = random.Random(7)
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path, db_path = os.path.join(tmp, "bench.json"), os.path.join(tmp, "bench.db")
+        writer = TaskManager(filepath=json_path)
+        for task in synthetic_tasks(n):
+            writer._index(task)
+        writer._next_id = n + 1
+        writer.compact()
+        writer.close()
+        del writer
+        writer = TaskManager(backend="sqlite", filepath=db_path)
+        with writer._db:
+            writer._insert(synthetic_tasks(n))
+        writer.compact()
+        writer.close()
+
+        results = {}
+        for name, make in (("json",   lambda: TaskManager(filepath=json_path, durable=False)),
+                           ("sqlite", lambda: TaskManager(backend="sqlite", filepath=db_path,
+                                                          durable=False))):
+            manager, load, held = _open_measured(make)
+            it     = iter([rng.randint(1, n) for _ in range(1000)] * 10)
+            new_id = iter(range(n + 1, n + 10_000))
+
+            def add() -> None:
+                manager._store_add(Task(id=next(new_id), title="bench", tags=["tag7"]))
+
+            results[name] = [
+                ("load (ms)",  load * 1e3),
+                ("add",        _per_op(add, 1000)),
+                ("complete",   _per_op(lambda: manager._store_status(manager._find(next(it)),
+                                                                     Task.mark_done), 1000)),
+                ("find by id", _per_op(lambda: manager._find(next(it)), 5000)),
+                ("filter status+prio+tag",
+                 _per_op(lambda: sum(1 for _ in manager.filter(Status.TODO, Priority.URGENT, "tag7")), 3)),
+                ("next 10",    _per_op(lambda: manager.next(10), 100)),
+                ("stats",      _per_op(manager._stats_data, 1)),
+                ("memory (MB)", held / 1e6),
+            ]
+            manager.close()
+            del manager
+
+        print(f"\n  {n:,} tasks   JSON snapshot {os.path.getsize(json_path) / 1e6:.0f} MB, "
+              f"SQLite database {os.path.getsize(db_path) / 1e6:.0f} MB")
+        print(f"  {'operation':<24} {'json':>12} {'sqlite':>12}")
+        print("  " + "-" * 50)
+        for (label, j), (_, q) in zip(results["json"], results["sqlite"]):
+            unit = "  " if "(" in label else "µs"
+            print(f"  {label:<24} {j:10.1f}{unit} {q:10.1f}{unit}")
+
+def benchmark_memory(n: int = 1_000_000) -> None:
+    """tracemalloc the task store and the whole manager, dict of Tasks vs TaskTable."""
+    print(f"\n  {n:,} tasks")
+    print(f"  {'store':<22} {'tasks only':>12} {'with indexes':>14} {'build':>8}")
+    print("  " + "-" * 60)
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, columnar in (("dict of Task", False), ("TaskTable", True)):
+            tracemalloc.start()
+            start   = time.perf_counter()
+            manager = TaskManager(filepath=os.path.join(tmp, "mem.json"), columnar=columnar)
+            for task in synthetic_tasks(n):
+                manager._tasks[task.id] = task
+            store = tracemalloc.get_traced_memory()[0]
+            for task in manager._tasks.values():
+                manager._add_keys(task)
+            total   = tracemalloc.get_traced_memory()[0]
+            elapsed = time.perf_counter() - start
+            tracemalloc.stop()
+            print(f"  {label:<22} {store / 1e6:9.0f} MB {total / 1e6:11.0f} MB {elapsed:7.1f}s")
+            del manager
+
+def benchmark_snapshot(n: int = 1_000_000) -> None:
+    """Save and load times for JSON vs binary snapshots of n tasks."""
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path, bin_path = os.path.join(tmp, "snap.json"), os.path.join(tmp, "snap.bin")
+        source = TaskManager(filepath=os.path.join(tmp, "src.json"), columnar=True, durable=False)
+        for task in synthetic_tasks(n):
+            source._index(task)
+        source._next_id = n + 1
+        print(f"\n  {n:,} tasks")
+        print(f"  {'format':<8} {'save':>8} {'load':>8} {'load, columnar':>15} {'size':>8}")
+        print("  " + "-" * 52)
+        for label, path, binary in (("json", json_path, False), ("binary", bin_path, True)):
+            start = time.perf_counter()
+            source.export(path, binary=binary)
+            save = time.perf_counter() - start
+            loads = []
+            for columnar in (False, True):
+                start = time.perf_counter()
+                TaskManager(filepath=path, columnar=columnar)
+                loads.append(time.perf_counter() - start)
+            print(f"  {label:<8} {save:7.2f}s {loads[0]:7.2f}s {loads[1]:14.2f}s "
+                  f"{os.path.getsize(path) / 1e6:5.0f} MB")
+
+def benchmark_search(n: int = 1_000_000) -> None:
+    """search() latency over n tasks with worded titles and notes, vs scanning them."""
+    rng   = random.Random(11)
+    vocab = ["".join(rng.choice("bcdfghklmnprstvz") + rng.choice("aeiou") for _ in range(rng.randint(2, 4)))
+             for _ in range(5000)]
+    freq  = [1 / rank for rank in range(1, len(vocab) + 1)]     # Zipf-like word use
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = TaskManager(filepath=os.path.join(tmp, "search.json"), durable=False)
+        for task in synthetic_tasks(n):
+            task.title = f"{task.title} {' '.join(rng.choices(vocab, freq, k=rng.randint(2, 5)))}"
+            task.notes = " ".join(rng.choices(vocab, freq, k=rng.randint(0, 10)))
+            manager._index(task)
+        tasks = list(manager._tasks.values())
+        start = time.perf_counter()
+        index = manager._search_index()
+        build = time.perf_counter() - start
+        path  = Path(tmp) / "search.idx"
+        start = time.perf_counter()
+        write_search_index(path, index, (0, 0), durable=False)
+        save  = time.perf_counter() - start
+        start = time.perf_counter()
+        read_search_index(path, (0, 0))
+        load  = time.perf_counter() - start
+        print(f"\n  {n:,} tasks, {len(index.terms):,} words   index built in {build:.2f}s, "
+              f"saved in {save:.2f}s ({path.stat().st_size / 1e6:.0f} MB), loaded in {load:.2f}s")
+
+        def scan(query: str, mode: str, **where) -> list[Task]:
+            """What callers did before: test every task's text."""
+            test  = all if mode == "all" else any
+            found = []
+            for t in tasks:
+                text = f"{t.title} {t.notes}".lower().split()
+                if (test(any(w.startswith(q[:-1]) for w in text) if q.endswith("*") else q in text
+                         for q in query.split())
+                        and all(getattr(t, name) == value for name, value in where.items())):
+                    found.append(t)
+            return found[:20]
+
+        queries = [
+            ("rare word",          vocab[-1], "all", {}),
+            ("mid word",           vocab[200], "all", {}),
+            ("prefix",             vocab[400][:4] + "*", "all", {}),
+            ("all of 2",           f"{vocab[20]} {vocab[60]}", "all", {}),
+            ("any of 2",           f"{vocab[500]} {vocab[900]}", "any", {}),
+            ("all of 2 + filters", f"{vocab[5]} {vocab[30]}", "all",
+             {"status": Status.TODO, "priority": Priority.URGENT}),
+        ]
+        print(f"  {'query':<20} {'matches':>9} {'search':>10} {'scan':>10}")
+        print("  " + "-" * 52)
+        for label, query, mode, where in queries:
+            matches = len(manager.search(query, mode, limit=n, **where))
+            fast = _per_op(lambda: manager.search(query, mode, **where), 20)
+            slow = _per_op(lambda: scan(query, mode, **where), 1)
+            print(f"  {label:<20} {matches:9,} {fast / 1e3:8.2f}ms {slow / 1e3:8.0f}ms")
+
 # ============================================================================
 #  CLI DEMO — run as a script
 # ============================================================================
@@ -281,20 +2407,21 @@ def demo(manager: TaskManager) -> None:
 
     # Add tasks
     print("\n--- Adding Tasks ---")
-    manager.add("Complete C programming course",
-                priority=Priority.HIGH, tags=["study", "c"])
-    manager.add("Finish C++ OOP module",
-                priority=Priority.HIGH, tags=["study", "cpp"])
-    manager.add("Python decorators practice",
-                priority=Priority.MEDIUM, tags=["study", "python"])
-    manager.add("Push code to GitHub",
-                priority=Priority.MEDIUM, tags=["github"])
-    manager.add("Read K&R book chapter 5",
-                priority=Priority.LOW, tags=["study", "c"])
-    manager.add("Set up development environment",
-                priority=Priority.URGENT, tags=["setup"])
-    manager.add("Write unit tests",
-                priority=Priority.LOW, tags=["testing"])
+    with manager.batch():           # one journal write for all seven
+        manager.add("Complete C programming course",
+                    priority=Priority.HIGH, tags=["study", "c"])
+        manager.add("Finish C++ OOP module",
+                    priority=Priority.HIGH, tags=["study", "cpp"])
+        manager.add("Python decorators practice",
+                    priority=Priority.MEDIUM, tags=["study", "python"])
+        manager.add("Push code to GitHub",
+                    priority=Priority.MEDIUM, tags=["github"])
+        manager.add("Read K&R book chapter 5",
+                    priority=Priority.LOW, tags=["study", "c"])
+        manager.add("Set up development environment",
+                    priority=Priority.URGENT, tags=["setup"])
+        manager.add("Write unit tests",
+                    priority=Priority.LOW, tags=["testing"])
 
     # List all
     print("\n--- All Tasks ---")
@@ -302,8 +2429,9 @@ def demo(manager: TaskManager) -> None:
 
     # Complete some
     print("\n--- Completing Tasks ---")
-    manager.complete(1)
-    manager.complete(6)
+    with manager.batch():
+        manager.complete(1)
+        manager.complete(6)
 
     # Filter by status
     print("\n--- TODO Tasks Only ---")
@@ -320,18 +2448,114 @@ def demo(manager: TaskManager) -> None:
     # Stats
     manager.stats()
 
+DEFAULT_FILE = Path.home() / ".miles3103_tasks.json"
+
+def run_command(args) -> int:
+    """Run one CLI subcommand against the task file; returns the exit status."""
+    path    = Path(args.file)
+    manager = TaskManager(path, lazy=True, binary=path.exists() and is_binary_snapshot(path))
+    try:
+        if args.command == "add":
+            manager.add(args.title, priority=Priority(args.priority),
+                        tags=args.tag, notes=args.notes)
+        elif args.command == "list":
+            manager.list_tasks(status=args.status and Status(args.status),
+                               priority=args.priority and Priority(args.priority),
+                               tag=args.tag)
+        elif args.command == "next":
+            manager.print_tasks(manager.next(args.count,
+                                             priority=args.priority and Priority(args.priority),
+                                             tag=args.tag))
+        elif args.command == "search":
+            manager.print_tasks(manager.search(" ".join(args.words),
+                                               mode="any" if args.any else "all",
+                                               status=args.status and Status(args.status),
+                                               priority=args.priority and Priority(args.priority),
+                                               tag=args.tag, limit=args.count))
+        elif args.command == "done":
+            if len(args.ids) == 1:
+                return 0 if manager.complete(args.ids[0]) else 1
+            manager.complete_many(args.ids)
+        elif args.command == "stats":
+            manager.debug = args.check
+            manager.stats()
+    except ValueError as e:
+        print(f"  ✗ {e}")
+        return 1
+    finally:
+        manager.close()
+    return 0
+
 def main():
     parser = argparse.ArgumentParser(description="Miles3103 Task Manager")
+    parser.add_argument("--file", default=str(DEFAULT_FILE),
+                        help=f"Task file for the commands (default {DEFAULT_FILE})")
     parser.add_argument("--demo", action="store_true", help="Run demo mode")
+    parser.add_argument("--bench", action="store_true",
+                        help="Benchmark indexed lookups and filters at 10k/100k/1M tasks")
+    parser.add_argument("--bench-backends", action="store_true",
+                        help="Compare the JSON and SQLite backends at 1M tasks")
+    parser.add_argument("--bench-memory", action="store_true",
+                        help="Measure memory per store (dict of Task vs TaskTable) at 1M tasks")
+    parser.add_argument("--bench-snapshot", action="store_true",
+                        help="Compare JSON and binary snapshot save/load at 1M tasks")
+    parser.add_argument("--bench-search", action="store_true",
+                        help="Time full-text search queries at 1M tasks")
+    commands = parser.add_subparsers(dest="command")
+    add = commands.add_parser("add", help="Add a task")
+    add.add_argument("title")
+    add.add_argument("--priority", default="medium", choices=[p.value for p in Priority])
+    add.add_argument("--tag", action="append", default=[], help="Tag (repeatable)")
+    add.add_argument("--notes", default="")
+    lst = commands.add_parser("list", help="List tasks, urgent first")
+    lst.add_argument("--status", choices=[s.value for s in Status])
+    lst.add_argument("--priority", choices=[p.value for p in Priority])
+    lst.add_argument("--tag")
+    nxt = commands.add_parser("next", help="Show the most urgent open tasks")
+    nxt.add_argument("-n", "--count", type=int, default=10, help="How many (default 10)")
+    nxt.add_argument("--priority", choices=[p.value for p in Priority])
+    nxt.add_argument("--tag")
+    find = commands.add_parser("search", help="Search titles and notes, best match first")
+    find.add_argument("words", nargs="+", help="Words to find; end one with * to match a prefix")
+    find.add_argument("--any", action="store_true", help="Match any word (default: all)")
+    find.add_argument("--status", choices=[s.value for s in Status])
+    find.add_argument("--priority", choices=[p.value for p in Priority])
+    find.add_argument("--tag")
+    find.add_argument("-n", "--count", type=int, default=20, help="How many (default 20)")
+    done = commands.add_parser("done", help="Mark tasks done")
+    done.add_argument("ids", type=int, nargs="+")
+    stats = commands.add_parser("stats", help="Show statistics")
+    stats.add_argument("--check", action="store_true",
+                       help="Cross-check the stored counters against a full recount")
     args = parser.parse_args()
 
+    if args.command:
+        sys.exit(run_command(args))
+    if args.bench:
+        benchmark()
+        return
+    if args.bench_backends:
+        benchmark_backends()
+        return
+    if args.bench_memory:
+        benchmark_memory()
+        return
+    if args.bench_snapshot:
+        benchmark_snapshot()
+        return
+    if args.bench_search:
+        benchmark_search()
+        return
+
     manager = TaskManager()
     manager.clear()  # fresh start for demo
 
     demo(manager)
 
     # Cleanup
+    manager.close()
     Path("/tmp/miles3103_tasks.json").unlink(missing_ok=True)
+    Path("/tmp/miles3103_tasks.json.journal").unlink(missing_ok=True)
     print("\n✓ Demo complete. Run with --help to see CLI options.")
 
 if __name__ == "__main__":